@@ -0,0 +1,23 @@
+from pyfolio import compute
+
+from .synthetic import generate_backtest
+
+
+class CapacitySweep(object):
+    params = [[1, 5], [100, 1000]]
+    param_names = ['years', 'symbols']
+    timeout = 300
+
+    def setup(self, years, symbols):
+        self.backtest = generate_backtest(years=years, symbols=symbols)
+        b = self.backtest
+        self.bt_starting_capital = (b.positions.iloc[0].sum()
+                                    / (1 + b.returns.iloc[0]))
+
+    def time_capacity_sweep(self, years, symbols):
+        b = self.backtest
+        compute.capacity_sweep(b.returns, b.transactions, b.market_data,
+                               self.bt_starting_capital)
+
+    def peakmem_capacity_sweep(self, years, symbols):
+        self.time_capacity_sweep(years, symbols)
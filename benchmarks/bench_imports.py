@@ -0,0 +1,10 @@
+class Imports(object):
+
+    def timeraw_import_pyfolio(self):
+        return 'import pyfolio'
+
+    def timeraw_import_pyfolio_timeseries(self):
+        return 'import pyfolio.timeseries'
+
+    def timeraw_import_pyfolio_tears(self):
+        return 'import pyfolio.tears'
@@ -0,0 +1,22 @@
+from pyfolio import perf_attrib
+
+from .synthetic import generate_backtest
+
+
+class PerfAttrib(object):
+    params = [[1, 5], [100, 1000], [5, 30]]
+    param_names = ['years', 'symbols', 'factors']
+    timeout = 300
+
+    def setup(self, years, symbols, factors):
+        self.backtest = generate_backtest(years=years, symbols=symbols,
+                                          factors=factors)
+
+    def time_perf_attrib(self, years, symbols, factors):
+        b = self.backtest
+        perf_attrib.perf_attrib(b.returns, b.positions, b.factor_returns,
+                                b.factor_loadings,
+                                transactions=b.transactions)
+
+    def peakmem_perf_attrib(self, years, symbols, factors):
+        self.time_perf_attrib(years, symbols, factors)
@@ -0,0 +1,45 @@
+import matplotlib.pyplot as plt
+
+from pyfolio import plotting, round_trips
+
+from .synthetic import generate_backtest
+
+plt.switch_backend('agg')
+
+
+class ExtractRoundTrips(object):
+    params = [[1, 5], [100, 1000], [10, 100]]
+    param_names = ['years', 'symbols', 'fills_per_day']
+    timeout = 300
+
+    def setup(self, years, symbols, fills_per_day):
+        self.backtest = generate_backtest(years=years, symbols=symbols,
+                                          fills_per_day=fills_per_day)
+        self.portfolio_value = self.backtest.positions.sum(axis='columns')
+
+    def time_extract_round_trips(self, years, symbols, fills_per_day):
+        round_trips.extract_round_trips(
+            self.backtest.transactions,
+            portfolio_value=self.portfolio_value / (1 + self.backtest.returns))
+
+    def peakmem_extract_round_trips(self, years, symbols, fills_per_day):
+        self.time_extract_round_trips(years, symbols, fills_per_day)
+
+
+class PlotRoundTripLifetimes(object):
+    params = [[10, 100]]
+    param_names = ['fills_per_day']
+    timeout = 300
+
+    def setup(self, fills_per_day):
+        backtest = generate_backtest(years=1, symbols=100,
+                                     fills_per_day=fills_per_day)
+        self.round_trips = round_trips.extract_round_trips(
+            backtest.transactions)
+
+    def teardown(self, fills_per_day):
+        plt.close('all')
+
+    def time_plot_round_trip_lifetimes(self, fills_per_day):
+        ax = plotting.plot_round_trip_lifetimes(self.round_trips)
+        ax.figure.canvas.draw()
@@ -0,0 +1,84 @@
+"""
+Tear sheets rendered headless, as in batch.render_tear_sheet, but
+without writing the figures to files.
+"""
+import matplotlib.pyplot as plt
+
+from pyfolio import tears, utils
+from pyfolio.batch import _redirect_stdout
+
+from .synthetic import generate_backtest
+
+plt.switch_backend('agg')
+
+
+def render_headless(tear_sheet, *args, **kwargs):
+    try:
+        with utils.headless_output() as output, _redirect_stdout(output):
+            tear_sheet(*args, **kwargs)
+    finally:
+        plt.close('all')
+
+
+class TearSheets(object):
+    params = [[1, 5], [100, 1000]]
+    param_names = ['years', 'symbols']
+    timeout = 600
+
+    def setup(self, years, symbols):
+        self.backtest = generate_backtest(years=years, symbols=symbols)
+
+    def time_create_full_tear_sheet(self, years, symbols):
+        b = self.backtest
+        render_headless(tears.create_full_tear_sheet, b.returns,
+                        positions=b.positions, transactions=b.transactions,
+                        market_data=b.market_data,
+                        benchmark_rets=b.benchmark_rets, round_trips=True,
+                        factor_returns=b.factor_returns,
+                        factor_loadings=b.factor_loadings)
+
+    def peakmem_create_full_tear_sheet(self, years, symbols):
+        self.time_create_full_tear_sheet(years, symbols)
+
+    def time_create_simple_tear_sheet(self, years, symbols):
+        b = self.backtest
+        render_headless(tears.create_simple_tear_sheet, b.returns,
+                        positions=b.positions, transactions=b.transactions,
+                        benchmark_rets=b.benchmark_rets)
+
+    def time_create_returns_tear_sheet(self, years, symbols):
+        b = self.backtest
+        render_headless(tears.create_returns_tear_sheet, b.returns,
+                        positions=b.positions, transactions=b.transactions,
+                        benchmark_rets=b.benchmark_rets)
+
+    def time_create_position_tear_sheet(self, years, symbols):
+        b = self.backtest
+        render_headless(tears.create_position_tear_sheet, b.returns,
+                        b.positions)
+
+    def time_create_txn_tear_sheet(self, years, symbols):
+        b = self.backtest
+        render_headless(tears.create_txn_tear_sheet, b.returns, b.positions,
+                        b.transactions)
+
+    def time_create_round_trip_tear_sheet(self, years, symbols):
+        b = self.backtest
+        render_headless(tears.create_round_trip_tear_sheet, b.returns,
+                        b.positions, b.transactions)
+
+    def time_create_interesting_times_tear_sheet(self, years, symbols):
+        b = self.backtest
+        render_headless(tears.create_interesting_times_tear_sheet,
+                        b.returns, benchmark_rets=b.benchmark_rets)
+
+    def time_create_capacity_tear_sheet(self, years, symbols):
+        b = self.backtest
+        render_headless(tears.create_capacity_tear_sheet, b.returns,
+                        b.positions, b.transactions, b.market_data)
+
+    def time_create_perf_attrib_tear_sheet(self, years, symbols):
+        b = self.backtest
+        render_headless(tears.create_perf_attrib_tear_sheet, b.returns,
+                        b.positions, b.factor_returns, b.factor_loadings,
+                        transactions=b.transactions)
@@ -0,0 +1,82 @@
+from pyfolio import timeseries
+
+from .synthetic import generate_backtest
+
+
+class PerfStats(object):
+    params = [[1, 10], [100, 1000]]
+    param_names = ['years', 'symbols']
+
+    def setup(self, years, symbols):
+        self.backtest = generate_backtest(years=years, symbols=symbols)
+
+    def time_perf_stats(self, years, symbols):
+        b = self.backtest
+        timeseries.perf_stats(b.returns, factor_returns=b.benchmark_rets,
+                              positions=b.positions,
+                              transactions=b.transactions)
+
+    def peakmem_perf_stats(self, years, symbols):
+        self.time_perf_stats(years, symbols)
+
+
+class PerfStatsBootstrap(object):
+    params = [[1, 10]]
+    param_names = ['years']
+    timeout = 300
+
+    def setup(self, years):
+        self.backtest = generate_backtest(years=years)
+
+    def time_perf_stats_bootstrap(self, years):
+        b = self.backtest
+        timeseries.perf_stats_bootstrap(b.returns,
+                                        factor_returns=b.benchmark_rets)
+
+    def peakmem_perf_stats_bootstrap(self, years):
+        self.time_perf_stats_bootstrap(years)
+
+
+class RollingBeta(object):
+    params = [[1, 10, 30]]
+    param_names = ['years']
+
+    def setup(self, years):
+        self.backtest = generate_backtest(years=years)
+
+    def time_rolling_beta(self, years):
+        b = self.backtest
+        timeseries.rolling_beta(b.returns, b.benchmark_rets)
+
+    def peakmem_rolling_beta(self, years):
+        self.time_rolling_beta(years)
+
+
+class RollingRegression(object):
+    params = [[1, 10], [3, 20]]
+    param_names = ['years', 'factors']
+    timeout = 300
+
+    def setup(self, years, factors):
+        self.backtest = generate_backtest(years=years, factors=factors)
+
+    def time_rolling_regression(self, years, factors):
+        b = self.backtest
+        timeseries.rolling_regression(b.returns, b.factor_returns)
+
+    def peakmem_rolling_regression(self, years, factors):
+        self.time_rolling_regression(years, factors)
+
+
+class TopDrawdowns(object):
+    params = [[1, 10, 30], [10, 100]]
+    param_names = ['years', 'top']
+
+    def setup(self, years, top):
+        self.backtest = generate_backtest(years=years)
+
+    def time_get_top_drawdowns(self, years, top):
+        timeseries.get_top_drawdowns(self.backtest.returns, top=top)
+
+    def peakmem_get_top_drawdowns(self, years, top):
+        self.time_get_top_drawdowns(years, top)
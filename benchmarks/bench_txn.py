@@ -0,0 +1,18 @@
+from pyfolio import txn
+
+from .synthetic import generate_backtest
+
+
+class Turnover(object):
+    params = [[1, 10], [100, 1000], [10, 100]]
+    param_names = ['years', 'symbols', 'fills_per_day']
+
+    def setup(self, years, symbols, fills_per_day):
+        self.backtest = generate_backtest(years=years, symbols=symbols,
+                                          fills_per_day=fills_per_day)
+
+    def time_get_turnover(self, years, symbols, fills_per_day):
+        txn.get_turnover(self.backtest.positions, self.backtest.transactions)
+
+    def peakmem_get_turnover(self, years, symbols, fills_per_day):
+        self.time_get_turnover(years, symbols, fills_per_day)
@@ -0,0 +1,19 @@
+from pyfolio import utils
+
+from .synthetic import generate_backtest
+
+
+class EstimateIntraday(object):
+    params = [[1, 10], [100, 1000], [10, 100]]
+    param_names = ['years', 'symbols', 'fills_per_day']
+
+    def setup(self, years, symbols, fills_per_day):
+        self.backtest = generate_backtest(years=years, symbols=symbols,
+                                          fills_per_day=fills_per_day)
+
+    def time_estimate_intraday(self, years, symbols, fills_per_day):
+        b = self.backtest
+        utils.estimate_intraday(b.returns, b.positions, b.transactions)
+
+    def peakmem_estimate_intraday(self, years, symbols, fills_per_day):
+        self.time_estimate_intraday(years, symbols, fills_per_day)
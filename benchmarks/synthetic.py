@@ -0,0 +1,162 @@
+#
+# Copyright 2019 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Synthetic backtests of any size, for the benchmarks.
+
+The inputs are consistent with one another, as those of a real backtest
+would be: positions are the running sum of the transactions valued at
+the closing prices, and returns are the daily change in portfolio value.
+"""
+from __future__ import division
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from pyfolio.utils import APPROX_BDAYS_PER_YEAR
+
+Backtest = namedtuple('Backtest', [
+    'returns',
+    'positions',
+    'transactions',
+    'market_data',
+    'benchmark_rets',
+    'factor_returns',
+    'factor_loadings',
+])
+
+_cache = {}
+
+
+def generate_backtest(years=1, symbols=100, fills_per_day=10, factors=5,
+                      seed=0):
+    """
+    Generates the inputs of a tear sheet for a synthetic strategy.
+
+    Calls with the same arguments return the same objects, so that the
+    benchmarks of one size share their setup.
+
+    Parameters
+    ----------
+    years : int
+        Length of the backtest, in years of 252 business days.
+    symbols : int
+        Number of symbols traded.
+    fills_per_day : int
+        Number of transactions on each day.
+    factors : int
+        Number of risk factors.
+    seed : int
+        Seed of the random numbers.
+
+    Returns
+    -------
+    Backtest
+        returns, positions (in dollars, with a cash column), transactions,
+        market_data (daily price and volume), benchmark_rets,
+        factor_returns (dates x factors) and factor_loadings ((dt, ticker)
+        x factors).
+    """
+
+    key = (years, symbols, fills_per_day, factors, seed)
+    if key not in _cache:
+        _cache[key] = _generate_backtest(*key)
+    return _cache[key]
+
+
+def _generate_backtest(years, symbols, fills_per_day, factors, seed):
+    rng = np.random.RandomState(seed)
+
+    num_days = int(years * APPROX_BDAYS_PER_YEAR)
+    dates = pd.bdate_range('2010-01-04', periods=num_days, tz='UTC')
+    tickers = np.array(['S{:05d}'.format(i) for i in range(symbols)],
+                       dtype=object)
+    styles = ['factor{}'.format(i) for i in range(factors)]
+
+    # Rising prices and mostly long fills, for a strategy that makes money
+    # and so has a capacity sweep worth running.
+    prices = 50 * np.exp(np.cumsum(
+        rng.normal(0.001, 0.02, (num_days, symbols)), axis=0))
+    volumes = rng.randint(100000, 10000000, (num_days, symbols)).astype(float)
+
+    # Fills at random minutes of the trading day, at the close of their day
+    # moved by some noise.
+    num_fills = num_days * fills_per_day
+    fill_days = np.repeat(np.arange(num_days), fills_per_day)
+    fill_symbols = rng.randint(0, symbols, num_fills)
+    fill_minutes = np.sort(
+        rng.randint(1, 390, (num_days, fills_per_day)), axis=1).ravel()
+    fill_amounts = rng.randint(-80, 101, num_fills) * 10
+    fill_amounts[fill_amounts == 0] = 10
+    fill_prices = (prices[fill_days, fill_symbols]
+                   * (1 + rng.normal(0, 0.002, num_fills)))
+
+    transactions = pd.DataFrame(
+        {
+            'amount': fill_amounts,
+            'price': fill_prices,
+            'symbol': tickers[fill_symbols],
+        },
+        index=(dates[fill_days].normalize()
+               + pd.Timedelta(hours=9, minutes=30)
+               + pd.to_timedelta(fill_minutes, unit='m')),
+    )
+    transactions.index.name = 'dt'
+
+    shares = np.zeros((num_days, symbols))
+    np.add.at(shares, (fill_days, fill_symbols), fill_amounts)
+    shares = np.cumsum(shares, axis=0)
+
+    values = shares * prices
+
+    # Enough capital for a gross leverage of at most 0.5.
+    starting_capital = 2 * np.abs(values).sum(axis=1).max()
+
+    spent = np.bincount(fill_days, weights=fill_amounts * fill_prices,
+                        minlength=num_days)
+    cash = starting_capital - np.cumsum(spent)
+
+    positions = pd.DataFrame(values, index=dates, columns=tickers)
+    positions['cash'] = cash
+
+    portfolio_value = positions.sum(axis='columns').values
+    returns = pd.Series(
+        np.diff(np.r_[starting_capital, portfolio_value])
+        / np.append(starting_capital, portfolio_value[:-1]),
+        index=dates)
+
+    market_data = pd.concat(
+        [pd.DataFrame(prices, index=dates, columns=tickers),
+         pd.DataFrame(volumes, index=dates, columns=tickers)],
+        keys=['price', 'volume'],
+    ).swaplevel().sort_index()
+    market_data.index.names = ['dt', 'market_data']
+
+    benchmark_rets = pd.Series(rng.normal(0.0003, 0.01, num_days),
+                               index=dates)
+
+    factor_returns = pd.DataFrame(rng.normal(0, 0.005, (num_days, factors)),
+                                  index=dates, columns=styles)
+
+    factor_loadings = pd.DataFrame(
+        rng.normal(0, 1, (num_days * symbols, factors)),
+        index=pd.MultiIndex.from_product([dates, tickers],
+                                         names=['dt', 'ticker']),
+        columns=styles,
+    )
+
+    return Backtest(returns, positions, transactions, market_data,
+                    benchmark_rets, factor_returns, factor_loadings)
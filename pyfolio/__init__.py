@@ -1,14 +1,6 @@
-from . import utils
-from . import timeseries
-from . import pos
-from . import txn
-from . import interesting_periods
-from . import capacity
-from . import round_trips
-from . import perf_attrib
-
-from .tears import *  # noqa
-from .plotting import *  # noqa
+import importlib
+import sys
+
 from ._version import get_versions
 
 __version__ = get_versions()['version']
@@ -16,4 +8,55 @@ del get_versions
 
 __all__ = ['utils', 'timeseries', 'pos', 'txn',
            'interesting_periods', 'capacity', 'round_trips',
-           'perf_attrib']
+           'perf_attrib', 'sparse', 'analysis', 'compute', 'batch',
+           'profiling', 'cache', 'precision']
+
+# Modules whose public names are available at the top level, as with
+# `from .tears import *`. Later modules win on name clashes.
+_REEXPORTED_MODULES = ('tears', 'plotting')
+
+
+def _reexported_names(module):
+    return [name for name in vars(module) if not name.startswith('_')]
+
+
+def __getattr__(name):
+    """
+    Imports submodules, and the names of tears and plotting, on first use.
+
+    Importing pyfolio then does not import matplotlib, seaborn or IPython,
+    which only the plotting modules need.
+    """
+    if name in __all__:
+        return importlib.import_module('.' + name, __name__)
+
+    if not name.startswith('_'):
+        for module_name in reversed(_REEXPORTED_MODULES):
+            module = importlib.import_module('.' + module_name, __name__)
+            if name in vars(module):
+                value = getattr(module, name)
+                globals()[name] = value
+                return value
+
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    names = set(globals()) | set(__all__)
+    for module_name in _REEXPORTED_MODULES:
+        module = importlib.import_module('.' + module_name, __name__)
+        names.update(_reexported_names(module))
+    return sorted(names)
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ (PEP 562) is not supported, so import
+    # everything up front.
+    for _name in __all__:
+        importlib.import_module('.' + _name, __name__)
+    for _name in _REEXPORTED_MODULES:
+        _module = importlib.import_module('.' + _name, __name__)
+        globals().update((name, getattr(_module, name))
+                         for name in _reexported_names(_module))
+    del _name, _module
@@ -0,0 +1,188 @@
+#
+# Copyright 2019 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import division
+
+import empyrical as ep
+
+from . import pos
+from . import round_trips
+from . import timeseries
+from . import txn
+from . import utils
+
+# Intermediates that only depend on positions and transactions.
+_RETURNS_INDEPENDENT = ('positions_alloc', 'exposure_summary', 'txn_vol',
+                        'turnover')
+
+
+class AnalysisContext(object):
+    """
+    The inputs of a tear sheet along with the intermediates derived from
+    them. Each intermediate is computed the first time it is requested
+    and reused afterwards, so the sub tear sheets of
+    create_full_tear_sheet share them instead of recomputing them.
+
+    Inputs are expected not to be modified after the context is built.
+
+    Parameters
+    ----------
+    returns : pd.Series
+        Daily returns of the strategy, noncumulative.
+         - See full explanation in tears.create_full_tear_sheet.
+    positions : pd.DataFrame, optional
+        Daily net position values.
+         - See full explanation in tears.create_full_tear_sheet.
+    transactions : pd.DataFrame, optional
+        Prices and amounts of executed trades. One row per trade.
+         - See full explanation in tears.create_full_tear_sheet.
+    estimate_intraday: boolean or str, optional
+        Approximate returns for intraday strategies.
+        See description in tears.create_full_tear_sheet.
+    """
+
+    def __init__(self, returns, positions=None, transactions=None,
+                 estimate_intraday='infer'):
+        self.returns = returns
+        self.transactions = transactions
+        self.estimate_intraday = estimate_intraday
+        self._positions = positions
+        self._cache = {}
+
+    def _get(self, key, func, *args, **kwargs):
+        try:
+            return self._cache[key]
+        except KeyError:
+            result = self._cache[key] = func(*args, **kwargs)
+            return result
+
+    def with_returns(self, returns):
+        """
+        Context for different returns over the same (already intraday
+        checked) positions and transactions. Intermediates that do not
+        depend on returns are shared with this context.
+        """
+
+        if returns is self.returns:
+            return self
+
+        context = AnalysisContext(returns, self.positions, self.transactions,
+                                  estimate_intraday=False)
+        context._cache.update(
+            (key, value) for key, value in self._cache.items()
+            if key[0] in _RETURNS_INDEPENDENT)
+        return context
+
+    @property
+    def positions(self):
+        """
+        Daily net position values, adjusted for intraday movement.
+         - See utils.check_intraday.
+        """
+
+        return self._get(('positions',), utils.check_intraday,
+                         self.estimate_intraday, self.returns,
+                         self._positions, self.transactions)
+
+    @property
+    def cum_returns(self):
+        """
+        Cumulative returns, starting from 1.
+        """
+
+        return self._get(('cum_returns',), ep.cum_returns, self.returns,
+                         starting_value=1.0)
+
+    def drawdown_table(self, top=10):
+        """
+        Information about the top drawdowns.
+         - See timeseries.gen_drawdown_table.
+        """
+
+        return self._get(('drawdown_table', top),
+                         timeseries.gen_drawdown_table, self.returns,
+                         top=top)
+
+    @property
+    def positions_alloc(self):
+        """
+        Portfolio allocation of positions.
+         - See pos.get_percent_alloc.
+        """
+
+        return self._get(('positions_alloc',), pos.get_percent_alloc,
+                         self.positions)
+
+    @property
+    def exposure_summary(self):
+        """
+        Daily long, short and gross exposures, holdings counts and
+        leverage.
+         - See pos.get_exposure_summary.
+        """
+
+        return self._get(('exposure_summary',), pos.get_exposure_summary,
+                         self.positions)
+
+    @property
+    def txn_vol(self):
+        """
+        Daily transaction volume and number of shares.
+         - See txn.get_txn_vol.
+        """
+
+        return self._get(('txn_vol',), txn.get_txn_vol, self.transactions)
+
+    def turnover(self, denominator='AGB'):
+        """
+        Daily turnover rates.
+         - See txn.get_turnover.
+        """
+
+        return self._get(('turnover', denominator), txn.get_turnover,
+                         self.positions, self.transactions, denominator,
+                         txn_vol=self.txn_vol)
+
+    @property
+    def round_trips(self):
+        """
+        Round trip trades, including ones closed at the end of the
+        backtest.
+         - See round_trips.extract_round_trips.
+        """
+
+        return self._get(('round_trips',), self._extract_round_trips)
+
+    def _extract_round_trips(self):
+        positions = self.positions
+        transactions_closed = round_trips.add_closing_transactions(
+            positions, self.transactions)
+        # extract_round_trips requires BoD portfolio_value
+        return round_trips.extract_round_trips(
+            transactions_closed,
+            portfolio_value=positions.sum(axis='columns') / (1 + self.returns)
+        )
+
+
+def get_analysis_context(analysis_context, returns, positions=None,
+                         transactions=None, estimate_intraday='infer'):
+    """
+    Returns the analysis context for a tear sheet on returns, building
+    one from the inputs unless a context was passed in.
+    """
+
+    if analysis_context is None:
+        return AnalysisContext(returns, positions, transactions,
+                               estimate_intraday=estimate_intraday)
+    return analysis_context.with_returns(returns)
@@ -0,0 +1,219 @@
+#
+# Copyright 2019 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import division
+
+import base64
+import io
+import os
+import sys
+import traceback
+import warnings
+from contextlib import contextmanager
+from multiprocessing import Pool
+
+import matplotlib.pyplot as plt
+
+from . import tears
+from . import utils
+
+FORMATS = ('png', 'svg', 'html')
+TEAR_SHEET_INPUTS = ('returns', 'positions', 'transactions')
+
+
+def render_tear_sheets(strategies, output_dir, formats=('png', 'html'),
+                       tear_sheet=tears.create_full_tear_sheet,
+                       processes=None, maxtasksperchild=1, dpi=72,
+                       **kwargs):
+    """
+    Renders a tear sheet for each of many strategies to files, without a
+    notebook or an interactive matplotlib backend.
+
+    Strategies are spread over a pool of worker processes. Each worker is
+    replaced after maxtasksperchild strategies, which bounds the memory
+    any one worker accumulates over a long batch.
+
+    Parameters
+    ----------
+    strategies : dict or iterable of (name, inputs)
+        Strategies to render, keyed by name. Names are used as file name
+        prefixes. Inputs are either
+         - a tuple of (returns, positions, transactions), where positions
+           and transactions may be omitted,
+         - a dict of keyword arguments to the tear sheet function, or
+         - a picklable callable taking no arguments and returning either
+           of the above. The callable is invoked inside the worker, so
+           the data of a strategy is only loaded when it is rendered.
+    output_dir : str
+        Directory the files are written to. Created if it does not exist.
+    formats : iterable of str, optional
+        Any of 'png' and 'svg', which write one file per figure, and
+        'html', which writes a single page with the tables, printed text
+        and figures of the tear sheet.
+    tear_sheet : function, optional
+        Tear sheet function to render, create_full_tear_sheet by default.
+        Must be picklable, e.g. defined at module level.
+    processes : int, optional
+        Number of worker processes. Defaults to the number of CPUs. If 1,
+        strategies are rendered in this process.
+    maxtasksperchild : int, optional
+        Number of strategies a worker renders before being replaced.
+    dpi : int, optional
+        Resolution of PNG images.
+    **kwargs, optional
+        Passed to the tear sheet function for every strategy.
+
+    Returns
+    -------
+    dict
+        Paths of the files written, keyed by strategy name. Strategies
+        that failed to render are left out, with a warning.
+    """
+
+    formats = tuple(formats)
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError("Unknown formats {}. Supported formats are {}."
+                         .format(sorted(unknown), FORMATS))
+
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    if hasattr(strategies, 'items'):
+        strategies = strategies.items()
+
+    tasks = ((name, inputs, output_dir, formats, tear_sheet, dpi, kwargs)
+             for name, inputs in strategies)
+
+    if processes == 1:
+        results = [_render_task(task) for task in tasks]
+    else:
+        pool = Pool(processes, initializer=_init_worker,
+                    maxtasksperchild=maxtasksperchild)
+        try:
+            results = list(pool.imap(_render_task, tasks))
+        finally:
+            pool.close()
+            pool.join()
+
+    paths = {}
+    for name, written, error in results:
+        if error is not None:
+            warnings.warn('Unable to render tear sheet for {}:\n{}'
+                          .format(name, error), UserWarning)
+        else:
+            paths[name] = written
+
+    return paths
+
+
+def render_tear_sheet(name, inputs, output_dir, formats=('png', 'html'),
+                      tear_sheet=tears.create_full_tear_sheet, dpi=72,
+                      **kwargs):
+    """
+    Renders the tear sheet of a single strategy to files in the current
+    process. See render_tear_sheets for a description of the arguments.
+
+    Returns
+    -------
+    list of str
+        Paths of the files written.
+    """
+
+    if callable(inputs):
+        inputs = inputs()
+    if not isinstance(inputs, dict):
+        inputs = dict(zip(TEAR_SHEET_INPUTS, inputs))
+
+    tear_sheet_kwargs = dict(kwargs)
+    tear_sheet_kwargs.update(inputs)
+
+    pyplot_figures = set(plt.get_fignums())
+    try:
+        with utils.headless_output() as output, _redirect_stdout(output):
+            tear_sheet(**tear_sheet_kwargs)
+    finally:
+        # Plots that fall back to the current axes still go to pyplot.
+        for num in set(plt.get_fignums()) - pyplot_figures:
+            plt.close(num)
+
+    return _write_output(output, output_dir, name, formats, dpi)
+
+
+def _init_worker():
+    plt.switch_backend('agg')
+
+
+def _render_task(task):
+    name, inputs, output_dir, formats, tear_sheet, dpi, kwargs = task
+    try:
+        written = render_tear_sheet(name, inputs, output_dir,
+                                    formats=formats, tear_sheet=tear_sheet,
+                                    dpi=dpi, **kwargs)
+    except Exception:
+        return name, None, traceback.format_exc()
+    return name, written, None
+
+
+@contextmanager
+def _redirect_stdout(stream):
+    stdout = sys.stdout
+    sys.stdout = stream
+    try:
+        yield stream
+    finally:
+        sys.stdout = stdout
+
+
+def _write_output(output, output_dir, name, formats, dpi):
+    prefix = os.path.join(output_dir, str(name))
+    written = []
+
+    for fmt in ('png', 'svg'):
+        if fmt in formats:
+            for i, fig in enumerate(output.figures):
+                path = '{}_{}.{}'.format(prefix, i, fmt)
+                fig.savefig(path, format=fmt, dpi=dpi, bbox_inches='tight')
+                written.append(path)
+
+    if 'html' in formats:
+        path = prefix + '.html'
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(_to_html(output, str(name), dpi))
+        written.append(path)
+
+    return written
+
+
+def _to_html(output, title, dpi):
+    body = []
+    for kind, item in output.items:
+        if kind == 'html':
+            body.append(item)
+        elif kind == 'text':
+            body.append(u'<pre>{}</pre>'.format(_escape(item)))
+        else:
+            image = io.BytesIO()
+            item.savefig(image, format='png', dpi=dpi, bbox_inches='tight')
+            body.append(u'<img src="data:image/png;base64,{}"/>'.format(
+                base64.b64encode(image.getvalue()).decode('ascii')))
+
+    return (u'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            u'<title>{}</title>\n</head>\n<body>\n{}\n</body>\n</html>\n'
+            .format(_escape(title), u'\n'.join(body)))
+
+
+def _escape(text):
+    return (text.replace(u'&', u'&amp;').replace(u'<', u'&lt;')
+            .replace(u'>', u'&gt;'))
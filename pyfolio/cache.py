@@ -0,0 +1,381 @@
+#
+# Copyright 2019 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Opt-in disk cache for expensive intermediates.
+
+Round trips, intraday position estimates, rolling regressions, seeded
+forecast cones and performance attribution are stored on disk, keyed by
+a hash of their inputs, so that tear sheets regenerated for the same
+backtest skip recomputing them:
+
+>>> pyfolio.cache.enable('/data/pyfolio_cache', max_size=10 * 2 ** 30)
+>>> pyfolio.create_full_tear_sheet(returns, positions, transactions,
+>>>                                round_trips=True)
+
+Arrays are stored as NPZ, frames without a DatetimeIndex as Parquet when
+pyarrow is installed, and anything else is pickled. The least recently
+used entries are evicted once the cache outgrows max_size.
+"""
+from __future__ import division
+
+import hashlib
+import inspect
+import os
+import pickle
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import partial, wraps
+from numbers import Number
+
+import numpy as np
+import pandas as pd
+
+from . import __version__
+
+# Part of every key, along with the version of pyfolio, so that entries
+# computed by other versions are not used. Bump it when the way results
+# are keyed or stored changes.
+CACHE_VERSION = 1
+
+DEFAULT_MAX_SIZE = 2 ** 30
+
+_EXTENSIONS = ('.npz', '.parquet', '.pkl')
+
+_cache = None
+
+
+class DiskCache(object):
+    """
+    Results of function calls stored in a directory, keyed by a hash of
+    the function and its arguments.
+
+    Parameters
+    ----------
+    directory : str
+        Directory the results are stored in. Created if it does not exist.
+    max_size : int, optional
+        Size in bytes beyond which the least recently used results are
+        removed.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, func, args, kwargs):
+        """
+        Hash of a call of func. Raises TypeError if an argument cannot be
+        hashed.
+        """
+
+        hasher = hashlib.sha256()
+        _update_hash(hasher, (CACHE_VERSION, __version__, func.__module__,
+                              getattr(func, '__qualname__', func.__name__)))
+        arguments = _call_arguments(func, args, kwargs)
+        for name, value in sorted(arguments.items()):
+            _update_hash(hasher, name)
+            _update_hash(hasher, value)
+        return hasher.hexdigest()
+
+    def get(self, key):
+        """
+        Returns a tuple of (found, value).
+        """
+
+        for path in self._paths(key):
+            if os.path.exists(path):
+                try:
+                    value = _read(path)
+                except Exception:
+                    # Partially evicted or unreadable, e.g. written by an
+                    # incompatible version of a library.
+                    _remove(path)
+                    continue
+                # Mark as recently used.
+                os.utime(path, None)
+                return True, value
+        return False, None
+
+    def put(self, key, value):
+        base = os.path.join(self.directory, key)
+        tmp = '{}.{}.tmp'.format(base, os.getpid())
+        try:
+            extension = _write(tmp, value)
+            _replace(tmp, base + extension)
+        finally:
+            _remove(tmp)
+        self.evict()
+
+    def entries(self):
+        """
+        Returns a list of (path, size, last used time) of the entries.
+        """
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(_EXTENSIONS):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits in
+        max_size.
+        """
+
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        size = sum(size for _, size, _ in entries)
+        for path, entry_size, _ in entries:
+            if size <= self.max_size:
+                break
+            _remove(path)
+            size -= entry_size
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            _remove(path)
+
+    def _paths(self, key):
+        return [os.path.join(self.directory, key + extension)
+                for extension in _EXTENSIONS]
+
+
+def default_directory():
+    """
+    The PYFOLIO_CACHE_DIR environment variable, or ~/.cache/pyfolio.
+    """
+
+    return os.environ.get(
+        'PYFOLIO_CACHE_DIR',
+        os.path.join(os.path.expanduser('~'), '.cache', 'pyfolio'))
+
+
+def enable(directory=None, max_size=DEFAULT_MAX_SIZE):
+    """
+    Caches the results of the cached functions of pyfolio on disk from now
+    on. Results are only reused by the same version of pyfolio. Calls on
+    pandas objects are not cached before pandas 0.20.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Directory of the cache. See default_directory.
+    max_size : int, optional
+        Size of the cache in bytes.
+
+    Returns
+    -------
+    DiskCache
+    """
+
+    global _cache
+    _cache = DiskCache(directory or default_directory(), max_size=max_size)
+    return _cache
+
+
+def disable():
+    global _cache
+    _cache = None
+
+
+@contextmanager
+def use_cache(directory=None, max_size=DEFAULT_MAX_SIZE):
+    """
+    Caches results on disk inside this context only. See enable.
+
+    Yields
+    ------
+    DiskCache
+    """
+
+    global _cache
+    previous = _cache
+    try:
+        yield enable(directory, max_size=max_size)
+    finally:
+        _cache = previous
+
+
+def cached(func=None, seed=None):
+    """
+    Decorator that stores the results of func in the disk cache, when
+    enabled. Calls with arguments that cannot be hashed are not cached.
+
+    Parameters
+    ----------
+    seed : str, optional
+        Name of the random seed argument of func, if func draws random
+        numbers. Calls without a seed give different results each time,
+        and are not cached.
+    """
+
+    if func is None:
+        return partial(cached, seed=seed)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = _cache
+        if cache is None:
+            return func(*args, **kwargs)
+
+        if (seed is not None and
+                _call_arguments(func, args, kwargs)[seed] is None):
+            return func(*args, **kwargs)
+
+        try:
+            key = cache.key(func, args, kwargs)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        found, value = cache.get(key)
+        if not found:
+            value = func(*args, **kwargs)
+            cache.put(key, value)
+        return value
+
+    return wrapper
+
+
+def _call_arguments(func, args, kwargs):
+    """
+    Arguments of a call of func by name, including defaults.
+    """
+
+    # inspect.signature is Python 3 only.
+    return inspect.getcallargs(func, *args, **kwargs)
+
+
+def _update_hash(hasher, value):
+    """
+    Feeds value into hasher. Pandas objects and arrays are hashed by
+    content, along with their labels and types. Raises TypeError if value
+    cannot be hashed, which includes pandas objects before pandas 0.20.
+    """
+
+    hasher.update(type(value).__name__.encode())
+
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        if isinstance(value, pd.DataFrame):
+            _update_hash(hasher, value.columns)
+            _update_hash(hasher, [str(dtype) for dtype in value.dtypes])
+        else:
+            _update_hash(hasher, str(value.dtype))
+        if not isinstance(value, pd.Index):
+            _update_hash(hasher, value.index.names)
+            _update_hash(hasher, str(getattr(value.index, 'dtype', '')))
+            _update_hash(hasher, str(getattr(value.index, 'freq', None)))
+        _update_hash(hasher, getattr(value, 'name', None))
+        hasher.update(_pandas_hasher('hash_pandas_object')(value)
+                      .values.tobytes())
+    elif isinstance(value, np.ndarray):
+        _update_hash(hasher, (str(value.dtype), value.shape))
+        if value.dtype == object:
+            value = _pandas_hasher('hash_array')(value.ravel())
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        items = sorted(value.items(), key=lambda item: repr(item[0]))
+        for item in items:
+            _update_hash(hasher, item)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(str(len(value)).encode())
+        for item in value:
+            _update_hash(hasher, item)
+    elif value is None or isinstance(value, (Number, str, bytes, np.generic,
+                                             datetime, timedelta)):
+        hasher.update(repr(value).encode())
+    else:
+        raise TypeError('Cannot hash {}'.format(type(value).__name__))
+
+
+def _pandas_hasher(name):
+    """
+    Hash function of pandas.util, which only exist from pandas 0.20.
+    """
+
+    try:
+        return getattr(pd.util, name)
+    except AttributeError:
+        raise TypeError('Cannot hash pandas objects before pandas 0.20')
+
+
+def _write(path, value):
+    """
+    Writes value to path, and returns the extension of its format.
+    """
+
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        with open(path, 'wb') as f:
+            np.savez(f, value=value)
+        return '.npz'
+
+    if isinstance(value, pd.DataFrame) and _parquet_compatible(value):
+        try:
+            value.to_parquet(path)
+            return '.parquet'
+        except Exception:
+            pass
+
+    with open(path, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return '.pkl'
+
+
+def _read(path):
+    if path.endswith('.npz'):
+        with np.load(path) as data:
+            return data['value']
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _parquet_compatible(frame):
+    try:
+        import pyarrow  # noqa
+    except ImportError:
+        return False
+    # Parquet does not keep the freq of a DatetimeIndex, which changes how
+    # the frame is plotted and resampled.
+    return (not isinstance(frame.index, pd.DatetimeIndex) and
+            not isinstance(frame.columns, pd.MultiIndex) and
+            frame.columns.is_unique and
+            all(isinstance(column, str) for column in frame.columns))
+
+
+def _replace(source, destination):
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+    else:
+        # Python 2, where os.rename does not overwrite on Windows.
+        _remove(destination)
+        os.rename(source, destination)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,12 +1,18 @@
 from __future__ import division
 
+import warnings
+from collections import OrderedDict
+
 import empyrical as ep
 import numpy as np
 import pandas as pd
 
 from . import pos
+from .precision import to_panel
+from .profiling import timed
 
 
+@timed
 def daily_txns_with_bar_data(transactions, market_data):
     """
     Sums the absolute value of shares traded in each name on each day.
@@ -43,6 +49,168 @@ def daily_txns_with_bar_data(transactions, market_data):
     return txn_daily
 
 
+@timed
+def intraday_txns_with_bar_data(transactions, market_data,
+                                tolerance=pd.Timedelta(minutes=1),
+                                chunksize=1000000):
+    """
+    Sums the absolute value of shares traded in each name during each
+    intraday bar. Adds columns containing the bar price and bar volume
+    for each bar-ticker combination.
+
+    Each fill is matched to the first bar of the same ticker stamped at
+    or after the fill, i.e. bars are assumed to be labelled by their
+    close time. Fills are matched in chunks so that the size of the
+    intermediate arrays stays bounded for very large fill histories.
+
+    Parameters
+    ----------
+    transactions : pd.DataFrame
+        Prices and amounts of executed trades. One row per trade.
+        - See full explanation in tears.create_full_tear_sheet
+    market_data : pd.DataFrame
+        Intraday (e.g. minute) market_data
+        - DataFrame has a multi-index index, one level is bar close times
+        and another is market_data contains volume & price, equities as
+        columns
+    tolerance : pd.Timedelta, optional
+        Maximum distance between a fill and its bar. Fills without a bar
+        within tolerance are kept at their own time with NaN price and
+        volume, as daily_txns_with_bar_data keeps trades without market
+        data, and a warning gives their number.
+    chunksize : int, optional
+        Number of fills matched against the bars at a time.
+
+    Returns
+    -------
+    txn_bars : pd.DataFrame
+        Per-bar totals for transacted shares in each traded name, with
+        the same columns as daily_txns_with_bar_data and bar close times
+        as index. Can be passed to apply_slippage_penalty.
+    """
+
+    bars = _stack_market_data(market_data)
+    symbols = pd.Index(market_data.columns)
+
+    # Bars sorted by ticker, then time, searched through integer keys.
+    bar_times = pd.DatetimeIndex(bars.bar_dt).asi8
+    times, time_codes = np.unique(bar_times, return_inverse=True)
+    bar_symbols = symbols.get_indexer(bars.symbol)
+    bar_keys = bar_symbols * len(times) + time_codes
+    order = np.argsort(bar_keys, kind='mergesort')
+    bars = bars.iloc[order].reset_index(drop=True)
+    bar_times = bar_times[order]
+    bar_symbols = bar_symbols[order]
+    bar_keys = bar_keys[order]
+
+    fills = pd.DataFrame({'dt': transactions.index,
+                          'symbol': transactions.symbol.values,
+                          'amount': np.abs(transactions.amount.values)})
+    fill_times = pd.DatetimeIndex(transactions.index).asi8
+    fill_symbols = symbols.get_indexer(fills.symbol)
+    tolerance = pd.Timedelta(tolerance).value
+
+    txn_bars = []
+    num_unmatched = 0
+    for start in range(0, max(len(fills), 1), chunksize):
+        stop = start + chunksize
+        chunk_times = fill_times[start:stop]
+        chunk_symbols = fill_symbols[start:stop]
+
+        # First bar of the same ticker at or after each fill.
+        keys = (chunk_symbols * len(times) +
+                np.searchsorted(times, chunk_times, side='left'))
+        bar = np.searchsorted(bar_keys, keys, side='left')
+        found = np.flatnonzero((chunk_symbols != -1) &
+                               (bar < len(bar_keys)))
+        is_matched = np.zeros(len(keys), dtype=bool)
+        is_matched[found] = (
+            (bar_symbols[bar[found]] == chunk_symbols[found]) &
+            (bar_times[bar[found]] - chunk_times[found] <= tolerance))
+
+        chunk = fills.iloc[start:stop]
+        matched = bars.iloc[bar[is_matched]].assign(
+            amount=chunk.amount.values[is_matched])
+        unmatched = chunk[~is_matched].rename(columns={'dt': 'bar_dt'})
+        num_unmatched += len(unmatched)
+
+        txn_bars.append(_sum_by_bar(
+            pd.concat([matched, unmatched], ignore_index=True)))
+
+    if num_unmatched:
+        warnings.warn(
+            '{} fills have no bar of their ticker within {} after them. '
+            'They have no price and volume, and so no slippage '
+            'penalty.'.format(num_unmatched, pd.Timedelta(tolerance)),
+            UserWarning)
+
+    # A bar may be split over two chunks, so sum the chunks once more.
+    txn_bars = _sum_by_bar(pd.concat(txn_bars, ignore_index=True))
+
+    txn_bars = txn_bars.set_index('bar_dt')
+    txn_bars.index.name = 'date'
+
+    return txn_bars[['symbol', 'amount', 'price', 'volume']]
+
+
+def _stack_market_data(market_data):
+    """
+    Converts market_data to long format, one row per bar and ticker,
+    sorted by bar time.
+    """
+
+    bars = pd.DataFrame({
+        'price': market_data.xs('price', level=1).stack(),
+        'volume': market_data.xs('volume', level=1).stack(),
+    })
+    bars.index = bars.index.set_names(['bar_dt', 'symbol'])
+
+    return bars.reset_index().sort_values('bar_dt', kind='mergesort')
+
+
+def _sum_by_bar(matched):
+    """
+    Sums matched fill amounts for each ticker and bar.
+    """
+
+    return (matched.groupby(['bar_dt', 'symbol'], sort=True)
+            .agg({'amount': 'sum', 'price': 'first', 'volume': 'first'})
+            .reset_index())
+
+
+def aggregate_intraday_bars(market_data, freq='D'):
+    """
+    Aggregates intraday market_data to daily (or other freq) bars, so
+    that intraday market data can be used with the daily capacity
+    analyses. Volume is summed and the last price of each period is
+    kept.
+
+    Parameters
+    ----------
+    market_data : pd.DataFrame
+        Intraday market_data
+        - See intraday_txns_with_bar_data
+    freq : str, optional
+        Frequency to aggregate to.
+
+    Returns
+    -------
+    market_data : pd.DataFrame
+        market_data in the same format, at the requested frequency.
+    """
+
+    price = market_data.xs('price', level=1)
+    volume = market_data.xs('volume', level=1)
+
+    price = price.resample(freq).last().dropna(how='all')
+    volume = volume.resample(freq).sum().reindex(price.index)
+
+    market_data = pd.concat([price, volume], keys=['price', 'volume'],
+                            names=[market_data.index.names[1]])
+
+    return market_data.swaplevel(0, 1).sort_index()
+
+
 def days_to_liquidate_positions(positions, market_data,
                                 max_bar_consumption=0.2,
                                 capital_base=1e6,
@@ -84,9 +252,30 @@ def days_to_liquidate_positions(positions, market_data,
         Datetime index, symbols as columns.
     """
 
-    DV = market_data.xs('volume', level=1) * market_data.xs('price', level=1)
-    roll_mean_dv = DV.rolling(window=mean_volume_window,
-                              center=False).mean().shift()
+    days_to_liquidate, _ = _days_to_liquidate_and_alloc(
+        positions, market_data,
+        max_bar_consumption=max_bar_consumption,
+        capital_base=capital_base,
+        mean_volume_window=mean_volume_window)
+
+    return days_to_liquidate
+
+
+def _days_to_liquidate_and_alloc(positions, market_data,
+                                 max_bar_consumption=0.2,
+                                 capital_base=1e6,
+                                 mean_volume_window=5):
+    """
+    Computes days to liquidate (see days_to_liquidate_positions) along
+    with the portfolio allocations it was derived from, aligned to the
+    same dates and symbols, so that callers don't need to recompute
+    the allocations.
+    """
+
+    DV = to_panel(market_data.xs('volume', level=1)) * \
+        to_panel(market_data.xs('price', level=1))
+    roll_mean_dv = to_panel(DV.rolling(window=mean_volume_window,
+                                       center=False).mean().shift())
     roll_mean_dv = roll_mean_dv.replace(0, np.nan)
 
     positions_alloc = pos.get_percent_alloc(positions)
@@ -94,8 +283,54 @@ def days_to_liquidate_positions(positions, market_data,
 
     days_to_liquidate = (positions_alloc * capital_base) / \
         (max_bar_consumption * roll_mean_dv)
+    # Symbols missing from either side are filled in as float64 NaNs.
+    days_to_liquidate = to_panel(days_to_liquidate.iloc[mean_volume_window:])
+
+    positions_alloc = positions_alloc.reindex(
+        index=days_to_liquidate.index, columns=days_to_liquidate.columns)
+
+    return days_to_liquidate, positions_alloc
 
-    return days_to_liquidate.iloc[mean_volume_window:]
+
+def _max_days_to_liquidate(days_to_liquidate, positions_alloc,
+                           last_n_days=None):
+    """
+    Column-wise argmax of days to liquidate, restricted to the last n
+    days if requested. Symbols that never have a defined liquidation
+    time get NaN values.
+    """
+
+    dates = days_to_liquidate.index
+    start = 0
+    if last_n_days is not None and len(dates) > 0:
+        start = dates.searchsorted(dates.max() -
+                                   pd.Timedelta(days=last_n_days))
+
+    dtl = days_to_liquidate.values[start:]
+    alloc = positions_alloc.values[start:]
+
+    symbols = days_to_liquidate.columns
+    worst_liq = pd.DataFrame(index=pd.Index(symbols, name='symbol'),
+                             columns=['date', 'days_to_liquidate',
+                                      'pos_alloc_pct'])
+
+    if len(dtl) == 0:
+        for column in ('days_to_liquidate', 'pos_alloc_pct'):
+            worst_liq[column] = worst_liq[column].astype(float)
+        return worst_liq
+
+    nan_mask = np.isnan(dtl)
+    has_value = ~nan_mask.all(axis=0)
+    row = np.where(nan_mask, -np.inf, dtl).argmax(axis=0)
+    col = np.arange(dtl.shape[1])
+
+    worst_liq['date'] = dates[start:][row].where(has_value)
+    worst_liq['days_to_liquidate'] = np.where(has_value, dtl[row, col],
+                                              np.nan)
+    worst_liq['pos_alloc_pct'] = np.where(has_value, alloc[row, col],
+                                          np.nan) * 100
+
+    return worst_liq
 
 
 def get_max_days_to_liquidate_by_ticker(positions, market_data,
@@ -135,27 +370,64 @@ def get_max_days_to_liquidate_by_ticker(positions, market_data,
         date and position_alloc on that day.
     """
 
-    dtlp = days_to_liquidate_positions(positions, market_data,
-                                       max_bar_consumption=max_bar_consumption,
-                                       capital_base=capital_base,
-                                       mean_volume_window=mean_volume_window)
+    return get_max_days_to_liquidate_by_ticker_windows(
+        positions, market_data,
+        max_bar_consumption=max_bar_consumption,
+        capital_base=capital_base,
+        mean_volume_window=mean_volume_window,
+        windows=[last_n_days])[last_n_days]
+
 
-    if last_n_days is not None:
-        dtlp = dtlp.loc[dtlp.index.max() - pd.Timedelta(days=last_n_days):]
+@timed
+def get_max_days_to_liquidate_by_ticker_windows(positions, market_data,
+                                                max_bar_consumption=0.2,
+                                                capital_base=1e6,
+                                                mean_volume_window=5,
+                                                windows=(None,)):
+    """
+    Finds the longest estimated liquidation time for each traded name
+    over several lookback windows at once. Days to liquidate are only
+    computed once and each window is reduced with a column-wise argmax.
 
-    pos_alloc = pos.get_percent_alloc(positions)
-    pos_alloc = pos_alloc.drop('cash', axis=1)
+    Parameters
+    ----------
+    positions: pd.DataFrame
+        Contains daily position values including cash
+        - See full explanation in tears.create_full_tear_sheet
+    market_data : pd.DataFrame
+        Daily market_data
+        - DataFrame has a multi-index index, one level is dates and another is
+        market_data contains volume & price, equities as columns
+    max_bar_consumption : float
+        Max proportion of a daily bar that can be consumed in the
+        process of liquidating a position.
+    capital_base : integer
+        Capital base multiplied by portfolio allocation to compute
+        position value that needs liquidating.
+    mean_volume_window : float
+        Trailing window to use in mean volume calculation.
+    windows : iterable of integers or None
+        Values of last_n_days to compute. None stands for the whole
+        backtest. Repeated values are computed once.
 
-    liq_desc = pd.DataFrame()
-    liq_desc['days_to_liquidate'] = dtlp.unstack()
-    liq_desc['pos_alloc_pct'] = pos_alloc.unstack() * 100
-    liq_desc.index.levels[0].name = 'symbol'
-    liq_desc.index.levels[1].name = 'date'
+    Returns
+    -------
+    OrderedDict
+        Maps each window to a DataFrame as returned by
+        get_max_days_to_liquidate_by_ticker.
+    """
 
-    worst_liq = liq_desc.reset_index().sort_values(
-        'days_to_liquidate', ascending=False).groupby('symbol').first()
+    days_to_liquidate, positions_alloc = _days_to_liquidate_and_alloc(
+        positions, market_data,
+        max_bar_consumption=max_bar_consumption,
+        capital_base=capital_base,
+        mean_volume_window=mean_volume_window)
 
-    return worst_liq
+    return OrderedDict(
+        (window, _max_days_to_liquidate(days_to_liquidate, positions_alloc,
+                                        last_n_days=window))
+        for window in OrderedDict.fromkeys(windows)
+    )
 
 
 def get_low_liquidity_transactions(transactions, market_data,
@@ -177,21 +449,69 @@ def get_low_liquidity_transactions(transactions, market_data,
         Compute for only the last n days of the passed backtest data.
     """
 
+    return get_low_liquidity_transactions_windows(
+        transactions, market_data, windows=[last_n_days])[last_n_days]
+
+
+@timed
+def get_low_liquidity_transactions_windows(transactions, market_data,
+                                           windows=(None,)):
+    """
+    For each traded name, find the daily transaction total that consumed
+    the greatest proportion of available daily bar volume, over several
+    lookback windows at once. Daily bar consumption is only computed
+    once and each window is reduced with a grouped idxmax.
+
+    Parameters
+    ----------
+    transactions : pd.DataFrame
+        Prices and amounts of executed trades. One row per trade.
+         - See full explanation in create_full_tear_sheet.
+    market_data : pd.DataFrame
+        Daily market_data
+        - DataFrame has a multi-index index, one level is dates and another is
+        market_data contains volume & price, equities as columns
+    windows : iterable of integers or None
+        Values of last_n_days to compute. None stands for the whole
+        backtest. Repeated values are computed once.
+
+    Returns
+    -------
+    OrderedDict
+        Maps each window to a DataFrame as returned by
+        get_low_liquidity_transactions.
+    """
+
     txn_daily_w_bar = daily_txns_with_bar_data(transactions, market_data)
-    txn_daily_w_bar.index.name = 'date'
-    txn_daily_w_bar = txn_daily_w_bar.reset_index()
+    dates = txn_daily_w_bar.index
+    symbols = txn_daily_w_bar.symbol.values
+    pct_bar_consumed = pd.Series(
+        (txn_daily_w_bar.amount / txn_daily_w_bar.volume).values * 100)
+
+    result = OrderedDict()
+    for window in OrderedDict.fromkeys(windows):
+        if window is None:
+            in_window = np.ones(len(dates), dtype=bool)
+        else:
+            in_window = dates > dates.max() - pd.Timedelta(days=window)
+
+        window_pct = pct_bar_consumed[in_window]
+        window_symbols = symbols[in_window]
+        worst = window_pct.dropna().groupby(
+            window_symbols[window_pct.notnull().values]).idxmax()
 
-    if last_n_days is not None:
-        md = txn_daily_w_bar.date.max() - pd.Timedelta(days=last_n_days)
-        txn_daily_w_bar = txn_daily_w_bar[txn_daily_w_bar.date > md]
+        max_bar_consumption = pd.DataFrame(
+            {'date': dates[worst.values],
+             'max_pct_bar_consumed': pct_bar_consumed[worst.values].values},
+            index=worst.index,
+            columns=['date', 'max_pct_bar_consumed'])
+        max_bar_consumption = max_bar_consumption.reindex(
+            np.unique(window_symbols))
+        max_bar_consumption.index.name = 'symbol'
 
-    bar_consumption = txn_daily_w_bar.assign(
-        max_pct_bar_consumed=(
-            txn_daily_w_bar.amount/txn_daily_w_bar.volume)*100
-    ).sort_values('max_pct_bar_consumed', ascending=False)
-    max_bar_consumption = bar_consumption.groupby('symbol').first()
+        result[window] = max_bar_consumption
 
-    return max_bar_consumption[['date', 'max_pct_bar_consumed']]
+    return result
 
 
 def apply_slippage_penalty(returns, txn_daily, simulate_starting_capital,
@@ -210,6 +530,9 @@ def apply_slippage_penalty(returns, txn_daily, simulate_starting_capital,
     txn_daily : pd.Series
         Daily transaciton totals, closing price, and daily volume for
         each traded name. See price_volume_daily_txns for more details.
+        Per-bar totals from intraday_txns_with_bar_data can be passed
+        instead; penalties are then computed for each bar and summed
+        into daily return adjustments.
     simulate_starting_capital : integer
         capital at which we want to test
     backtest_starting_capital: capital base at which backtest was
@@ -0,0 +1,862 @@
+#
+# Copyright 2019 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Compute-only counterparts of the tear sheets in pyfolio.tears.
+
+Each compute_*_tear_sheet function returns the tables and series a tear
+sheet displays as a TearSheetResult, without creating figures, rendering
+HTML tables or touching seaborn. This module does not import matplotlib,
+seaborn or IPython, so it can be used on machines without a display or a
+notebook, e.g. to compute many tear sheets in batch.
+"""
+from __future__ import division
+
+import warnings
+from collections import OrderedDict
+
+import empyrical as ep
+import numpy as np
+import pandas as pd
+
+from . import analysis
+from . import capacity
+from . import perf_attrib
+from . import pos
+from . import round_trips
+from . import timeseries
+from . import txn
+from . import utils
+from .profiling import timed
+from .utils import APPROX_BDAYS_PER_MONTH, MM_DISPLAY_UNIT
+
+SLIPPAGE_SWEEP_PARAMS = (3, 8, 10, 12, 15, 20, 50)
+
+
+class TearSheetResult(OrderedDict):
+    """
+    Tables and series computed for a tear sheet, in the order the tear
+    sheet displays them. Items are also accessible as attributes, e.g.
+    result.perf_stats. Results of combined tear sheets hold the results
+    of their sub tear sheets.
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __dir__(self):
+        return list(self.keys()) + dir(type(self))
+
+
+def perf_stats_table(returns, factor_returns=None, positions=None,
+                     transactions=None, turnover_denom='AGB',
+                     live_start_date=None, bootstrap=False,
+                     analysis_context=None):
+    """
+    Computes the performance metrics shown by plotting.show_perf_stats,
+    split into in-sample and out-of-sample periods if live_start_date is
+    given.
+
+    Parameters
+    ----------
+    returns : pd.Series
+        Daily returns of the strategy, noncumulative.
+         - See full explanation in tears.create_full_tear_sheet.
+    factor_returns : pd.Series, optional
+        Daily noncumulative returns of the benchmark factor to which betas are
+        computed. Usually a benchmark such as market returns.
+         - This is in the same style as returns.
+    positions : pd.DataFrame, optional
+        Daily net position values.
+         - See full explanation in create_full_tear_sheet.
+    transactions : pd.DataFrame, optional
+        Prices and amounts of executed trades. One row per trade.
+        - See full explanation in tears.create_full_tear_sheet
+    turnover_denom : str, optional
+        Either AGB or portfolio_value, default AGB.
+        - See full explanation in txn.get_turnover.
+    live_start_date : datetime, optional
+        The point in time when the strategy began live trading, after
+        its backtest period.
+    bootstrap : boolean, optional
+        Whether to perform bootstrap analysis for the performance
+        metrics.
+         - For more information, see timeseries.perf_stats_bootstrap
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
+
+    Returns
+    -------
+    perf_stats : pd.DataFrame
+        Performance metrics, one column per period.
+    date_rows : OrderedDict
+        Start and end dates and lengths of the periods.
+    """
+
+    if bootstrap:
+        perf_func = timeseries.perf_stats_bootstrap
+    else:
+        perf_func = timeseries.perf_stats
+
+    precomputed = {}
+    if (analysis_context is not None and not bootstrap and
+            positions is not None):
+        precomputed['exposure_summary'] = analysis_context.exposure_summary
+        if transactions is not None:
+            precomputed['turnover'] = analysis_context.turnover(
+                turnover_denom)
+
+    perf_stats_all = perf_func(
+        returns,
+        factor_returns=factor_returns,
+        positions=positions,
+        transactions=transactions,
+        turnover_denom=turnover_denom,
+        **precomputed)
+
+    date_rows = perf_stats_date_rows(returns, live_start_date)
+
+    if live_start_date is not None:
+        live_start_date = ep.utils.get_utc_timestamp(live_start_date)
+        returns_is = returns[returns.index < live_start_date]
+        returns_oos = returns[returns.index >= live_start_date]
+
+        positions_is = None
+        positions_oos = None
+        transactions_is = None
+        transactions_oos = None
+
+        if positions is not None:
+            positions_is = positions[positions.index < live_start_date]
+            positions_oos = positions[positions.index >= live_start_date]
+            if transactions is not None:
+                transactions_is = transactions[(transactions.index <
+                                                live_start_date)]
+                transactions_oos = transactions[(transactions.index >
+                                                 live_start_date)]
+
+        perf_stats_is = perf_func(
+            returns_is,
+            factor_returns=factor_returns,
+            positions=positions_is,
+            transactions=transactions_is,
+            turnover_denom=turnover_denom)
+
+        perf_stats_oos = perf_func(
+            returns_oos,
+            factor_returns=factor_returns,
+            positions=positions_oos,
+            transactions=transactions_oos,
+            turnover_denom=turnover_denom)
+
+        perf_stats = pd.concat(OrderedDict([
+            ('In-sample', perf_stats_is),
+            ('Out-of-sample', perf_stats_oos),
+            ('All', perf_stats_all),
+        ]), axis=1)
+    else:
+        perf_stats = pd.DataFrame(perf_stats_all, columns=['Backtest'])
+
+    return perf_stats, date_rows
+
+
+def perf_stats_date_rows(returns, live_start_date=None):
+    """
+    Start and end dates and lengths of the periods of perf_stats_table,
+    shown above the table by plotting.show_perf_stats.
+
+    Returns
+    -------
+    OrderedDict
+        Formatted start and end dates, followed by the number of months
+        in and out of sample if live_start_date is given, or in total
+        otherwise. Empty if returns are.
+    """
+
+    date_rows = OrderedDict()
+    if len(returns.index) == 0:
+        return date_rows
+
+    date_rows['Start date'] = returns.index[0].strftime('%Y-%m-%d')
+    date_rows['End date'] = returns.index[-1].strftime('%Y-%m-%d')
+
+    if live_start_date is not None:
+        live_start_date = ep.utils.get_utc_timestamp(live_start_date)
+        is_oos = returns.index >= live_start_date
+        date_rows['In-sample months'] = int((~is_oos).sum() /
+                                            APPROX_BDAYS_PER_MONTH)
+        date_rows['Out-of-sample months'] = int(is_oos.sum() /
+                                                APPROX_BDAYS_PER_MONTH)
+    else:
+        date_rows['Total months'] = int(len(returns) /
+                                        APPROX_BDAYS_PER_MONTH)
+
+    return date_rows
+
+
+@timed
+def slippage_sweep(returns, positions, transactions,
+                   slippage_params=SLIPPAGE_SWEEP_PARAMS,
+                   analysis_context=None):
+    """
+    Cumulative returns at different per-dollar slippage assumptions.
+     - See plotting.plot_slippage_sweep.
+
+    Returns
+    -------
+    pd.DataFrame
+        Cumulative returns, starting from 1, one column per slippage
+        parameter.
+    """
+
+    if analysis_context is not None:
+        txn_vol = analysis_context.txn_vol
+    else:
+        txn_vol = txn.get_txn_vol(transactions)
+
+    sweep = pd.DataFrame()
+    for bps in slippage_params:
+        adj_returns = txn.adjust_returns_for_slippage(returns, positions,
+                                                      transactions, bps,
+                                                      txn_vol=txn_vol)
+        label = str(bps) + " bps"
+        sweep[label] = ep.cum_returns(adj_returns, 1)
+
+    return sweep
+
+
+def slippage_sensitivity(returns, positions, transactions,
+                         analysis_context=None):
+    """
+    Average annual returns given 1 to 99 bps of per-dollar slippage.
+     - See plotting.plot_slippage_sensitivity.
+
+    Returns
+    -------
+    pd.Series
+        Annual returns, indexed by slippage in basis points.
+    """
+
+    if analysis_context is not None:
+        txn_vol = analysis_context.txn_vol
+    else:
+        txn_vol = txn.get_txn_vol(transactions)
+
+    avg_returns_given_slippage = pd.Series()
+    for bps in range(1, 100):
+        adj_returns = txn.adjust_returns_for_slippage(returns, positions,
+                                                      transactions, bps,
+                                                      txn_vol=txn_vol)
+        avg_returns_given_slippage.loc[bps] = ep.annual_return(adj_returns)
+
+    return avg_returns_given_slippage
+
+
+@timed
+def capacity_sweep(returns, transactions, market_data, bt_starting_capital,
+                   min_pv=100000, max_pv=300000000, step_size=1000000,
+                   intraday_bars=False):
+    """
+    Sharpe ratios of the strategy when run at increasing capital bases,
+    stopping once the Sharpe ratio drops below -1.
+     - See plotting.plot_capacity_sweep.
+
+    Returns
+    -------
+    pd.Series
+        Sharpe ratios, indexed by capital base in millions.
+    """
+
+    if intraday_bars:
+        txn_daily_w_bar = capacity.intraday_txns_with_bar_data(transactions,
+                                                               market_data)
+    else:
+        txn_daily_w_bar = capacity.daily_txns_with_bar_data(transactions,
+                                                            market_data)
+
+    captial_base_sweep = pd.Series()
+    for start_pv in range(min_pv, max_pv, step_size):
+        adj_ret = capacity.apply_slippage_penalty(returns,
+                                                  txn_daily_w_bar,
+                                                  start_pv,
+                                                  bt_starting_capital)
+        sharpe = ep.sharpe_ratio(adj_ret)
+        if sharpe < -1:
+            break
+        captial_base_sweep.loc[start_pv] = sharpe
+    captial_base_sweep.index = captial_base_sweep.index / MM_DISPLAY_UNIT
+
+    return captial_base_sweep
+
+
+def profit_attribution(trades):
+    """
+    Share of the total PnL of round trips contributed by each symbol.
+     - See plotting.show_profit_attribution.
+
+    Returns
+    -------
+    pd.Series
+        Fractions of the total PnL, indexed by symbol, in descending
+        order.
+    """
+
+    total_pnl = trades['pnl'].sum()
+    pnl_attribution = trades.groupby('symbol')['pnl'].sum() / total_pnl
+    return pnl_attribution.sort_values(ascending=False)
+
+
+@timed
+def compute_full_tear_sheet(returns,
+                            positions=None,
+                            transactions=None,
+                            market_data=None,
+                            benchmark_rets=None,
+                            slippage=None,
+                            live_start_date=None,
+                            sector_mappings=None,
+                            round_trips=False,
+                            estimate_intraday='infer',
+                            bootstrap=False,
+                            unadjusted_returns=None,
+                            turnover_denom='AGB',
+                            factor_returns=None,
+                            factor_loadings=None,
+                            pos_in_dollars=True,
+                            analysis_context=None):
+    """
+    Computes the tables and series of tears.create_full_tear_sheet.
+
+    See tears.create_full_tear_sheet for a description of the arguments.
+
+    Returns
+    -------
+    TearSheetResult
+        Results of the sub tear sheets that apply to the inputs, under
+        the keys returns, interesting_times, positions, transactions,
+        round_trips, capacity and perf_attrib.
+    """
+
+    if (unadjusted_returns is None) and (slippage is not None) and\
+       (transactions is not None):
+        unadjusted_returns = returns.copy()
+        returns = txn.adjust_returns_for_slippage(returns, positions,
+                                                  transactions, slippage)
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+    positions = analysis_context.positions
+
+    if sector_mappings is not None:
+        sector_mappings = pos.SectorMapping(sector_mappings)
+
+    result = TearSheetResult()
+    result['returns'] = compute_returns_tear_sheet(
+        returns,
+        positions=positions,
+        transactions=transactions,
+        live_start_date=live_start_date,
+        benchmark_rets=benchmark_rets,
+        bootstrap=bootstrap,
+        turnover_denom=turnover_denom,
+        analysis_context=analysis_context)
+
+    interesting_times = compute_interesting_times_tear_sheet(
+        returns, benchmark_rets=benchmark_rets)
+    if interesting_times is not None:
+        result['interesting_times'] = interesting_times
+
+    if positions is not None:
+        result['positions'] = compute_position_tear_sheet(
+            returns, positions,
+            sector_mappings=sector_mappings,
+            estimate_intraday=False,
+            analysis_context=analysis_context)
+
+        if transactions is not None:
+            result['transactions'] = compute_txn_tear_sheet(
+                returns, positions, transactions,
+                turnover_denom=turnover_denom,
+                unadjusted_returns=unadjusted_returns,
+                estimate_intraday=False,
+                analysis_context=analysis_context)
+            if round_trips:
+                round_trip_result = compute_round_trip_tear_sheet(
+                    returns, positions, transactions,
+                    sector_mappings=sector_mappings,
+                    estimate_intraday=False,
+                    analysis_context=analysis_context)
+                if round_trip_result is not None:
+                    result['round_trips'] = round_trip_result
+
+            if market_data is not None:
+                result['capacity'] = compute_capacity_tear_sheet(
+                    returns, positions, transactions, market_data,
+                    liquidation_daily_vol_limit=0.2,
+                    last_n_days=125,
+                    estimate_intraday=False,
+                    analysis_context=analysis_context)
+
+        if factor_returns is not None and factor_loadings is not None:
+            result['perf_attrib'] = compute_perf_attrib_tear_sheet(
+                returns, positions, factor_returns, factor_loadings,
+                transactions, pos_in_dollars=pos_in_dollars,
+                analysis_context=analysis_context)
+
+    return result
+
+
+@timed
+def compute_simple_tear_sheet(returns,
+                              positions=None,
+                              transactions=None,
+                              benchmark_rets=None,
+                              slippage=None,
+                              estimate_intraday='infer',
+                              live_start_date=None,
+                              turnover_denom='AGB',
+                              analysis_context=None):
+    """
+    Computes the tables and series of tears.create_simple_tear_sheet.
+
+    See tears.create_simple_tear_sheet for a description of the arguments.
+
+    Returns
+    -------
+    TearSheetResult
+        perf_stats, cum_returns, rolling_beta (with benchmark_rets),
+        rolling_sharpe and underwater, followed by the exposures, top
+        positions and holdings of compute_position_tear_sheet (with
+        positions) and turnover (with transactions).
+    """
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+    positions = analysis_context.positions
+
+    if (slippage is not None) and (transactions is not None):
+        returns = txn.adjust_returns_for_slippage(
+            returns, positions, transactions, slippage,
+            txn_vol=analysis_context.txn_vol)
+        analysis_context = analysis_context.with_returns(returns)
+
+    result = TearSheetResult()
+    result['perf_stats'] = perf_stats_table(
+        returns, benchmark_rets,
+        positions=positions,
+        transactions=transactions,
+        turnover_denom=turnover_denom,
+        live_start_date=live_start_date,
+        analysis_context=analysis_context)[0]
+    result['cum_returns'] = analysis_context.cum_returns
+    if benchmark_rets is not None:
+        result['rolling_beta'] = _rolling_beta(returns, benchmark_rets)
+    result['rolling_sharpe'] = timeseries.rolling_sharpe(
+        returns, APPROX_BDAYS_PER_MONTH * 6)
+    result['underwater'] = _underwater(analysis_context.cum_returns)
+
+    if positions is not None:
+        _add_position_results(result, analysis_context)
+        if transactions is not None:
+            result['turnover'] = analysis_context.turnover(turnover_denom)
+
+    return result
+
+
+@timed
+def compute_returns_tear_sheet(returns, positions=None,
+                               transactions=None,
+                               live_start_date=None,
+                               benchmark_rets=None,
+                               bootstrap=False,
+                               turnover_denom='AGB',
+                               analysis_context=None):
+    """
+    Computes the tables and series of tears.create_returns_tear_sheet.
+
+    See tears.create_returns_tear_sheet for a description of the
+    arguments.
+
+    Returns
+    -------
+    TearSheetResult
+        perf_stats, drawdowns (the worst 5 drawdown periods),
+        cum_returns, rolling_beta (with benchmark_rets),
+        rolling_volatility, rolling_sharpe, underwater, monthly_returns
+        (years by months) and annual_returns.
+    """
+
+    if bootstrap and benchmark_rets is None:
+        raise ValueError('bootstrap requires passing of benchmark_rets.')
+
+    if benchmark_rets is not None:
+        returns = utils.clip_returns_to_benchmark(returns, benchmark_rets)
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=False)
+
+    rolling_window = APPROX_BDAYS_PER_MONTH * 6
+
+    result = TearSheetResult()
+    result['perf_stats'] = perf_stats_table(
+        returns, benchmark_rets,
+        positions=positions,
+        transactions=transactions,
+        turnover_denom=turnover_denom,
+        live_start_date=live_start_date,
+        bootstrap=bootstrap,
+        analysis_context=analysis_context)[0]
+    result['drawdowns'] = analysis_context.drawdown_table(top=5)
+    result['cum_returns'] = analysis_context.cum_returns
+    if benchmark_rets is not None:
+        result['rolling_beta'] = _rolling_beta(returns, benchmark_rets)
+    result['rolling_volatility'] = timeseries.rolling_volatility(
+        returns, rolling_window)
+    result['rolling_sharpe'] = timeseries.rolling_sharpe(
+        returns, rolling_window)
+    result['underwater'] = _underwater(analysis_context.cum_returns)
+    result['monthly_returns'] = ep.aggregate_returns(
+        returns, 'monthly').unstack()
+    result['annual_returns'] = ep.aggregate_returns(returns, 'yearly')
+
+    return result
+
+
+@timed
+def compute_position_tear_sheet(returns, positions, sector_mappings=None,
+                                transactions=None, estimate_intraday='infer',
+                                analysis_context=None):
+    """
+    Computes the tables and series of tears.create_position_tear_sheet.
+
+    See tears.create_position_tear_sheet for a description of the
+    arguments.
+
+    Returns
+    -------
+    TearSheetResult
+        exposures (long, short and net, as fractions of portfolio
+        value), top_long_positions, top_short_positions, top_positions
+        (largest absolute allocations), holdings, long_short_holdings,
+        position_concentration, gross_leverage and, with
+        sector_mappings, sector_allocations.
+    """
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+    positions = analysis_context.positions
+
+    result = TearSheetResult()
+    _add_position_results(result, analysis_context)
+    result['position_concentration'] = \
+        pos.get_max_median_position_concentration(positions)
+    result['gross_leverage'] = \
+        analysis_context.exposure_summary['gross_leverage']
+
+    if sector_mappings is not None:
+        sector_exposures = pos.get_sector_exposures(positions,
+                                                    sector_mappings)
+        if len(sector_exposures.columns) > 1:
+            sector_alloc = pos.get_percent_alloc(sector_exposures)
+            result['sector_allocations'] = sector_alloc.drop(
+                'cash', axis='columns')
+
+    return result
+
+
+@timed
+def compute_txn_tear_sheet(returns, positions, transactions,
+                           turnover_denom='AGB', unadjusted_returns=None,
+                           estimate_intraday='infer', analysis_context=None):
+    """
+    Computes the tables and series of tears.create_txn_tear_sheet.
+
+    See tears.create_txn_tear_sheet for a description of the arguments.
+
+    Returns
+    -------
+    TearSheetResult
+        turnover, txn_volume (daily dollar volume and shares traded)
+        and, with unadjusted_returns, slippage_sweep and
+        slippage_sensitivity.
+    """
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+    positions = analysis_context.positions
+
+    result = TearSheetResult()
+    result['turnover'] = analysis_context.turnover(turnover_denom)
+    result['txn_volume'] = analysis_context.txn_vol
+
+    if unadjusted_returns is not None:
+        result['slippage_sweep'] = slippage_sweep(
+            unadjusted_returns, positions, transactions,
+            analysis_context=analysis_context)
+        result['slippage_sensitivity'] = slippage_sensitivity(
+            unadjusted_returns, positions, transactions,
+            analysis_context=analysis_context)
+
+    return result
+
+
+@timed
+def compute_round_trip_tear_sheet(returns, positions, transactions,
+                                  sector_mappings=None,
+                                  estimate_intraday='infer',
+                                  analysis_context=None):
+    """
+    Computes the tables and series of tears.create_round_trip_tear_sheet.
+
+    See tears.create_round_trip_tear_sheet for a description of the
+    arguments.
+
+    Returns
+    -------
+    TearSheetResult or None
+        round_trips (one row per trade), the statistics of
+        round_trips.gen_round_trip_stats (summary, pnl, duration,
+        returns and symbols), profit_attribution and, with
+        sector_mappings, sector_profit_attribution. None if fewer than
+        5 round trips were made.
+    """
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+
+    trades = analysis_context.round_trips
+
+    if len(trades) < 5:
+        warnings.warn(
+            """Fewer than 5 round-trip trades made.
+               Skipping round trip tearsheet.""", UserWarning)
+        return
+
+    stats = round_trips.gen_round_trip_stats(trades)
+
+    result = TearSheetResult()
+    result['round_trips'] = trades
+    for name in ('summary', 'pnl', 'duration', 'returns', 'symbols'):
+        result[name] = stats[name]
+    result['profit_attribution'] = profit_attribution(trades)
+
+    if sector_mappings is not None:
+        sector_trades = round_trips.apply_sector_mappings_to_round_trips(
+            trades, sector_mappings)
+        result['sector_profit_attribution'] = \
+            profit_attribution(sector_trades)
+
+    return result
+
+
+@timed
+def compute_interesting_times_tear_sheet(returns, benchmark_rets=None,
+                                         periods=None):
+    """
+    Computes the tables and series of
+    tears.create_interesting_times_tear_sheet.
+
+    See tears.create_interesting_times_tear_sheet for a description of
+    the arguments.
+
+    Returns
+    -------
+    TearSheetResult or None
+        stress_events (mean, min and max daily returns per period),
+        cum_returns (per period) and, with benchmark_rets,
+        benchmark_cum_returns. None if returns do not overlap with any
+        of the periods.
+    """
+
+    rets_interesting = timeseries.extract_interesting_date_ranges(
+        returns, periods)
+
+    if not rets_interesting:
+        warnings.warn('Passed returns do not overlap with any'
+                      'interesting times.', UserWarning)
+        return
+
+    result = TearSheetResult()
+    result['stress_events'] = (pd.DataFrame(rets_interesting)
+                               .describe().transpose()
+                               .loc[:, ['mean', 'min', 'max']])
+    result['cum_returns'] = OrderedDict(
+        (name, ep.cum_returns(rets_period))
+        for name, rets_period in rets_interesting.items())
+
+    if benchmark_rets is not None:
+        bmark_interesting = timeseries.extract_interesting_date_ranges(
+            benchmark_rets, periods)
+        result['benchmark_cum_returns'] = OrderedDict(
+            (name, ep.cum_returns(bmark_interesting[name]))
+            for name in rets_interesting)
+
+    return result
+
+
+@timed
+def compute_capacity_tear_sheet(returns, positions, transactions,
+                                market_data,
+                                liquidation_daily_vol_limit=0.2,
+                                trade_daily_vol_limit=0.05,
+                                last_n_days=APPROX_BDAYS_PER_MONTH * 6,
+                                days_to_liquidate_limit=1,
+                                estimate_intraday='infer',
+                                intraday_bars=False,
+                                analysis_context=None):
+    """
+    Computes the tables and series of tears.create_capacity_tear_sheet.
+
+    See tears.create_capacity_tear_sheet for a description of the
+    arguments.
+
+    Returns
+    -------
+    TearSheetResult
+        max_days_to_liquidate and max_days_to_liquidate_last_n_days
+        (tickers over days_to_liquidate_limit), low_liquidity_txns and
+        low_liquidity_txns_last_n_days (tickers over
+        trade_daily_vol_limit) and capacity_sweep.
+    """
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+    positions = analysis_context.positions
+
+    if intraday_bars:
+        daily_market_data = capacity.aggregate_intraday_bars(market_data)
+    else:
+        daily_market_data = market_data
+
+    max_days_by_window = capacity.get_max_days_to_liquidate_by_ticker_windows(
+        positions, daily_market_data,
+        max_bar_consumption=liquidation_daily_vol_limit,
+        capital_base=1e6,
+        mean_volume_window=5,
+        windows=[None, last_n_days])
+    llt_by_window = capacity.get_low_liquidity_transactions_windows(
+        transactions, daily_market_data, windows=[None, last_n_days])
+
+    result = TearSheetResult()
+    max_days_by_ticker = max_days_by_window[None]
+    result['max_days_to_liquidate'] = max_days_by_ticker[
+        max_days_by_ticker.days_to_liquidate > days_to_liquidate_limit]
+    max_days_by_ticker_lnd = max_days_by_window[last_n_days]
+    result['max_days_to_liquidate_last_n_days'] = max_days_by_ticker_lnd[
+        max_days_by_ticker_lnd.days_to_liquidate > 1]
+
+    for key, window in (('low_liquidity_txns', None),
+                        ('low_liquidity_txns_last_n_days', last_n_days)):
+        llt = llt_by_window[window]
+        result[key] = llt[
+            llt['max_pct_bar_consumed'] > trade_daily_vol_limit * 100]
+
+    bt_starting_capital = positions.iloc[0].sum() / (1 + returns.iloc[0])
+    result['capacity_sweep'] = capacity_sweep(
+        returns, transactions, market_data, bt_starting_capital,
+        intraday_bars=intraday_bars)
+
+    return result
+
+
+@timed
+def compute_perf_attrib_tear_sheet(returns,
+                                   positions,
+                                   factor_returns,
+                                   factor_loadings,
+                                   transactions=None,
+                                   pos_in_dollars=True,
+                                   analysis_context=None):
+    """
+    Computes the tables and series of tears.create_perf_attrib_tear_sheet.
+
+    See tears.create_perf_attrib_tear_sheet for a description of the
+    arguments.
+
+    Returns
+    -------
+    TearSheetResult
+        summary and exposures_summary (see
+        perf_attrib.create_perf_attrib_stats), risk_exposures (daily
+        portfolio factor exposures) and perf_attrib (daily returns
+        attributed to factors).
+    """
+
+    txn_vol = None
+    if analysis_context is not None:
+        positions = analysis_context.positions
+        if transactions is not None:
+            txn_vol = analysis_context.txn_vol
+
+    perf_attrib_result = perf_attrib.perf_attrib(
+        returns, positions, factor_returns, factor_loadings, transactions,
+        pos_in_dollars=pos_in_dollars, txn_vol=txn_vol
+    )
+    portfolio_exposures, perf_attrib_data = perf_attrib_result
+    summary, exposures_summary = perf_attrib.create_perf_attrib_stats(
+        perf_attrib_result)
+
+    result = TearSheetResult()
+    result['summary'] = summary
+    result['exposures_summary'] = exposures_summary
+    result['risk_exposures'] = portfolio_exposures
+    result['perf_attrib'] = perf_attrib_data
+
+    return result
+
+
+def _add_position_results(result, analysis_context):
+    exposure_summary = analysis_context.exposure_summary
+    portfolio_value = exposure_summary['portfolio_value']
+    top_long, top_short, top_abs = pos.get_top_long_short_abs(
+        analysis_context.positions_alloc)
+
+    result['exposures'] = pd.DataFrame(OrderedDict([
+        ('long', exposure_summary['long'] / portfolio_value),
+        ('short', exposure_summary['short'] / portfolio_value),
+        ('net', exposure_summary['net'] / portfolio_value),
+    ]))
+    result['top_long_positions'] = top_long
+    result['top_short_positions'] = top_short
+    result['top_positions'] = top_abs
+    result['holdings'] = (exposure_summary['long_count'] +
+                          exposure_summary['short_count'])
+    result['long_short_holdings'] = exposure_summary[['long_count',
+                                                      'short_count']]
+
+
+def _rolling_beta(returns, factor_returns):
+    return pd.DataFrame(OrderedDict([
+        ('6-mo', timeseries.rolling_beta(
+            returns, factor_returns,
+            rolling_window=APPROX_BDAYS_PER_MONTH * 6)),
+        ('12-mo', timeseries.rolling_beta(
+            returns, factor_returns,
+            rolling_window=APPROX_BDAYS_PER_MONTH * 12)),
+    ]))
+
+
+def _underwater(cum_returns):
+    running_max = np.maximum.accumulate(cum_returns)
+    return (cum_returns - running_max) / running_max
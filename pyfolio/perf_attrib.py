@@ -15,29 +15,83 @@
 from __future__ import division
 import warnings
 
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 import empyrical as ep
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
+from .cache import cached
 from .pos import get_percent_alloc
+from .precision import get_panel_dtype, sum_columns
+from .profiling import timed
+from .sparse import SparsePositions
 from .txn import get_turnover
-from .utils import print_table, configure_legend
+from .utils import (
+    APPROX_BDAYS_PER_MONTH,
+    APPROX_BDAYS_PER_YEAR,
+    configure_legend,
+    print_table,
+)
 
 PERF_ATTRIB_TURNOVER_THRESHOLD = 0.25
 
+# Number of factor loadings expanded at a time when computing exposures.
+PERF_ATTRIB_BLOCK_SIZE = 2 ** 22
 
+# Rolling windows, in days, of create_perf_attrib_horizon_stats.
+PERF_ATTRIB_HORIZON_WINDOWS = (APPROX_BDAYS_PER_MONTH,
+                               3 * APPROX_BDAYS_PER_MONTH,
+                               APPROX_BDAYS_PER_YEAR)
+
+
+class PerfAttribResult(namedtuple('PerfAttribResult',
+                                  ['risk_exposures', 'perf_attrib'])):
+    """
+    Result of perf_attrib.
+
+    Unpacks into (risk_exposures, perf_attrib) like a tuple, and carries
+    the inputs as aligned by perf_attrib, i.e. restricted to the dates and
+    tickers with factor loadings and to the date range of the returns.
+
+    Attributes
+    ----------
+    risk_exposures : pd.DataFrame
+        Daily factor exposures of the portfolio.
+    perf_attrib : pd.DataFrame
+        Daily returns attributed to each factor, and total, common,
+        specific, tilt and timing returns.
+    returns, positions, factor_returns : pd.Series or pd.DataFrame
+        Aligned inputs.
+    factor_loadings : pd.DataFrame
+        Aligned factor loadings. None for perf_attrib_chunked, which never
+        holds all of the loadings.
+    """
+
+    def __new__(cls, risk_exposures, perf_attrib, returns=None,
+                positions=None, factor_returns=None, factor_loadings=None):
+        self = super(PerfAttribResult, cls).__new__(cls, risk_exposures,
+                                                    perf_attrib)
+        self.returns = returns
+        self.positions = positions
+        self.factor_returns = factor_returns
+        self.factor_loadings = factor_loadings
+        return self
+
+
+@timed
+@cached
 def perf_attrib(returns,
                 positions,
                 factor_returns,
                 factor_loadings,
                 transactions=None,
-                pos_in_dollars=True):
+                pos_in_dollars=True,
+                txn_vol=None):
     """
     Attributes the performance of a returns stream to a set of risk factors.
 
-    Preprocesses inputs, and then calls empyrical.perf_attrib. See
-    empyrical.perf_attrib for more info.
+    Preprocesses inputs, and then attributes returns as in
+    empyrical.perf_attrib. See empyrical.perf_attrib for more info.
 
     Performance attribution determines how much each risk factor, e.g.,
     momentum, the technology sector, etc., contributed to total returns, as
@@ -110,9 +164,15 @@ def perf_attrib(returns,
         Flag indicating whether `positions` are in dollars or percentages
         If True, positions are in dollars.
 
+    txn_vol : pd.DataFrame, optional
+        Precomputed txn.get_txn_vol(transactions), used for the turnover
+        check.
+
     Returns
     -------
-    tuple of (risk_exposures_portfolio, perf_attribution)
+    PerfAttribResult
+        Tuple of (risk_exposures_portfolio, perf_attribution), which also
+        carries the aligned inputs.
 
     risk_exposures_portfolio : pd.DataFrame
         df indexed by datetime, with factors as columns
@@ -139,13 +199,138 @@ def perf_attrib(returns,
                                         factor_returns,
                                         factor_loadings,
                                         transactions=transactions,
-                                        pos_in_dollars=pos_in_dollars)
+                                        pos_in_dollars=pos_in_dollars,
+                                        txn_vol=txn_vol)
+
+    # Make risk data match time range of returns
+    start = returns.index[0]
+    end = returns.index[-1]
+    factor_returns = factor_returns.loc[start:end]
+    positions = positions.loc[start:end]
 
     # Note that we convert positions to percentages *after* the checks
     # above, since get_turnover() expects positions in dollars.
-    positions = _stack_positions(positions, pos_in_dollars=pos_in_dollars)
+    risk_exposures_portfolio = _compute_exposures_by_codes(
+        positions, factor_loadings, pos_in_dollars=pos_in_dollars)
+
+    return _attribute_returns(returns, risk_exposures_portfolio,
+                              factor_returns, positions=positions,
+                              factor_loadings=factor_loadings)
+
+
+@timed
+def perf_attrib_chunked(returns,
+                        positions,
+                        factor_returns,
+                        factor_loadings,
+                        transactions=None,
+                        pos_in_dollars=True,
+                        dates_per_chunk=1,
+                        txn_vol=None):
+    """
+    Attributes the performance of a returns stream to a set of risk
+    factors, like perf_attrib, reading the factor loadings one chunk of
+    dates at a time.
+
+    Only the daily exposures are kept from each chunk, so at most one
+    chunk of loadings is held in memory. This allows attribution with a
+    loadings history that does not fit in memory as a single frame.
+
+    Parameters
+    ----------
+    returns : pd.Series
+        Returns for each day in the date range.
+         - See full explanation in perf_attrib.
+    positions: pd.DataFrame
+        Daily holdings (in dollars or percentages), indexed by date.
+         - See full explanation in perf_attrib.
+    factor_returns : pd.DataFrame
+        Returns by factor, with date as index and factors as columns.
+         - See full explanation in perf_attrib.
+    factor_loadings : iterable of pd.DataFrame, or callable
+        Factor loadings in chunks of dates, each with date and ticker as
+        index, and factors as columns, as in perf_attrib. Either an
+        iterable of chunks, e.g. a generator reading one day at a time,
+        or a callable taking a pd.DatetimeIndex of dates and returning
+        the loadings of these dates, or None if there are none.
+    transactions : pd.DataFrame, optional
+        Executed trade volumes and fill prices. Used to check the turnover
+        of the algorithm.
+         - See full explanation in perf_attrib.
+    pos_in_dollars : bool
+        Flag indicating whether `positions` are in dollars or percentages
+        If True, positions are in dollars.
+    dates_per_chunk : int, optional
+        Number of dates passed to a callable factor_loadings at a time.
+    txn_vol : pd.DataFrame, optional
+        Precomputed txn.get_txn_vol(transactions), used for the turnover
+        check.
 
-    return ep.perf_attrib(returns, positions, factor_returns, factor_loadings)
+    Returns
+    -------
+    tuple of (risk_exposures_portfolio, perf_attribution)
+        See perf_attrib.
+    """
+
+    if callable(factor_loadings):
+        loader = factor_loadings
+        factor_loadings = (
+            loader(positions.index[i:i + dates_per_chunk])
+            for i in range(0, len(positions.index), dates_per_chunk)
+        )
+
+    holdings, dates, tickers = _holdings(positions)
+    factors = None
+    exposures = None
+    has_loadings = np.zeros(len(dates), dtype=bool)
+    covered = np.zeros(len(tickers), dtype=bool)
+
+    for chunk in factor_loadings:
+        if chunk is None or len(chunk) == 0:
+            continue
+        if factors is None:
+            factors = chunk.columns
+            exposures = np.zeros((len(dates), len(factors)))
+        elif not chunk.columns.equals(factors):
+            chunk = chunk[factors]
+
+        # Holdings are weighted in their own units here, since the
+        # tickers missing loadings (which pos.get_percent_alloc has to
+        # leave out) are only known once all chunks are read.
+        covered[_add_exposures(exposures, has_loadings, holdings, dates,
+                               tickers, chunk)] = True
+
+    if factors is None:
+        raise ValueError("Could not perform performance attribution. "
+                         "No factor loadings were given.")
+
+    (returns,
+     positions,
+     factor_returns) = _drop_missing_and_warn(
+        returns,
+        positions,
+        factor_returns,
+        positions.columns.difference(tickers[covered]),
+        dates[~has_loadings],
+        transactions=transactions,
+        pos_in_dollars=pos_in_dollars,
+        txn_vol=txn_vol)
+
+    risk_exposures_portfolio = _exposures_frame(
+        exposures[has_loadings], dates[has_loadings], factors)
+    if pos_in_dollars:
+        risk_exposures_portfolio = risk_exposures_portfolio.divide(
+            sum_columns(positions), axis='rows')
+
+    # Make risk data match time range of returns
+    start = returns.index[0]
+    end = returns.index[-1]
+    factor_returns = factor_returns.loc[start:end]
+    positions = positions.loc[start:end]
+    risk_exposures_portfolio = risk_exposures_portfolio.loc[start:end]
+
+    return _attribute_returns(returns, risk_exposures_portfolio,
+                              factor_returns, positions=positions)
 
 
 def compute_exposures(positions, factor_loadings, stack_positions=True,
@@ -153,8 +338,8 @@ def compute_exposures(positions, factor_loadings, stack_positions=True,
     """
     Compute daily risk factor exposures.
 
-    Normalizes positions (if necessary) and calls ep.compute_exposures.
-    See empyrical.compute_exposures for more info.
+    Normalizes positions (if necessary) and computes exposures as in
+    ep.compute_exposures. See empyrical.compute_exposures for more info.
 
     Parameters
     ----------
@@ -211,16 +396,34 @@ def compute_exposures(positions, factor_loadings, stack_positions=True,
             2017-01-02  0.821872  1.520515
     """
     if stack_positions:
-        positions = _stack_positions(positions, pos_in_dollars=pos_in_dollars)
+        return _compute_exposures_by_codes(positions, factor_loadings,
+                                           pos_in_dollars=pos_in_dollars)
 
     return ep.compute_exposures(positions, factor_loadings)
 
 
-def create_perf_attrib_stats(perf_attrib, risk_exposures):
+@timed
+def create_perf_attrib_stats(perf_attrib, risk_exposures=None):
     """
     Takes perf attribution data over a period of time and computes annualized
     multifactor alpha, multifactor sharpe, risk exposures.
+
+    Parameters
+    ----------
+    perf_attrib : pd.DataFrame or PerfAttribResult
+        Performance attribution, as returned by perf_attrib. May also be
+        the whole (risk_exposures, perf_attrib) result of perf_attrib, in
+        which case risk_exposures is taken from it.
+    risk_exposures : pd.DataFrame, optional
+        Daily factor exposures of the portfolio.
+
+    Returns
+    -------
+    tuple of (summary, risk_exposure_summary)
     """
+    if isinstance(perf_attrib, tuple):
+        risk_exposures, perf_attrib = perf_attrib
+
     summary = OrderedDict()
     total_returns = perf_attrib['total_returns']
     specific_returns = perf_attrib['specific_returns']
@@ -265,27 +468,127 @@ def create_perf_attrib_stats(perf_attrib, risk_exposures):
     return summary, risk_exposure_summary
 
 
+@timed
+def create_perf_attrib_horizon_stats(perf_attrib,
+                                     windows=PERF_ATTRIB_HORIZON_WINDOWS,
+                                     monthly=True):
+    """
+    Computes cumulative and annualized returns of each factor, and of
+    total, common and specific returns, over rolling windows and calendar
+    months, from one daily attribution.
+
+    The returns of every window are read off running products of
+    (1 + daily returns), so each window costs a division rather than a
+    new pass over its days. As in empyrical, missing returns count as
+    zero, and annualization assumes 252 days a year.
+
+    Parameters
+    ----------
+    perf_attrib : pd.DataFrame or PerfAttribResult
+        Performance attribution, as returned by perf_attrib. May also be
+        the whole (risk_exposures, perf_attrib) result of perf_attrib.
+    windows : iterable of int, optional
+        Lengths in days of the rolling windows.
+    monthly : bool, optional
+        Whether to also summarize each calendar month.
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by (horizon, dt), where horizon is e.g. '21D' for a
+        rolling window or 'M' for calendar months, and dt is the last day
+        of the window. Columns are ('Cumulative Return', column) and
+        ('Annualized Return', column) for each column of perf_attrib.
+        - Example:
+                                 Cumulative Return        Annualized Return
+                                          momentum  ...            momentum
+            horizon dt
+            21D     2017-01-31           0.012003  ...            0.154290
+                    2017-02-01           0.010251  ...            0.130050
+            M       2017-01-31           0.012003  ...            0.154290
+    """
+    if isinstance(perf_attrib, tuple):
+        perf_attrib = perf_attrib[1]
+
+    dates = perf_attrib.index
+    values = perf_attrib.fillna(0).values.astype(np.float64)
+
+    # growth[i] is the growth of one dollar over the first i days, so the
+    # growth over days [start, stop) is growth[stop] / growth[start].
+    growth = np.ones((len(values) + 1, values.shape[1]))
+    np.cumprod(1 + values, axis=0, out=growth[1:])
+
+    labels, starts, stops = [], [], []
+    for window in windows:
+        stop = np.arange(window, len(values) + 1)
+        labels.append(np.repeat('{}D'.format(window), len(stop)))
+        starts.append(stop - window)
+        stops.append(stop)
+
+    if monthly and len(values):
+        month = dates.year * 12 + dates.month
+        stop = np.append(np.flatnonzero(np.diff(month)) + 1, len(values))
+        labels.append(np.repeat('M', len(stop)))
+        starts.append(np.append(0, stop[:-1]))
+        stops.append(stop)
+
+    if labels:
+        labels = np.concatenate(labels)
+        starts = np.concatenate(starts)
+        stops = np.concatenate(stops)
+    else:
+        labels = np.array([], dtype=object)
+        starts = stops = np.array([], dtype=np.intp)
+
+    cumulative = growth[stops] / growth[starts] - 1
+    num_years = (stops - starts)[:, np.newaxis] / APPROX_BDAYS_PER_YEAR
+    with np.errstate(invalid='ignore', divide='ignore'):
+        annualized = (1 + cumulative) ** (1 / num_years) - 1
+
+    index = pd.MultiIndex.from_arrays([labels, dates[stops - 1]],
+                                      names=['horizon', 'dt'])
+    columns = pd.MultiIndex.from_product(
+        [['Cumulative Return', 'Annualized Return'], perf_attrib.columns]
+    )
+
+    return pd.DataFrame(np.hstack([cumulative, annualized]),
+                        index=index, columns=columns)
+
+
+@timed
 def show_perf_attrib_stats(returns,
                            positions,
                            factor_returns,
                            factor_loadings,
                            transactions=None,
-                           pos_in_dollars=True):
+                           pos_in_dollars=True,
+                           txn_vol=None,
+                           perf_attrib_result=None,
+                           perf_attrib_stats=None):
     """
     Calls `perf_attrib` using inputs, and displays outputs using
     `utils.print_table`.
+
+    If perf_attrib_result, the (risk_exposures, perf_attrib) result of an
+    earlier call to `perf_attrib`, is given, it is displayed instead and
+    the other inputs are ignored. The same goes for perf_attrib_stats,
+    the (perf_attrib_stats, risk_exposure_stats) result of an earlier
+    call to `create_perf_attrib_stats`.
     """
-    risk_exposures, perf_attrib_data = perf_attrib(
-        returns,
-        positions,
-        factor_returns,
-        factor_loadings,
-        transactions,
-        pos_in_dollars=pos_in_dollars,
-    )
+    if perf_attrib_stats is None:
+        if perf_attrib_result is None:
+            perf_attrib_result = perf_attrib(
+                returns,
+                positions,
+                factor_returns,
+                factor_loadings,
+                transactions,
+                pos_in_dollars=pos_in_dollars,
+                txn_vol=txn_vol,
+            )
+        perf_attrib_stats = create_perf_attrib_stats(perf_attrib_result)
 
-    perf_attrib_stats, risk_exposure_stats =\
-        create_perf_attrib_stats(perf_attrib_data, risk_exposures)
+    perf_attrib_stats, risk_exposure_stats = perf_attrib_stats
 
     percentage_formatter = '{:.2%}'.format
     float_formatter = '{:.2f}'.format
@@ -323,6 +626,7 @@ def show_perf_attrib_stats(returns,
     )
 
 
+@timed
 def plot_returns(perf_attrib_data, cost=None, ax=None):
     """
     Plot total, specific, and common returns.
@@ -352,6 +656,7 @@ def plot_returns(perf_attrib_data, cost=None, ax=None):
     """
 
     if ax is None:
+        import matplotlib.pyplot as plt
         ax = plt.gca()
 
     returns = perf_attrib_data['total_returns']
@@ -386,6 +691,7 @@ def plot_returns(perf_attrib_data, cost=None, ax=None):
     return ax
 
 
+@timed
 def plot_alpha_returns(alpha_returns, ax=None):
     """
     Plot histogram of daily multi-factor alpha returns (specific returns).
@@ -403,6 +709,7 @@ def plot_alpha_returns(alpha_returns, ax=None):
     ax :  matplotlib.axes.Axes
     """
     if ax is None:
+        import matplotlib.pyplot as plt
         ax = plt.gca()
 
     ax.hist(alpha_returns, color='g', label='Multi-factor alpha')
@@ -416,6 +723,7 @@ def plot_alpha_returns(alpha_returns, ax=None):
     return ax
 
 
+@timed
 def plot_factor_contribution_to_perf(
         perf_attrib_data,
         ax=None,
@@ -446,6 +754,7 @@ def plot_factor_contribution_to_perf(
     ax :  matplotlib.axes.Axes
     """
     if ax is None:
+        import matplotlib.pyplot as plt
         ax = plt.gca()
 
     factors_to_plot = perf_attrib_data.drop(
@@ -469,6 +778,7 @@ def plot_factor_contribution_to_perf(
     return ax
 
 
+@timed
 def plot_risk_exposures(exposures, ax=None,
                         title='Daily risk factor exposures'):
     """
@@ -490,6 +800,7 @@ def plot_risk_exposures(exposures, ax=None,
     ax :  matplotlib.axes.Axes
     """
     if ax is None:
+        import matplotlib.pyplot as plt
         ax = plt.gca()
 
     for col in exposures:
@@ -507,15 +818,68 @@ def _align_and_warn(returns,
                     factor_returns,
                     factor_loadings,
                     transactions=None,
-                    pos_in_dollars=True):
+                    pos_in_dollars=True,
+                    txn_vol=None):
     """
     Make sure that all inputs have matching dates and tickers,
     and raise warnings if necessary.
     """
     missing_stocks = positions.columns.difference(
-        factor_loadings.index.get_level_values(1).unique()
+        _used_level_values(factor_loadings.index, 1)
     )
+    missing_factor_loadings_index = positions.index.difference(
+        _used_level_values(factor_loadings.index, 0)
+    )
+
+    (returns,
+     positions,
+     factor_returns) = _drop_missing_and_warn(returns,
+                                              positions,
+                                              factor_returns,
+                                              missing_stocks,
+                                              missing_factor_loadings_index,
+                                              transactions=transactions,
+                                              pos_in_dollars=pos_in_dollars,
+                                              txn_vol=txn_vol)
 
+    return (returns, positions, factor_returns, factor_loadings)
+
+
+def _used_level_values(index, level):
+    """
+    Distinct values of a level of a MultiIndex, read from its levels and
+    codes rather than by materializing the values of every row.
+    """
+
+    codes = _level_codes(index, level)
+    used = np.bincount(codes[codes >= 0],
+                       minlength=len(index.levels[level])) > 0
+    return index.levels[level][used]
+
+
+def _level_codes(index, level):
+    """
+    Codes of a level of a MultiIndex, which pandas before 0.24 calls
+    labels.
+    """
+
+    if hasattr(index, 'codes'):
+        return index.codes[level]
+    return index.labels[level]
+
+
+def _drop_missing_and_warn(returns,
+                           positions,
+                           factor_returns,
+                           missing_stocks,
+                           missing_factor_loadings_index,
+                           transactions=None,
+                           pos_in_dollars=True,
+                           txn_vol=None):
+    """
+    Drop the stocks and dates without factor loadings from the inputs,
+    and raise warnings if necessary.
+    """
     # cash will not be in factor_loadings
     num_stocks = len(positions.columns) - 1
     missing_stocks = missing_stocks.drop('cash')
@@ -566,10 +930,6 @@ def _align_and_warn(returns,
         positions = positions.drop(missing_stocks, axis='columns',
                                    errors='ignore')
 
-    missing_factor_loadings_index = positions.index.difference(
-        factor_loadings.index.get_level_values(0).unique()
-    )
-
     if len(missing_factor_loadings_index) > 0:
 
         if len(missing_factor_loadings_index) > 5:
@@ -596,7 +956,8 @@ def _align_and_warn(returns,
                                              errors='ignore')
 
     if transactions is not None and pos_in_dollars:
-        turnover = get_turnover(positions, transactions).mean()
+        turnover = get_turnover(positions, transactions,
+                                txn_vol=txn_vol).mean()
         if turnover > PERF_ATTRIB_TURNOVER_THRESHOLD:
             warning_msg = (
                 "This algorithm has relatively high turnover of its "
@@ -611,7 +972,7 @@ def _align_and_warn(returns,
             )
             warnings.warn(warning_msg)
 
-    return (returns, positions, factor_returns, factor_loadings)
+    return (returns, positions, factor_returns)
 
 
 def _stack_positions(positions, pos_in_dollars=True):
@@ -621,7 +982,7 @@ def _stack_positions(positions, pos_in_dollars=True):
 
     Parameters
     ----------
-    positions: pd.DataFrame
+    positions: pd.DataFrame or SparsePositions
         Daily holdings (in dollars or percentages), indexed by date.
         Will be converted to percentages if positions are in dollars.
         Short positions show up as cash in the 'cash' column.
@@ -634,6 +995,10 @@ def _stack_positions(positions, pos_in_dollars=True):
         # convert holdings to percentages
         positions = get_percent_alloc(positions)
 
+    if isinstance(positions, SparsePositions):
+        # only stored holdings are stacked, cash is kept separately
+        return positions.stack()
+
     # remove cash after normalizing positions
     positions = positions.drop('cash', axis='columns')
 
@@ -644,6 +1009,205 @@ def _stack_positions(positions, pos_in_dollars=True):
     return positions
 
 
+def _compute_exposures_by_codes(positions, factor_loadings,
+                                pos_in_dollars=True,
+                                block_size=PERF_ATTRIB_BLOCK_SIZE):
+    """
+    Daily factor exposures of the portfolio, without stacking positions
+    or joining on the MultiIndex of the factor loadings.
+     - See _add_exposures.
+
+    Parameters
+    ----------
+    positions : pd.DataFrame or SparsePositions
+        Daily holdings (in dollars or percentages), indexed by date,
+        including cash.
+    factor_loadings : pd.DataFrame
+        Factor loadings, with date and ticker as index, and factors as
+        columns.
+    pos_in_dollars : bool
+        Flag indicating whether `positions` are in dollars or percentages
+        If True, positions are in dollars.
+    block_size : int, optional
+        Number of loadings expanded at a time. Bounds the memory used.
+
+    Returns
+    -------
+    risk_exposures_portfolio : pd.DataFrame
+        Exposures indexed by the dates of positions that have loadings,
+        with factors as columns.
+    """
+
+    if pos_in_dollars:
+        positions = get_percent_alloc(positions)
+
+    holdings, dates, tickers = _holdings(positions)
+    exposures = np.zeros((len(dates), len(factor_loadings.columns)))
+    has_loadings = np.zeros(len(dates), dtype=bool)
+
+    _add_exposures(exposures, has_loadings, holdings, dates, tickers,
+                   factor_loadings, block_size=block_size)
+
+    return _exposures_frame(exposures[has_loadings], dates[has_loadings],
+                            factor_loadings.columns)
+
+
+def _holdings(positions):
+    """
+    Holdings without cash, as a (dates x tickers) array or as sparse
+    positions, along with their dates and tickers.
+    """
+
+    if isinstance(positions, SparsePositions):
+        return positions, positions.dates, positions.symbols
+
+    tickers = positions.columns.drop('cash')
+    return positions[tickers].values, positions.index, tickers
+
+
+def _add_exposures(exposures, has_loadings, holdings, dates, tickers,
+                   factor_loadings, block_size=PERF_ATTRIB_BLOCK_SIZE):
+    """
+    Adds the exposures due to factor_loadings to the (dates x factors)
+    array exposures, and flags the dates the loadings cover.
+
+    Dates and tickers of the loadings are mapped to rows and columns of
+    holdings once, through the codes of their MultiIndex. Then, for one
+    block of dates at a time, the loadings are scattered into a
+    (dates x tickers x factors) array and contracted with the
+    (dates x tickers) holdings.
+
+    Returns
+    -------
+    np.ndarray
+        Codes of the tickers that have loadings on any date.
+    """
+
+    index = factor_loadings.index
+    ticker_map = tickers.get_indexer(index.levels[1])
+    date_codes = dates.get_indexer(index.levels[0])[_level_codes(index, 0)]
+    ticker_codes = ticker_map[_level_codes(index, 1)]
+    loadings = factor_loadings.values
+
+    covered = tickers.get_indexer(_used_level_values(index, 1))
+
+    matched = (date_codes != -1) & (ticker_codes != -1)
+    if not matched.all():
+        date_codes = date_codes[matched]
+        ticker_codes = ticker_codes[matched]
+        loadings = loadings[matched]
+
+    if len(date_codes) > 1 and (np.diff(date_codes) < 0).any():
+        order = np.argsort(date_codes, kind='mergesort')
+        date_codes = date_codes[order]
+        ticker_codes = ticker_codes[order]
+        loadings = loadings[order]
+
+    num_tickers = len(tickers)
+    num_factors = loadings.shape[1]
+
+    # Loadings of the same date and ticker add up, as in the stacked sum
+    # of ep.compute_exposures.
+    cells = date_codes.astype(np.int64) * num_tickers + ticker_codes
+    has_duplicates = len(np.unique(cells)) < len(cells)
+    dates_per_block = max(1, block_size // max(1, num_tickers * num_factors))
+
+    # Only visit the blocks of dates the loadings cover.
+    block_ids = np.unique(date_codes // dates_per_block)
+    block_starts = block_ids * dates_per_block
+    block_bounds = np.searchsorted(
+        date_codes, np.append(block_starts, block_starts[-1:] +
+                              dates_per_block))
+
+    for i in range(len(block_starts)):
+        lo, hi = block_bounds[i], block_bounds[i + 1]
+        # Only span the dates of the block that have loadings.
+        start = date_codes[lo]
+        stop = date_codes[hi - 1] + 1
+
+        # Missing loadings and holdings do not contribute, as in the
+        # NaN skipping sum of ep.compute_exposures.
+        block_loadings = loadings[lo:hi].astype(get_panel_dtype())
+        block_loadings[np.isnan(block_loadings)] = 0
+
+        cube = np.zeros((stop - start, num_tickers, num_factors),
+                        dtype=get_panel_dtype())
+        cells = (date_codes[lo:hi] - start, ticker_codes[lo:hi])
+        if has_duplicates:
+            np.add.at(cube, cells, block_loadings)
+        else:
+            cube[cells] = block_loadings
+
+        if isinstance(holdings, SparsePositions):
+            block_holdings = _dense_rows(holdings, start, stop)
+        else:
+            block_holdings = np.nan_to_num(holdings[start:stop])
+
+        # Summed over tickers in float64, whatever the panel precision.
+        exposures[start:stop] += np.einsum('dt,dtf->df', block_holdings,
+                                           cube, dtype=np.float64)
+
+    has_loadings[date_codes] = True
+
+    return covered[covered != -1]
+
+
+def _exposures_frame(exposures, dates, factors):
+    risk_exposures_portfolio = pd.DataFrame(exposures, index=dates,
+                                            columns=factors)
+    risk_exposures_portfolio.index.name = 'dt'
+    return risk_exposures_portfolio
+
+
+def _dense_rows(positions, start, stop):
+    """
+    Holdings of rows start to stop of sparse positions, as a dense
+    (dates x symbols) array.
+    """
+
+    lo, hi = positions.indptr[start], positions.indptr[stop]
+    rows = np.repeat(np.arange(stop - start),
+                     np.diff(positions.indptr[start:stop + 1]))
+
+    values = np.zeros((stop - start, len(positions.symbols)))
+    values[rows, positions.indices[lo:hi]] = positions.data[lo:hi]
+
+    return values
+
+
+def _attribute_returns(returns, risk_exposures_portfolio, factor_returns,
+                       positions=None, factor_loadings=None):
+    """
+    Splits returns into the returns of each factor and specific returns,
+    given the daily factor exposures, as in empyrical.perf_attrib.
+    """
+
+    perf_attrib_by_factor = risk_exposures_portfolio.multiply(factor_returns)
+    common_returns = perf_attrib_by_factor.sum(axis='columns')
+
+    tilt_exposure = risk_exposures_portfolio.mean()
+    tilt_returns = factor_returns.multiply(tilt_exposure).sum(axis='columns')
+    timing_returns = common_returns - tilt_returns
+    specific_returns = returns - common_returns
+
+    returns_df = pd.DataFrame(OrderedDict([
+        ('total_returns', returns),
+        ('common_returns', common_returns),
+        ('specific_returns', specific_returns),
+        ('tilt_returns', tilt_returns),
+        ('timing_returns', timing_returns)
+    ]))
+
+    return PerfAttribResult(
+        risk_exposures_portfolio,
+        pd.concat([perf_attrib_by_factor, returns_df], axis='columns'),
+        returns=returns,
+        positions=positions,
+        factor_returns=factor_returns,
+        factor_loadings=factor_loadings,
+    )
+
+
 def _cumulative_returns_less_costs(returns, costs):
     """
     Compute cumulative returns, less costs.
@@ -16,10 +16,12 @@ from __future__ import division
 
 import datetime
 from collections import OrderedDict
+from contextlib import contextmanager
 from functools import wraps
 
 import empyrical as ep
 import matplotlib
+import matplotlib.dates as mdates
 import matplotlib.patches as patches
 import matplotlib.pyplot as plt
 import numpy as np
@@ -28,33 +30,72 @@ import pytz
 import scipy as sp
 from matplotlib import figure
 from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
 from matplotlib.ticker import FuncFormatter
 
 from . import _seaborn as sns
-from . import capacity
+from . import analysis
+from . import compute
 from . import pos
 from . import timeseries
 from . import txn
 from . import utils
-from .utils import (APPROX_BDAYS_PER_MONTH,
-                    MM_DISPLAY_UNIT)
+from .profiling import timed
+from .utils import APPROX_BDAYS_PER_MONTH
 
 
 def customize(func):
     """
     Decorator to set plotting context and axes style during function call.
+    Skipped for compute-only calls, which do not plot.
     """
     @wraps(func)
     def call_w_context(*args, **kwargs):
         set_context = kwargs.pop('set_context', True)
-        if set_context:
-            with plotting_context(), axes_style():
-                return func(*args, **kwargs)
-        else:
+        if kwargs.get('compute_only', False):
+            return func(*args, **kwargs)
+        with date_axes():
+            if set_context:
+                with plotting_context(), axes_style():
+                    return func(*args, **kwargs)
             return func(*args, **kwargs)
     return call_w_context
 
 
+@contextmanager
+def date_axes():
+    """
+    Draws pandas time series on matplotlib date axes inside this context,
+    as with x_compat=True.
+
+    Otherwise pandas draws series with a regular frequency on a period
+    axis, in different units from series without one, e.g. downsampled
+    series (see downsample), and from data drawn with matplotlib. Plots
+    sharing an x axis then no longer line up.
+    """
+
+    try:
+        plot_params = pd.plotting.plot_params
+    except AttributeError:
+        # pandas < 0.20
+        plot_params = pd.plot_params
+
+    with plot_params.use('x_compat', True):
+        yield
+
+
+def on_date_axes(func):
+    """
+    Decorator that runs func inside date_axes.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with date_axes():
+            return func(*args, **kwargs)
+    return wrapper
+
+
 def plotting_context(context='notebook', font_scale=1.5, rc=None):
     """
     Create pyfolio default plotting style context.
@@ -140,6 +181,127 @@ def axes_style(style='darkgrid', rc=None):
     return sns.axes_style(style=style, rc=rc)
 
 
+# Line plots of more points than DEFAULT_DOWNSAMPLE_THRESHOLD are reduced
+# to the first, last, lowest and highest point of each of
+# DEFAULT_DOWNSAMPLE_BUCKETS buckets, about one per pixel of a plot.
+DEFAULT_DOWNSAMPLE_THRESHOLD = 5000
+DEFAULT_DOWNSAMPLE_BUCKETS = 1000
+
+_downsampling = (DEFAULT_DOWNSAMPLE_THRESHOLD, DEFAULT_DOWNSAMPLE_BUCKETS)
+
+
+def set_downsampling(threshold=DEFAULT_DOWNSAMPLE_THRESHOLD,
+                     buckets=DEFAULT_DOWNSAMPLE_BUCKETS):
+    """
+    Sets when long time series are downsampled before being plotted.
+
+    Applies to plot_returns, plot_rolling_returns, plot_drawdown_underwater,
+    plot_rolling_volatility, plot_rolling_sharpe, plot_gross_leverage and
+    plot_exposures.
+
+    Parameters
+    ----------
+    threshold : int or None, optional
+        Number of points above which a series is downsampled. None turns
+        downsampling off.
+    buckets : int, optional
+        Number of buckets the series is split into. See downsample.
+    """
+
+    global _downsampling
+    if buckets < 1:
+        raise ValueError('buckets must be positive, got {}.'.format(buckets))
+    _downsampling = (threshold, buckets)
+
+
+@contextmanager
+def use_downsampling(threshold=DEFAULT_DOWNSAMPLE_THRESHOLD,
+                     buckets=DEFAULT_DOWNSAMPLE_BUCKETS):
+    """
+    Sets when long time series are downsampled inside this context only.
+    See set_downsampling.
+
+    Example
+    -------
+    >>> with pyfolio.plotting.use_downsampling(threshold=None):
+    >>>    pyfolio.create_returns_tear_sheet(returns)
+    """
+
+    global _downsampling
+    previous = _downsampling
+    set_downsampling(threshold, buckets)
+    try:
+        yield
+    finally:
+        _downsampling = previous
+
+
+def downsample(data, buckets=DEFAULT_DOWNSAMPLE_BUCKETS):
+    """
+    Reduces a time series to the points that determine its plot.
+
+    The index is split into buckets of equal length of time (or of equal
+    number of points for a non datetime index), and only the first, last,
+    lowest and highest point of each bucket are kept. Drawn with one
+    bucket per pixel, the plot looks the same, peaks and troughs included.
+
+    Parameters
+    ----------
+    data : pd.Series or pd.DataFrame
+        Numeric series, sorted by index. The points of a DataFrame are kept
+        if they are kept for any of its columns, so that the columns keep
+        a common index.
+    buckets : int, optional
+        Number of buckets. At most 4 points per bucket and column are kept.
+
+    Returns
+    -------
+    pd.Series or pd.DataFrame
+        The kept rows of data.
+    """
+
+    n = len(data)
+    if n <= 4 * buckets:
+        return data
+
+    if isinstance(data.index, pd.DatetimeIndex):
+        x = data.index.asi8.astype(np.float64)
+    else:
+        x = np.arange(n, dtype=np.float64)
+    span = x[-1] - x[0]
+    if span > 0:
+        bucket = np.minimum(((x - x[0]) / span * buckets).astype(np.int64),
+                            buckets - 1)
+    else:
+        bucket = np.zeros(n, dtype=np.int64)
+
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    keep = [starts, ends]
+
+    values = np.asarray(data.values, dtype=np.float64).reshape(n, -1)
+    for column in values.T:
+        # Sorted by bucket, then by value, the first row of each bucket is
+        # its lowest point. NaNs sort last, so they are only kept for
+        # buckets without values.
+        keep.append(np.lexsort((column, bucket))[starts])
+        keep.append(np.lexsort((-column, bucket))[starts])
+
+    return data.iloc[np.unique(np.concatenate(keep))]
+
+
+def _downsample(data):
+    """
+    Downsamples data as set with set_downsampling.
+    """
+
+    threshold, buckets = _downsampling
+    if threshold is None or len(data) <= threshold:
+        return data
+    return downsample(data, buckets=buckets)
+
+
+@timed
 def plot_monthly_returns_heatmap(returns, ax=None, **kwargs):
     """
     Plots a heatmap of returns by month.
@@ -182,6 +344,7 @@ def plot_monthly_returns_heatmap(returns, ax=None, **kwargs):
     return ax
 
 
+@timed
 def plot_annual_returns(returns, ax=None, **kwargs):
     """
     Plots a bar graph of returns by year.
@@ -232,6 +395,7 @@ def plot_annual_returns(returns, ax=None, **kwargs):
     return ax
 
 
+@timed
 def plot_monthly_returns_dist(returns, ax=None, **kwargs):
     """
     Plots a distribution of monthly returns.
@@ -283,7 +447,9 @@ def plot_monthly_returns_dist(returns, ax=None, **kwargs):
     return ax
 
 
-def plot_holdings(returns, positions, legend_loc='best', ax=None, **kwargs):
+@timed
+def plot_holdings(returns, positions, legend_loc='best', ax=None,
+                  exposure_summary=None, **kwargs):
     """
     Plots total amount of stocks with an active position, either short
     or long. Displays daily total, daily average per month, and
@@ -299,6 +465,8 @@ def plot_holdings(returns, positions, legend_loc='best', ax=None, **kwargs):
          - See full explanation in tears.create_full_tear_sheet.
     legend_loc : matplotlib.loc, optional
         The location of the legend on the plot.
+    exposure_summary : pd.DataFrame, optional
+        Precomputed pos.get_exposure_summary(positions).
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
     **kwargs, optional
@@ -313,8 +481,11 @@ def plot_holdings(returns, positions, legend_loc='best', ax=None, **kwargs):
     if ax is None:
         ax = plt.gca()
 
-    positions = positions.copy().drop('cash', axis='columns')
-    df_holdings = positions.replace(0, np.nan).count(axis=1)
+    if exposure_summary is None:
+        exposure_summary = pos.get_exposure_summary(positions)
+
+    df_holdings = (exposure_summary['long_count'] +
+                   exposure_summary['short_count'])
     df_holdings_by_month = df_holdings.resample('1M').mean()
     df_holdings.plot(color='steelblue', alpha=0.6, lw=0.5, ax=ax, **kwargs)
     df_holdings_by_month.plot(
@@ -343,8 +514,10 @@ def plot_holdings(returns, positions, legend_loc='best', ax=None, **kwargs):
     return ax
 
 
+@timed
 def plot_long_short_holdings(returns, positions,
-                             legend_loc='upper left', ax=None, **kwargs):
+                             legend_loc='upper left', ax=None,
+                             exposure_summary=None, **kwargs):
     """
     Plots total amount of stocks with an active position, breaking out
     short and long into transparent filled regions.
@@ -359,6 +532,8 @@ def plot_long_short_holdings(returns, positions,
          - See full explanation in tears.create_full_tear_sheet.
     legend_loc : matplotlib.loc, optional
         The location of the legend on the plot.
+    exposure_summary : pd.DataFrame, optional
+        Precomputed pos.get_exposure_summary(positions).
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
     **kwargs, optional
@@ -374,10 +549,11 @@ def plot_long_short_holdings(returns, positions,
     if ax is None:
         ax = plt.gca()
 
-    positions = positions.drop('cash', axis='columns')
-    positions = positions.replace(0, np.nan)
-    df_longs = positions[positions > 0].count(axis=1)
-    df_shorts = positions[positions < 0].count(axis=1)
+    if exposure_summary is None:
+        exposure_summary = pos.get_exposure_summary(positions)
+
+    df_longs = exposure_summary['long_count']
+    df_shorts = exposure_summary['short_count']
     lf = ax.fill_between(df_longs.index, 0, df_longs.values,
                          color='g', alpha=0.5, lw=2.0)
     sf = ax.fill_between(df_shorts.index, 0, df_shorts.values,
@@ -400,7 +576,9 @@ def plot_long_short_holdings(returns, positions,
     return ax
 
 
-def plot_drawdown_periods(returns, top=10, ax=None, **kwargs):
+@timed
+def plot_drawdown_periods(returns, top=10, ax=None, analysis_context=None,
+                          **kwargs):
     """
     Plots cumulative returns highlighting top drawdown periods.
 
@@ -413,6 +591,8 @@ def plot_drawdown_periods(returns, top=10, ax=None, **kwargs):
         Amount of top drawdowns periods to plot (default 10).
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
     **kwargs, optional
         Passed to plotting function.
 
@@ -428,8 +608,10 @@ def plot_drawdown_periods(returns, top=10, ax=None, **kwargs):
     y_axis_formatter = FuncFormatter(utils.two_dec_places)
     ax.yaxis.set_major_formatter(FuncFormatter(y_axis_formatter))
 
-    df_cum_rets = ep.cum_returns(returns, starting_value=1.0)
-    df_drawdowns = timeseries.gen_drawdown_table(returns, top=top)
+    analysis_context = analysis.get_analysis_context(analysis_context,
+                                                     returns)
+    df_cum_rets = analysis_context.cum_returns
+    df_drawdowns = analysis_context.drawdown_table(top)
 
     df_cum_rets.plot(ax=ax, **kwargs)
 
@@ -453,7 +635,10 @@ def plot_drawdown_periods(returns, top=10, ax=None, **kwargs):
     return ax
 
 
-def plot_drawdown_underwater(returns, ax=None, **kwargs):
+@timed
+@on_date_axes
+def plot_drawdown_underwater(returns, ax=None, analysis_context=None,
+                             **kwargs):
     """
     Plots how far underwaterr returns are over time, or plots current
     drawdown vs. date.
@@ -465,6 +650,8 @@ def plot_drawdown_underwater(returns, ax=None, **kwargs):
          - See full explanation in tears.create_full_tear_sheet.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
     **kwargs, optional
         Passed to plotting function.
 
@@ -480,16 +667,20 @@ def plot_drawdown_underwater(returns, ax=None, **kwargs):
     y_axis_formatter = FuncFormatter(utils.percentage)
     ax.yaxis.set_major_formatter(FuncFormatter(y_axis_formatter))
 
-    df_cum_rets = ep.cum_returns(returns, starting_value=1.0)
+    analysis_context = analysis.get_analysis_context(analysis_context,
+                                                     returns)
+    df_cum_rets = analysis_context.cum_returns
     running_max = np.maximum.accumulate(df_cum_rets)
     underwater = -100 * ((running_max - df_cum_rets) / running_max)
-    (underwater).plot(ax=ax, kind='area', color='coral', alpha=0.7, **kwargs)
+    _downsample(underwater).plot(ax=ax, kind='area', color='coral',
+                                 alpha=0.7, **kwargs)
     ax.set_ylabel('Drawdown')
     ax.set_title('Underwater plot')
     ax.set_xlabel('')
     return ax
 
 
+@timed
 def plot_perf_stats(returns, factor_returns, ax=None):
     """
     Create box plot of some performance metrics of the strategy.
@@ -536,10 +727,12 @@ STAT_FUNCS_PCT = [
 ]
 
 
+@timed
 def show_perf_stats(returns, factor_returns=None, positions=None,
                     transactions=None, turnover_denom='AGB',
                     live_start_date=None, bootstrap=False,
-                    header_rows=None):
+                    header_rows=None, analysis_context=None,
+                    perf_stats=None):
     """
     Prints some performance metrics of the strategy.
 
@@ -576,73 +769,26 @@ def show_perf_stats(returns, factor_returns=None, positions=None,
          - For more information, see timeseries.perf_stats_bootstrap
     header_rows : dict or OrderedDict, optional
         Extra rows to display at the top of the displayed table.
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
+    perf_stats : pd.DataFrame, optional
+        Performance metrics to display, as computed by
+        compute.perf_stats_table. Computed if not given.
     """
 
-    if bootstrap:
-        perf_func = timeseries.perf_stats_bootstrap
-    else:
-        perf_func = timeseries.perf_stats
-
-    perf_stats_all = perf_func(
-        returns,
-        factor_returns=factor_returns,
-        positions=positions,
-        transactions=transactions,
-        turnover_denom=turnover_denom)
-
-    date_rows = OrderedDict()
-    if len(returns.index) > 0:
-        date_rows['Start date'] = returns.index[0].strftime('%Y-%m-%d')
-        date_rows['End date'] = returns.index[-1].strftime('%Y-%m-%d')
-
-    if live_start_date is not None:
-        live_start_date = ep.utils.get_utc_timestamp(live_start_date)
-        returns_is = returns[returns.index < live_start_date]
-        returns_oos = returns[returns.index >= live_start_date]
-
-        positions_is = None
-        positions_oos = None
-        transactions_is = None
-        transactions_oos = None
-
-        if positions is not None:
-            positions_is = positions[positions.index < live_start_date]
-            positions_oos = positions[positions.index >= live_start_date]
-            if transactions is not None:
-                transactions_is = transactions[(transactions.index <
-                                                live_start_date)]
-                transactions_oos = transactions[(transactions.index >
-                                                 live_start_date)]
-
-        perf_stats_is = perf_func(
-            returns_is,
-            factor_returns=factor_returns,
-            positions=positions_is,
-            transactions=transactions_is,
-            turnover_denom=turnover_denom)
-
-        perf_stats_oos = perf_func(
-            returns_oos,
+    if perf_stats is None:
+        perf_stats = compute.perf_stats_table(
+            returns,
             factor_returns=factor_returns,
-            positions=positions_oos,
-            transactions=transactions_oos,
-            turnover_denom=turnover_denom)
-        if len(returns.index) > 0:
-            date_rows['In-sample months'] = int(len(returns_is) /
-                                                APPROX_BDAYS_PER_MONTH)
-            date_rows['Out-of-sample months'] = int(len(returns_oos) /
-                                                    APPROX_BDAYS_PER_MONTH)
-
-        perf_stats = pd.concat(OrderedDict([
-            ('In-sample', perf_stats_is),
-            ('Out-of-sample', perf_stats_oos),
-            ('All', perf_stats_all),
-        ]), axis=1)
+            positions=positions,
+            transactions=transactions,
+            turnover_denom=turnover_denom,
+            live_start_date=live_start_date,
+            bootstrap=bootstrap,
+            analysis_context=analysis_context)[0]
     else:
-        if len(returns.index) > 0:
-            date_rows['Total months'] = int(len(returns) /
-                                            APPROX_BDAYS_PER_MONTH)
-        perf_stats = pd.DataFrame(perf_stats_all, columns=['Backtest'])
+        perf_stats = perf_stats.copy()
+    date_rows = compute.perf_stats_date_rows(returns, live_start_date)
 
     for column in perf_stats.columns:
         for stat, value in perf_stats[column].iteritems():
@@ -662,6 +808,8 @@ def show_perf_stats(returns, factor_returns=None, positions=None,
     )
 
 
+@timed
+@on_date_axes
 def plot_returns(returns,
                  live_start_date=None,
                  ax=None):
@@ -700,15 +848,17 @@ def plot_returns(returns,
         live_start_date = ep.utils.get_utc_timestamp(live_start_date)
         is_returns = returns.loc[returns.index < live_start_date]
         oos_returns = returns.loc[returns.index >= live_start_date]
-        is_returns.plot(ax=ax, color='g')
-        oos_returns.plot(ax=ax, color='r')
+        _downsample(is_returns).plot(ax=ax, color='g')
+        _downsample(oos_returns).plot(ax=ax, color='r')
 
     else:
-        returns.plot(ax=ax, color='g')
+        _downsample(returns).plot(ax=ax, color='g')
 
     return ax
 
 
+@timed
+@on_date_axes
 def plot_rolling_returns(returns,
                          factor_returns=None,
                          live_start_date=None,
@@ -717,7 +867,7 @@ def plot_rolling_returns(returns,
                          legend_loc='best',
                          volatility_match=False,
                          cone_function=timeseries.forecast_cone_bootstrap,
-                         ax=None, **kwargs):
+                         ax=None, analysis_context=None, **kwargs):
     """
     Plots cumulative rolling returns versus some benchmarks'.
 
@@ -761,6 +911,8 @@ def plot_rolling_returns(returns,
         See timeseries.forecast_cone_bootstrap for an example.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
     **kwargs, optional
         Passed to plotting function.
 
@@ -784,7 +936,11 @@ def plot_rolling_returns(returns,
         bmark_vol = factor_returns.loc[returns.index].std()
         returns = (returns / returns.std()) * bmark_vol
 
-    cum_rets = ep.cum_returns(returns, 1.0)
+    if volatility_match:
+        cum_rets = ep.cum_returns(returns, 1.0)
+    else:
+        cum_rets = analysis.get_analysis_context(analysis_context,
+                                                 returns).cum_returns
 
     y_axis_formatter = FuncFormatter(utils.two_dec_places)
     ax.yaxis.set_major_formatter(FuncFormatter(y_axis_formatter))
@@ -792,9 +948,9 @@ def plot_rolling_returns(returns,
     if factor_returns is not None:
         cum_factor_returns = ep.cum_returns(
             factor_returns[cum_rets.index], 1.0)
-        cum_factor_returns.plot(lw=2, color='gray',
-                                label=factor_returns.name, alpha=0.60,
-                                ax=ax, **kwargs)
+        _downsample(cum_factor_returns).plot(lw=2, color='gray',
+                                             label=factor_returns.name,
+                                             alpha=0.60, ax=ax, **kwargs)
 
     if live_start_date is not None:
         live_start_date = ep.utils.get_utc_timestamp(live_start_date)
@@ -804,12 +960,12 @@ def plot_rolling_returns(returns,
         is_cum_returns = cum_rets
         oos_cum_returns = pd.Series([])
 
-    is_cum_returns.plot(lw=3, color='forestgreen', alpha=0.6,
-                        label='Backtest', ax=ax, **kwargs)
+    _downsample(is_cum_returns).plot(lw=3, color='forestgreen', alpha=0.6,
+                                     label='Backtest', ax=ax, **kwargs)
 
     if len(oos_cum_returns) > 0:
-        oos_cum_returns.plot(lw=4, color='red', alpha=0.6,
-                             label='Live', ax=ax, **kwargs)
+        _downsample(oos_cum_returns).plot(lw=4, color='red', alpha=0.6,
+                                          label='Live', ax=ax, **kwargs)
 
         if cone_std is not None:
             if isinstance(cone_std, (float, int)):
@@ -823,6 +979,7 @@ def plot_rolling_returns(returns,
                 starting_value=is_cum_returns[-1])
 
             cone_bounds = cone_bounds.set_index(oos_cum_returns.index)
+            cone_bounds = _downsample(cone_bounds)
             for std in cone_std:
                 ax.fill_between(cone_bounds.index,
                                 cone_bounds[float(std)],
@@ -836,8 +993,9 @@ def plot_rolling_returns(returns,
     return ax
 
 
+@timed
 def plot_rolling_beta(returns, factor_returns, legend_loc='best',
-                      ax=None, **kwargs):
+                      ax=None, rolling_beta=None, **kwargs):
     """
     Plots the rolling 6-month and 12-month beta versus date.
 
@@ -854,6 +1012,9 @@ def plot_rolling_beta(returns, factor_returns, legend_loc='best',
         The location of the legend on the plot.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    rolling_beta : pd.DataFrame, optional
+        6-mo and 12-mo rolling betas, as computed by
+        compute.compute_returns_tear_sheet. Computed if not given.
     **kwargs, optional
         Passed to plotting function.
 
@@ -871,11 +1032,16 @@ def plot_rolling_beta(returns, factor_returns, legend_loc='best',
 
     ax.set_title("Rolling portfolio beta to " + str(factor_returns.name))
     ax.set_ylabel('Beta')
-    rb_1 = timeseries.rolling_beta(
-        returns, factor_returns, rolling_window=APPROX_BDAYS_PER_MONTH * 6)
+    if rolling_beta is None:
+        rb_1 = timeseries.rolling_beta(
+            returns, factor_returns,
+            rolling_window=APPROX_BDAYS_PER_MONTH * 6)
+        rb_2 = timeseries.rolling_beta(
+            returns, factor_returns,
+            rolling_window=APPROX_BDAYS_PER_MONTH * 12)
+    else:
+        rb_1, rb_2 = rolling_beta['6-mo'], rolling_beta['12-mo']
     rb_1.plot(color='steelblue', lw=3, alpha=0.6, ax=ax, **kwargs)
-    rb_2 = timeseries.rolling_beta(
-        returns, factor_returns, rolling_window=APPROX_BDAYS_PER_MONTH * 12)
     rb_2.plot(color='grey', lw=3, alpha=0.4, ax=ax, **kwargs)
     ax.axhline(rb_1.mean(), color='steelblue', linestyle='--', lw=3)
     ax.axhline(0.0, color='black', linestyle='-', lw=2)
@@ -888,9 +1054,12 @@ def plot_rolling_beta(returns, factor_returns, legend_loc='best',
     return ax
 
 
+@timed
+@on_date_axes
 def plot_rolling_volatility(returns, factor_returns=None,
                             rolling_window=APPROX_BDAYS_PER_MONTH * 6,
-                            legend_loc='best', ax=None, **kwargs):
+                            legend_loc='best', ax=None,
+                            rolling_volatility=None, **kwargs):
     """
     Plots the rolling volatility versus date.
 
@@ -910,6 +1079,9 @@ def plot_rolling_volatility(returns, factor_returns=None,
         The location of the legend on the plot.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    rolling_volatility : pd.Series, optional
+        Rolling volatility of returns over rolling_window. Computed if
+        not given.
     **kwargs, optional
         Passed to plotting function.
 
@@ -925,19 +1097,21 @@ def plot_rolling_volatility(returns, factor_returns=None,
     y_axis_formatter = FuncFormatter(utils.two_dec_places)
     ax.yaxis.set_major_formatter(FuncFormatter(y_axis_formatter))
 
-    rolling_vol_ts = timeseries.rolling_volatility(
-        returns, rolling_window)
-    rolling_vol_ts.plot(alpha=.7, lw=3, color='orangered', ax=ax,
-                        **kwargs)
+    if rolling_volatility is None:
+        rolling_volatility = timeseries.rolling_volatility(
+            returns, rolling_window)
+    _downsample(rolling_volatility).plot(alpha=.7, lw=3, color='orangered',
+                                         ax=ax, **kwargs)
     if factor_returns is not None:
         rolling_vol_ts_factor = timeseries.rolling_volatility(
             factor_returns, rolling_window)
-        rolling_vol_ts_factor.plot(alpha=.7, lw=3, color='grey', ax=ax,
-                                   **kwargs)
+        _downsample(rolling_vol_ts_factor).plot(alpha=.7, lw=3,
+                                                color='grey', ax=ax,
+                                                **kwargs)
 
     ax.set_title('Rolling volatility (6-month)')
     ax.axhline(
-        rolling_vol_ts.mean(),
+        rolling_volatility.mean(),
         color='steelblue',
         linestyle='--',
         lw=3)
@@ -955,9 +1129,12 @@ def plot_rolling_volatility(returns, factor_returns=None,
     return ax
 
 
+@timed
+@on_date_axes
 def plot_rolling_sharpe(returns, factor_returns=None,
                         rolling_window=APPROX_BDAYS_PER_MONTH * 6,
-                        legend_loc='best', ax=None, **kwargs):
+                        legend_loc='best', ax=None, rolling_sharpe=None,
+                        **kwargs):
     """
     Plots the rolling Sharpe ratio versus date.
 
@@ -977,6 +1154,9 @@ def plot_rolling_sharpe(returns, factor_returns=None,
         The location of the legend on the plot.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    rolling_sharpe : pd.Series, optional
+        Rolling Sharpe ratio of returns over rolling_window. Computed if
+        not given.
     **kwargs, optional
         Passed to plotting function.
 
@@ -992,20 +1172,21 @@ def plot_rolling_sharpe(returns, factor_returns=None,
     y_axis_formatter = FuncFormatter(utils.two_dec_places)
     ax.yaxis.set_major_formatter(FuncFormatter(y_axis_formatter))
 
-    rolling_sharpe_ts = timeseries.rolling_sharpe(
-        returns, rolling_window)
-    rolling_sharpe_ts.plot(alpha=.7, lw=3, color='orangered', ax=ax,
-                           **kwargs)
+    if rolling_sharpe is None:
+        rolling_sharpe = timeseries.rolling_sharpe(returns, rolling_window)
+    _downsample(rolling_sharpe).plot(alpha=.7, lw=3, color='orangered',
+                                     ax=ax, **kwargs)
 
     if factor_returns is not None:
         rolling_sharpe_ts_factor = timeseries.rolling_sharpe(
             factor_returns, rolling_window)
-        rolling_sharpe_ts_factor.plot(alpha=.7, lw=3, color='grey', ax=ax,
-                                      **kwargs)
+        _downsample(rolling_sharpe_ts_factor).plot(alpha=.7, lw=3,
+                                                   color='grey', ax=ax,
+                                                   **kwargs)
 
     ax.set_title('Rolling Sharpe ratio (6-month)')
     ax.axhline(
-        rolling_sharpe_ts.mean(),
+        rolling_sharpe.mean(),
         color='steelblue',
         linestyle='--',
         lw=3)
@@ -1023,7 +1204,10 @@ def plot_rolling_sharpe(returns, factor_returns=None,
     return ax
 
 
-def plot_gross_leverage(returns, positions, ax=None, **kwargs):
+@timed
+@on_date_axes
+def plot_gross_leverage(returns, positions, ax=None, exposure_summary=None,
+                        **kwargs):
     """
     Plots gross leverage versus date.
 
@@ -1038,6 +1222,8 @@ def plot_gross_leverage(returns, positions, ax=None, **kwargs):
     positions : pd.DataFrame
         Daily net position values.
          - See full explanation in create_full_tear_sheet.
+    exposure_summary : pd.DataFrame, optional
+        Precomputed pos.get_exposure_summary(positions).
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
     **kwargs, optional
@@ -1051,8 +1237,13 @@ def plot_gross_leverage(returns, positions, ax=None, **kwargs):
 
     if ax is None:
         ax = plt.gca()
-    gl = timeseries.gross_lev(positions)
-    gl.plot(lw=0.5, color='limegreen', legend=False, ax=ax, **kwargs)
+
+    if exposure_summary is None:
+        exposure_summary = pos.get_exposure_summary(positions)
+
+    gl = exposure_summary['gross_leverage']
+    _downsample(gl).plot(lw=0.5, color='limegreen', legend=False, ax=ax,
+                         **kwargs)
 
     ax.axhline(gl.mean(), color='g', linestyle='--', lw=3)
 
@@ -1062,7 +1253,10 @@ def plot_gross_leverage(returns, positions, ax=None, **kwargs):
     return ax
 
 
-def plot_exposures(returns, positions, ax=None, **kwargs):
+@timed
+@on_date_axes
+def plot_exposures(returns, positions, ax=None, exposure_summary=None,
+                   **kwargs):
     """
     Plots a cake chart of the long and short exposure.
 
@@ -1074,6 +1268,8 @@ def plot_exposures(returns, positions, ax=None, **kwargs):
     positions_alloc : pd.DataFrame
         Portfolio allocation of positions. See
         pos.get_percent_alloc.
+    exposure_summary : pd.DataFrame, optional
+        Precomputed pos.get_exposure_summary(positions).
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
     **kwargs, optional
@@ -1088,10 +1284,18 @@ def plot_exposures(returns, positions, ax=None, **kwargs):
     if ax is None:
         ax = plt.gca()
 
-    pos_no_cash = positions.drop('cash', axis=1)
-    l_exp = pos_no_cash[pos_no_cash > 0].sum(axis=1) / positions.sum(axis=1)
-    s_exp = pos_no_cash[pos_no_cash < 0].sum(axis=1) / positions.sum(axis=1)
-    net_exp = pos_no_cash.sum(axis=1) / positions.sum(axis=1)
+    if exposure_summary is None:
+        exposure_summary = pos.get_exposure_summary(positions)
+
+    portfolio_value = exposure_summary['portfolio_value']
+    exposures = _downsample(pd.DataFrame({
+        'long': exposure_summary['long'] / portfolio_value,
+        'short': exposure_summary['short'] / portfolio_value,
+        'net': exposure_summary['net'] / portfolio_value,
+    }))
+    l_exp = exposures['long']
+    s_exp = exposures['short']
+    net_exp = exposures['net']
 
     ax.fill_between(l_exp.index,
                     0,
@@ -1112,10 +1316,11 @@ def plot_exposures(returns, positions, ax=None, **kwargs):
     return ax
 
 
+@timed
 def show_and_plot_top_positions(returns, positions_alloc,
                                 show_and_plot=2, hide_positions=False,
                                 legend_loc='real_best', ax=None,
-                                **kwargs):
+                                top_positions=None, **kwargs):
     """
     Prints and/or plots the exposures of the top 10 held positions of
     all time.
@@ -1137,6 +1342,9 @@ def show_and_plot_top_positions(returns, positions_alloc,
         By default, the legend will display below the plot.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    top_positions : tuple of pd.Series, optional
+        Top long, short and absolute positions, as returned by
+        pos.get_top_long_short_abs. Computed if not given.
     **kwargs, optional
         Passed to plotting function.
 
@@ -1146,11 +1354,15 @@ def show_and_plot_top_positions(returns, positions_alloc,
         The axes that were plotted on.
 
     """
-    positions_alloc = positions_alloc.copy()
-    positions_alloc.columns = positions_alloc.columns.map(utils.format_asset)
+    if top_positions is None:
+        top_positions = pos.get_top_long_short_abs(positions_alloc)
 
-    df_top_long, df_top_short, df_top_abs = pos.get_top_long_short_abs(
-        positions_alloc)
+    # Only the time series of the top holdings are needed for plotting.
+    top_positions_alloc = positions_alloc[top_positions[2].index]
+    top_positions_alloc.columns = \
+        top_positions_alloc.columns.map(utils.format_asset)
+    df_top_long, df_top_short, df_top_abs = (
+        df_top.rename(utils.format_asset) for df_top in top_positions)
 
     if show_and_plot == 1 or show_and_plot == 2:
         utils.print_table(pd.DataFrame(df_top_long * 100, columns=['max']),
@@ -1170,7 +1382,7 @@ def show_and_plot_top_positions(returns, positions_alloc,
         if ax is None:
             ax = plt.gca()
 
-        positions_alloc[df_top_abs.index].plot(
+        top_positions_alloc.plot(
             title='Portfolio allocation over time, only top 10 holdings',
             alpha=0.5, ax=ax, **kwargs)
 
@@ -1195,7 +1407,10 @@ def show_and_plot_top_positions(returns, positions_alloc,
         return ax
 
 
-def plot_max_median_position_concentration(positions, ax=None, **kwargs):
+@timed
+def plot_max_median_position_concentration(positions, ax=None,
+                                           position_concentration=None,
+                                           **kwargs):
     """
     Plots the max and median of long and short position concentrations
     over the time.
@@ -1206,6 +1421,10 @@ def plot_max_median_position_concentration(positions, ax=None, **kwargs):
         The positions that the strategy takes over time.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    position_concentration : pd.DataFrame, optional
+        Max and median long and short position concentrations, as
+        returned by pos.get_max_median_position_concentration. Computed
+        if not given.
 
     Returns
     -------
@@ -1216,9 +1435,11 @@ def plot_max_median_position_concentration(positions, ax=None, **kwargs):
     if ax is None:
         ax = plt.gca()
 
-    alloc_summary = pos.get_max_median_position_concentration(positions)
+    if position_concentration is None:
+        position_concentration = \
+            pos.get_max_median_position_concentration(positions)
     colors = ['mediumblue', 'steelblue', 'tomato', 'firebrick']
-    alloc_summary.plot(linewidth=1, color=colors, alpha=0.6, ax=ax)
+    position_concentration.plot(linewidth=1, color=colors, alpha=0.6, ax=ax)
 
     ax.legend(loc='center left', frameon=True, framealpha=0.5)
     ax.set_ylabel('Exposure')
@@ -1227,6 +1448,7 @@ def plot_max_median_position_concentration(positions, ax=None, **kwargs):
     return ax
 
 
+@timed
 def plot_sector_allocations(returns, sector_alloc, ax=None, **kwargs):
     """
     Plots the sector exposures of the portfolio over time.
@@ -1270,6 +1492,7 @@ def plot_sector_allocations(returns, sector_alloc, ax=None, **kwargs):
     return ax
 
 
+@timed
 def plot_return_quantiles(returns, live_start_date=None, ax=None, **kwargs):
     """
     Creates a box plot of daily, weekly, and monthly return
@@ -1323,8 +1546,9 @@ def plot_return_quantiles(returns, live_start_date=None, ax=None, **kwargs):
     return ax
 
 
+@timed
 def plot_turnover(returns, transactions, positions, turnover_denom='AGB',
-                  legend_loc='best', ax=None, **kwargs):
+                  legend_loc='best', ax=None, analysis_context=None, **kwargs):
     """
     Plots turnover vs. date.
 
@@ -1352,6 +1576,8 @@ def plot_turnover(returns, transactions, positions, turnover_denom='AGB',
         The location of the legend on the plot.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
     **kwargs, optional
         Passed to plotting function.
 
@@ -1367,7 +1593,11 @@ def plot_turnover(returns, transactions, positions, turnover_denom='AGB',
     y_axis_formatter = FuncFormatter(utils.two_dec_places)
     ax.yaxis.set_major_formatter(FuncFormatter(y_axis_formatter))
 
-    df_turnover = txn.get_turnover(positions, transactions, turnover_denom)
+    if analysis_context is not None:
+        df_turnover = analysis_context.turnover(turnover_denom)
+    else:
+        df_turnover = txn.get_turnover(positions, transactions,
+                                       turnover_denom)
     df_turnover_by_month = df_turnover.resample("M").mean()
     df_turnover.plot(color='steelblue', alpha=1.0, lw=0.5, ax=ax, **kwargs)
     df_turnover_by_month.plot(
@@ -1390,9 +1620,11 @@ def plot_turnover(returns, transactions, positions, turnover_denom='AGB',
     return ax
 
 
+@timed
 def plot_slippage_sweep(returns, positions, transactions,
-                        slippage_params=(3, 8, 10, 12, 15, 20, 50),
-                        ax=None, **kwargs):
+                        slippage_params=compute.SLIPPAGE_SWEEP_PARAMS,
+                        ax=None, analysis_context=None, slippage_sweep=None,
+                        **kwargs):
     """
     Plots equity curves at different per-dollar slippage assumptions.
 
@@ -1412,6 +1644,11 @@ def plot_slippage_sweep(returns, positions, transactions,
         basis points).
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
+    slippage_sweep : pd.DataFrame, optional
+        Cumulative returns per slippage parameter, as returned by
+        compute.slippage_sweep. Computed if not given.
     **kwargs, optional
         Passed to seaborn plotting function.
 
@@ -1424,12 +1661,11 @@ def plot_slippage_sweep(returns, positions, transactions,
     if ax is None:
         ax = plt.gca()
 
-    slippage_sweep = pd.DataFrame()
-    for bps in slippage_params:
-        adj_returns = txn.adjust_returns_for_slippage(returns, positions,
-                                                      transactions, bps)
-        label = str(bps) + " bps"
-        slippage_sweep[label] = ep.cum_returns(adj_returns, 1)
+    if slippage_sweep is None:
+        slippage_sweep = compute.slippage_sweep(
+            returns, positions, transactions,
+            slippage_params=slippage_params,
+            analysis_context=analysis_context)
 
     slippage_sweep.plot(alpha=1.0, lw=0.5, ax=ax)
 
@@ -1441,8 +1677,10 @@ def plot_slippage_sweep(returns, positions, transactions,
     return ax
 
 
+@timed
 def plot_slippage_sensitivity(returns, positions, transactions,
-                              ax=None, **kwargs):
+                              ax=None, analysis_context=None,
+                              slippage_sensitivity=None, **kwargs):
     """
     Plots curve relating per-dollar slippage to average annual returns.
 
@@ -1459,6 +1697,11 @@ def plot_slippage_sensitivity(returns, positions, transactions,
          - See full explanation in tears.create_full_tear_sheet.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
+    slippage_sensitivity : pd.Series, optional
+        Average annual returns per slippage, as returned by
+        compute.slippage_sensitivity. Computed if not given.
     **kwargs, optional
         Passed to seaborn plotting function.
 
@@ -1471,14 +1714,12 @@ def plot_slippage_sensitivity(returns, positions, transactions,
     if ax is None:
         ax = plt.gca()
 
-    avg_returns_given_slippage = pd.Series()
-    for bps in range(1, 100):
-        adj_returns = txn.adjust_returns_for_slippage(returns, positions,
-                                                      transactions, bps)
-        avg_returns = ep.annual_return(adj_returns)
-        avg_returns_given_slippage.loc[bps] = avg_returns
+    if slippage_sensitivity is None:
+        slippage_sensitivity = compute.slippage_sensitivity(
+            returns, positions, transactions,
+            analysis_context=analysis_context)
 
-    avg_returns_given_slippage.plot(alpha=1.0, lw=2, ax=ax)
+    slippage_sensitivity.plot(alpha=1.0, lw=2, ax=ax)
 
     ax.set_title('Average annual returns given additional per-dollar slippage')
     ax.set_xticks(np.arange(0, 100, 10))
@@ -1488,31 +1729,25 @@ def plot_slippage_sensitivity(returns, positions, transactions,
     return ax
 
 
+@timed
 def plot_capacity_sweep(returns, transactions, market_data,
                         bt_starting_capital,
                         min_pv=100000,
                         max_pv=300000000,
                         step_size=1000000,
-                        ax=None):
-    txn_daily_w_bar = capacity.daily_txns_with_bar_data(transactions,
-                                                        market_data)
-
-    captial_base_sweep = pd.Series()
-    for start_pv in range(min_pv, max_pv, step_size):
-        adj_ret = capacity.apply_slippage_penalty(returns,
-                                                  txn_daily_w_bar,
-                                                  start_pv,
-                                                  bt_starting_capital)
-        sharpe = ep.sharpe_ratio(adj_ret)
-        if sharpe < -1:
-            break
-        captial_base_sweep.loc[start_pv] = sharpe
-    captial_base_sweep.index = captial_base_sweep.index / MM_DISPLAY_UNIT
+                        intraday_bars=False,
+                        ax=None,
+                        capacity_sweep=None):
+    if capacity_sweep is None:
+        capacity_sweep = compute.capacity_sweep(
+            returns, transactions, market_data, bt_starting_capital,
+            min_pv=min_pv, max_pv=max_pv, step_size=step_size,
+            intraday_bars=intraday_bars)
 
     if ax is None:
         ax = plt.gca()
 
-    captial_base_sweep.plot(ax=ax)
+    capacity_sweep.plot(ax=ax)
     ax.set_xlabel('Capital base ($mm)')
     ax.set_ylabel('Sharpe ratio')
     ax.set_title('Capital base performance sweep')
@@ -1520,8 +1755,9 @@ def plot_capacity_sweep(returns, transactions, market_data,
     return ax
 
 
+@timed
 def plot_daily_turnover_hist(transactions, positions, turnover_denom='AGB',
-                             ax=None, **kwargs):
+                             ax=None, analysis_context=None, **kwargs):
     """
     Plots a histogram of daily turnover rates.
 
@@ -1538,6 +1774,8 @@ def plot_daily_turnover_hist(transactions, positions, turnover_denom='AGB',
         - See full explanation in txn.get_turnover.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
     **kwargs, optional
         Passed to seaborn plotting function.
 
@@ -1549,14 +1787,19 @@ def plot_daily_turnover_hist(transactions, positions, turnover_denom='AGB',
 
     if ax is None:
         ax = plt.gca()
-    turnover = txn.get_turnover(positions, transactions, turnover_denom)
+    if analysis_context is not None:
+        turnover = analysis_context.turnover(turnover_denom)
+    else:
+        turnover = txn.get_turnover(positions, transactions, turnover_denom)
     sns.distplot(turnover, ax=ax, **kwargs)
     ax.set_title('Distribution of daily turnover rates')
     ax.set_xlabel('Turnover rate')
     return ax
 
 
-def plot_daily_volume(returns, transactions, ax=None, **kwargs):
+@timed
+def plot_daily_volume(returns, transactions, ax=None, analysis_context=None,
+                      **kwargs):
     """
     Plots trading volume per day vs. date.
 
@@ -1572,6 +1815,8 @@ def plot_daily_volume(returns, transactions, ax=None, **kwargs):
          - See full explanation in tears.create_full_tear_sheet.
     ax : matplotlib.Axes, optional
         Axes upon which to plot.
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
     **kwargs, optional
         Passed to plotting function.
 
@@ -1583,7 +1828,10 @@ def plot_daily_volume(returns, transactions, ax=None, **kwargs):
 
     if ax is None:
         ax = plt.gca()
-    daily_txn = txn.get_txn_vol(transactions)
+    if analysis_context is not None:
+        daily_txn = analysis_context.txn_vol
+    else:
+        daily_txn = txn.get_txn_vol(transactions)
     daily_txn.txn_shares.plot(alpha=1.0, lw=0.5, ax=ax, **kwargs)
     ax.axhline(daily_txn.txn_shares.mean(), color='steelblue',
                linestyle='--', lw=3, alpha=1.0)
@@ -1594,6 +1842,7 @@ def plot_daily_volume(returns, transactions, ax=None, **kwargs):
     return ax
 
 
+@timed
 def plot_txn_time_hist(transactions, bin_minutes=5, tz='America/New_York',
                        ax=None, **kwargs):
     """
@@ -1652,7 +1901,9 @@ def plot_txn_time_hist(transactions, bin_minutes=5, tz='America/New_York',
     return ax
 
 
-def show_worst_drawdown_periods(returns, top=5):
+@timed
+def show_worst_drawdown_periods(returns, top=5, analysis_context=None,
+                                drawdowns=None):
     """
     Prints information about the worst drawdown periods.
 
@@ -1666,16 +1917,25 @@ def show_worst_drawdown_periods(returns, top=5):
          - See full explanation in tears.create_full_tear_sheet.
     top : int, optional
         Amount of top drawdowns periods to plot (default 5).
+    analysis_context : analysis.AnalysisContext, optional
+        Context holding precomputed intermediates of the tear sheet.
+    drawdowns : pd.DataFrame, optional
+        The top drawdown periods, as returned by
+        timeseries.gen_drawdown_table. Computed if not given.
     """
 
-    drawdown_df = timeseries.gen_drawdown_table(returns, top=top)
+    if drawdowns is None:
+        analysis_context = analysis.get_analysis_context(analysis_context,
+                                                         returns)
+        drawdowns = analysis_context.drawdown_table(top)
     utils.print_table(
-        drawdown_df.sort_values('Net drawdown in %', ascending=False),
+        drawdowns.sort_values('Net drawdown in %', ascending=False),
         name='Worst drawdown periods',
         float_format='{0:.2f}'.format,
     )
 
 
+@timed
 def plot_monthly_returns_timeseries(returns, ax=None, **kwargs):
     """
     Plots monthly returns as a timeseries.
@@ -1707,10 +1967,10 @@ def plot_monthly_returns_timeseries(returns, ax=None, **kwargs):
 
     sns.barplot(x=monthly_rets.index,
                 y=monthly_rets.values,
-                color='steelblue')
+                color='steelblue',
+                ax=ax)
 
-    _, labels = plt.xticks()
-    plt.setp(labels, rotation=90)
+    plt.setp(ax.get_xticklabels(), rotation=90)
 
     # only show x-labels on year boundary
     xticks_coord = []
@@ -1732,6 +1992,7 @@ def plot_monthly_returns_timeseries(returns, ax=None, **kwargs):
     return ax
 
 
+@timed
 def plot_round_trip_lifetimes(round_trips, disp_amount=16, lsize=18, ax=None):
     """
     Plots timespans and directions of a sample of round trip trades.
@@ -1761,13 +2022,25 @@ def plot_round_trip_lifetimes(round_trips, disp_amount=16, lsize=18, ax=None):
 
     symbol_idx = pd.Series(np.arange(len(sample)), index=sample)
 
-    for symbol, sym_round_trips in sample_round_trips.groupby('symbol'):
-        for _, row in sym_round_trips.iterrows():
-            c = 'b' if row.long else 'r'
-            y_ix = symbol_idx[symbol] + 0.05
-            ax.plot([row['open_dt'], row['close_dt']],
-                    [y_ix, y_ix], color=c,
-                    linewidth=lsize, solid_capstyle='butt')
+    # One segment per round trip, drawn as a single collection rather than
+    # one line per trade. Segments keep the order of round_trips, so that
+    # overlapping trades of a symbol stack as if plotted one by one.
+    y_ix = symbol_idx.reindex(sample_round_trips.symbol).values + 0.05
+    open_x = mdates.date2num(
+        pd.DatetimeIndex(sample_round_trips['open_dt']).to_pydatetime())
+    close_x = mdates.date2num(
+        pd.DatetimeIndex(sample_round_trips['close_dt']).to_pydatetime())
+    segments = np.stack([np.column_stack([open_x, y_ix]),
+                         np.column_stack([close_x, y_ix])], axis=1)
+
+    is_long = sample_round_trips['long'].values.astype(bool)
+    if len(segments):
+        colors = np.where(is_long, 'b', 'r')
+        ax.add_collection(LineCollection(segments, colors=list(colors),
+                                         linewidths=lsize,
+                                         capstyle='butt'))
+        ax.xaxis_date()
+        ax.autoscale_view()
 
     ax.set_yticks(range(disp_amount))
     ax.set_yticklabels([utils.format_asset(s) for s in sample])
@@ -1783,7 +2056,8 @@ def plot_round_trip_lifetimes(round_trips, disp_amount=16, lsize=18, ax=None):
     return ax
 
 
-def show_profit_attribution(round_trips):
+@timed
+def show_profit_attribution(round_trips, profit_attribution=None):
     """
     Prints the share of total PnL contributed by each
     traded name.
@@ -1793,30 +2067,24 @@ def show_profit_attribution(round_trips):
     round_trips : pd.DataFrame
         DataFrame with one row per round trip trade.
         - See full explanation in round_trips.extract_round_trips
-    ax : matplotlib.Axes, optional
-        Axes upon which to plot.
-
-    Returns
-    -------
-    ax : matplotlib.Axes
-        The axes that were plotted on.
+    profit_attribution : pd.Series, optional
+        Share of total PnL per name, as returned by
+        compute.profit_attribution. Computed if not given.
     """
 
-    total_pnl = round_trips['pnl'].sum()
-    pnl_attribution = round_trips.groupby('symbol')['pnl'].sum() / total_pnl
+    if profit_attribution is None:
+        profit_attribution = compute.profit_attribution(round_trips)
+    pnl_attribution = profit_attribution.rename(utils.format_asset)
     pnl_attribution.name = ''
 
-    pnl_attribution.index = pnl_attribution.index.map(utils.format_asset)
     utils.print_table(
-        pnl_attribution.sort_values(
-            inplace=False,
-            ascending=False,
-        ),
+        pnl_attribution,
         name='Profitability (PnL / PnL total) per name',
         float_format='{:.2%}'.format,
     )
 
 
+@timed
 def plot_prob_profit_trade(round_trips, ax=None):
     """
     Plots a probability distribution for the event of making
@@ -1864,6 +2132,7 @@ def plot_prob_profit_trade(round_trips, ax=None):
     return ax
 
 
+@timed
 def plot_cones(name, bounds, oos_returns, num_samples=1000, ax=None,
                cone_std=(1., 1.5, 2.), random_seed=None, num_strikes=3):
     """
@@ -14,9 +14,15 @@
 # limitations under the License.
 from __future__ import division
 
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
 import warnings
+from scipy.sparse import csr_matrix, issparse
+
+from .precision import sum_columns, to_panel
+from .sparse import SparsePositions
 
 try:
     from zipline.assets import Equity, Future
@@ -28,6 +34,8 @@ except ImportError:
         ' to position notionals.'
     )
 
+EXPOSURE_BLOCK_ROWS = 1024
+
 
 def get_percent_alloc(values):
     """
@@ -35,17 +43,21 @@ def get_percent_alloc(values):
 
     Parameters
     ----------
-    values : pd.DataFrame
+    values : pd.DataFrame or SparsePositions
         Contains position values or amounts.
 
     Returns
     -------
-    allocations : pd.DataFrame
+    allocations : pd.DataFrame or SparsePositions
         Positions and their allocations.
     """
 
+    if isinstance(values, SparsePositions):
+        return values.get_percent_alloc()
+
+    values = to_panel(values)
     return values.divide(
-        values.sum(axis='columns'),
+        to_panel(sum_columns(values)),
         axis='rows'
     )
 
@@ -71,16 +83,46 @@ def get_top_long_short_abs(positions, top=10):
         Top absolute positions.
     """
 
-    positions = positions.drop('cash', axis='columns')
-    df_max = positions.max()
-    df_min = positions.min()
-    df_abs_max = positions.abs().max()
-    df_top_long = df_max[df_max > 0].nlargest(top)
-    df_top_short = df_min[df_min < 0].nsmallest(top)
-    df_top_abs = df_abs_max.nlargest(top)
+    # Column extrema are reduced over the whole frame, cash included,
+    # to avoid copying it; the largest absolute value is derived from
+    # them rather than from a materialized abs().
+    values = positions.values
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        col_max = np.nanmax(values, axis=0)
+        col_min = np.nanmin(values, axis=0)
+    col_abs_max = np.fmax(col_max, -col_min)
+
+    not_cash = np.asarray(positions.columns != 'cash')
+    symbols = positions.columns[not_cash]
+    col_max = col_max[not_cash]
+    col_min = col_min[not_cash]
+    col_abs_max = col_abs_max[not_cash]
+
+    df_top_long = _top_k(symbols, col_max, top, col_max > 0)
+    df_top_short = -_top_k(symbols, -col_min, top, col_min < 0)
+    df_top_abs = _top_k(symbols, col_abs_max, top, ~np.isnan(col_abs_max))
     return df_top_long, df_top_short, df_top_abs
 
 
+def _top_k(index, values, k, mask):
+    """
+    The k largest of values where mask holds, sorted in descending
+    order. Candidates are selected with np.argpartition, so only the
+    selected k values are sorted.
+    """
+
+    candidates = np.flatnonzero(mask)
+    if len(candidates) > k:
+        top = np.argpartition(-values[candidates], k - 1)[:k]
+        candidates = np.sort(candidates[top])
+
+    order = np.argsort(-values[candidates], kind='mergesort')
+    candidates = candidates[order]
+
+    return pd.Series(values[candidates], index=index[candidates])
+
+
 def get_max_median_position_concentration(positions):
     """
     Finds the max and median long and short position concentrations
@@ -101,14 +143,23 @@ def get_max_median_position_concentration(positions):
     expos = get_percent_alloc(positions)
     expos = expos.drop('cash', axis=1)
 
-    longs = expos.where(expos.applymap(lambda x: x > 0))
-    shorts = expos.where(expos.applymap(lambda x: x < 0))
-
-    alloc_summary = pd.DataFrame()
-    alloc_summary['max_long'] = longs.max(axis=1)
-    alloc_summary['median_long'] = longs.median(axis=1)
-    alloc_summary['median_short'] = shorts.median(axis=1)
-    alloc_summary['max_short'] = shorts.min(axis=1)
+    values = expos.values
+    longs = np.where(values > 0, values, np.nan)
+    shorts = np.where(values < 0, values, np.nan)
+
+    # Longs and shorts are masked with NaN so that numpy reduces all
+    # rows at once, instead of building a frame per side. Rows without
+    # any longs (shorts) yield NaN.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        alloc_summary = pd.DataFrame(
+            OrderedDict([
+                ('max_long', np.nanmax(longs, axis=1)),
+                ('median_long', np.nanmedian(longs, axis=1)),
+                ('median_short', np.nanmedian(shorts, axis=1)),
+                ('max_short', np.nanmin(shorts, axis=1)),
+            ]),
+            index=expos.index)
 
     return alloc_summary
 
@@ -157,20 +208,94 @@ def extract_pos(positions, cash):
     return values
 
 
+class SectorMapping(object):
+    """
+    Security identifier to sector mapping, with an integer sector code
+    precomputed for every mapped symbol. Build it once and pass it
+    wherever a sector mapping is accepted to avoid repeating the lookups.
+
+    Parameters
+    ----------
+    symbol_sector_map : dict, pd.Series or SectorMapping
+        Security identifier to sector mapping.
+        Security ids as keys/index, sectors as values.
+    """
+
+    def __init__(self, symbol_sector_map):
+        if isinstance(symbol_sector_map, SectorMapping):
+            symbol_sector_map = symbol_sector_map.to_series()
+
+        symbol_sector_map = pd.Series(symbol_sector_map)
+        codes, sectors = pd.factorize(symbol_sector_map.values, sort=True)
+
+        self.symbols = symbol_sector_map.index
+        self.sectors = pd.Index(sectors)
+        self.codes = codes
+
+    def to_series(self):
+        """
+        Mapping as a pd.Series of sectors indexed by symbol.
+        """
+
+        return pd.Series(self.sectors.take(self.codes), index=self.symbols)
+
+    def get_codes(self, symbols):
+        """
+        Sector codes of symbols, -1 for symbols without a mapping or
+        mapped to a missing (NaN) sector.
+        """
+
+        idx = self.symbols.get_indexer(symbols)
+        return np.where(idx == -1, -1, self.codes.take(idx, mode='clip'))
+
+    def has_mapping(self, symbols):
+        """
+        Whether each of symbols is in the mapping, even if mapped to a
+        missing sector.
+        """
+
+        return self.symbols.get_indexer(symbols) != -1
+
+    def map(self, symbols, default=np.nan):
+        """
+        Sectors of symbols, default for symbols without a mapping, and
+        NaN for symbols mapped to a missing sector.
+        """
+
+        codes = self.get_codes(symbols)
+        sectors = self.sectors.values.astype(object).take(codes, mode='clip')
+        sectors[codes == -1] = np.nan
+        sectors[~self.has_mapping(symbols)] = default
+        return sectors
+
+    def one_hot(self, symbols):
+        """
+        Sparse len(symbols) x len(sectors) matrix with a one in the
+        column of each symbol's sector. Unmapped symbols get an empty
+        row.
+        """
+
+        codes = self.get_codes(symbols)
+        rows = np.flatnonzero(codes != -1)
+
+        return csr_matrix((np.ones(len(rows)), (rows, codes[rows])),
+                          shape=(len(codes), len(self.sectors)))
+
+
 def get_sector_exposures(positions, symbol_sector_map):
     """
     Sum position exposures by sector.
 
     Parameters
     ----------
-    positions : pd.DataFrame
+    positions : pd.DataFrame or SparsePositions
         Contains position values or amounts.
         - Example
             index         'AAPL'         'MSFT'        'CHK'        cash
             2004-01-09    13939.380     -15012.993    -403.870      1477.483
             2004-01-12    14492.630     -18624.870    142.630       3989.610
             2004-01-13    -13853.280    13653.640     -100.980      100.000
-    symbol_sector_map : dict or pd.Series
+    symbol_sector_map : dict, pd.Series or SectorMapping
         Security identifier to sector mapping.
         Security ids as keys/index, sectors as values.
         - Example:
@@ -189,33 +314,136 @@ def get_sector_exposures(positions, symbol_sector_map):
             2004-01-13    -199.640        -100.980            100.0000
     """
 
-    cash = positions['cash']
-    positions = positions.drop('cash', axis=1)
-
-    unmapped_pos = np.setdiff1d(positions.columns.values,
-                                list(symbol_sector_map.keys()))
+    if not isinstance(symbol_sector_map, SectorMapping):
+        symbol_sector_map = SectorMapping(symbol_sector_map)
+
+    if isinstance(positions, SparsePositions):
+        index = positions.dates
+        symbols = positions.symbols
+        cash = positions.cash
+        values = csr_matrix(
+            (positions.data, positions.indices, positions.indptr),
+            shape=(len(positions.dates), len(positions.symbols)))
+    else:
+        index = positions.index
+        cash = positions['cash']
+        positions = positions.drop('cash', axis=1)
+        symbols = positions.columns
+        values = np.nan_to_num(positions.values)
+
+    # Symbols mapped to a missing sector are left out without a warning.
+    unmapped_pos = symbols[~symbol_sector_map.has_mapping(symbols)]
     if len(unmapped_pos) > 0:
         warn_message = """Warning: Symbols {} have no sector mapping.
         They will not be included in sector allocations""".format(
             ", ".join(map(str, unmapped_pos)))
         warnings.warn(warn_message, UserWarning)
 
-    sector_exp = positions.groupby(
-        by=symbol_sector_map, axis=1).sum()
+    # (dates x symbols) . (symbols x sectors), keeping only the sectors
+    # of held symbols.
+    one_hot = symbol_sector_map.one_hot(symbols)
+    held_sectors = np.flatnonzero(one_hot.getnnz(axis=0))
+    one_hot = one_hot[:, held_sectors]
+
+    sector_exp = one_hot.T.dot(values.T).T
+    if issparse(sector_exp):
+        sector_exp = sector_exp.toarray()
+
+    sector_exp = pd.DataFrame(sector_exp, index=index,
+                              columns=symbol_sector_map.sectors[held_sectors])
 
     sector_exp['cash'] = cash
 
     return sector_exp
 
 
-def get_long_short_pos(positions):
+def get_exposure_summary(positions, block_rows=EXPOSURE_BLOCK_ROWS):
+    """
+    Computes long, short, gross and net exposure, cash, portfolio value,
+    long and short holding counts and gross leverage in a single pass
+    over the positions.
+
+    The positions are reduced in blocks of rows so that temporaries stay
+    small, and the cash column is masked out of the sums rather than
+    dropped, which would copy the whole frame.
+
+    Parameters
+    ----------
+    positions : pd.DataFrame or SparsePositions
+        Daily net position values (or allocations), including cash.
+         - See full explanation in tears.create_full_tear_sheet.
+    block_rows : int, optional
+        Number of rows reduced at a time.
+
+    Returns
+    -------
+    exposure_summary : pd.DataFrame
+        One row per date, with columns long, short, gross, net, cash,
+        portfolio_value, long_count, short_count and gross_leverage.
+        Portfolio value is the sum of holdings and cash, skipping NaNs.
+    """
+
+    if isinstance(positions, SparsePositions):
+        return positions.get_exposure_summary()
+
+    values = positions.values
+    cash_col = positions.columns.get_loc('cash')
+    cash = values[:, cash_col].astype(np.float64)
+
+    n = len(values)
+    longs = np.empty(n)
+    shorts = np.empty(n)
+    long_count = np.empty(n, dtype=np.int64)
+    short_count = np.empty(n, dtype=np.int64)
+
+    for start in range(0, n, block_rows):
+        block = values[start:start + block_rows]
+        is_long = block > 0
+        is_short = block < 0
+        is_long[:, cash_col] = False
+        is_short[:, cash_col] = False
+
+        rows = slice(start, start + len(block))
+        longs[rows] = np.where(is_long, block, 0).sum(axis=1,
+                                                      dtype=np.float64)
+        shorts[rows] = np.where(is_short, block, 0).sum(axis=1,
+                                                        dtype=np.float64)
+        long_count[rows] = is_long.sum(axis=1)
+        short_count[rows] = is_short.sum(axis=1)
+
+    return _exposure_summary_frame(positions.index, longs, shorts, cash,
+                                   long_count, short_count)
+
+
+def _exposure_summary_frame(index, longs, shorts, cash,
+                            long_count, short_count):
+    gross = longs - shorts
+    net = longs + shorts
+    portfolio_value = net + np.nan_to_num(cash)
+
+    return pd.DataFrame(OrderedDict([
+        ('long', longs),
+        ('short', shorts),
+        ('gross', gross),
+        ('net', net),
+        ('cash', cash),
+        ('portfolio_value', portfolio_value),
+        ('long_count', long_count),
+        ('short_count', short_count),
+        ('gross_leverage', gross / portfolio_value),
+    ]), index=index)
+
+
+def get_long_short_pos(positions, exposure_summary=None):
     """
     Determines the long and short allocations in a portfolio.
 
     Parameters
     ----------
-    positions : pd.DataFrame
+    positions : pd.DataFrame or SparsePositions
         The positions that the strategy takes over time.
+    exposure_summary : pd.DataFrame, optional
+        Precomputed get_exposure_summary(positions).
 
     Returns
     -------
@@ -224,13 +452,13 @@ def get_long_short_pos(positions):
         percentage of the total net liquidation
     """
 
-    pos_wo_cash = positions.drop('cash', axis=1)
-    longs = pos_wo_cash[pos_wo_cash > 0].sum(axis=1).fillna(0)
-    shorts = pos_wo_cash[pos_wo_cash < 0].sum(axis=1).fillna(0)
-    cash = positions.cash
-    net_liquidation = longs + shorts + cash
-    df_pos = pd.DataFrame({'long': longs.divide(net_liquidation, axis='index'),
-                           'short': shorts.divide(net_liquidation,
-                                                  axis='index')})
+    if exposure_summary is None:
+        exposure_summary = get_exposure_summary(positions)
+
+    net_liquidation = exposure_summary['net'] + exposure_summary['cash']
+    df_pos = pd.DataFrame({
+        'long': exposure_summary['long'] / net_liquidation,
+        'short': exposure_summary['short'] / net_liquidation,
+    })
     df_pos['net exposure'] = df_pos['long'] + df_pos['short']
     return df_pos
@@ -0,0 +1,131 @@
+#
+# Copyright 2019 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Precision of the large (dates x symbols) panels.
+
+By default all panels are float64. In float32 mode, the allocations,
+days to liquidate and factor loading blocks derived from positions,
+market data and factor loadings are stored as float32, which halves their
+memory. Sums over names, exposures and returns are still accumulated in
+float64.
+
+>>> pyfolio.precision.set_precision('float32')
+
+Inputs can be converted up front with to_panel, so that the float64
+originals need not be kept around.
+
+Accuracy in float32 mode, as enforced by the tests:
+ - Values derived from a single entry of a panel, e.g. allocations and
+   days to liquidate, are within FLOAT32_RTOL of their float64 values,
+   relative to the value.
+ - Sums over names, e.g. exposures, are within FLOAT32_RTOL of their
+   float64 values, relative to the sum of the absolute values of the
+   terms.
+"""
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+PRECISIONS = {
+    'float64': np.float64,
+    'float32': np.float32,
+}
+
+# Relative error bound of float32 mode. float32 values carry a relative
+# rounding error of 2 ** -24, about 6e-8, and a derived value goes through
+# a few roundings.
+FLOAT32_RTOL = 1e-6
+
+_panel_dtype = np.float64
+
+
+def set_precision(precision):
+    """
+    Sets the precision panels are stored in.
+
+    Parameters
+    ----------
+    precision : str
+        'float64' (the default) or 'float32'.
+    """
+
+    global _panel_dtype
+    if precision not in PRECISIONS:
+        raise ValueError("Unknown precision {!r}. Supported precisions are "
+                         "{}.".format(precision, sorted(PRECISIONS)))
+    _panel_dtype = PRECISIONS[precision]
+
+
+def get_precision():
+    return np.dtype(_panel_dtype).name
+
+
+def get_panel_dtype():
+    return _panel_dtype
+
+
+@contextmanager
+def use_precision(precision):
+    """
+    Sets the precision of panels inside this context only.
+    """
+
+    previous = get_precision()
+    set_precision(precision)
+    try:
+        yield
+    finally:
+        set_precision(previous)
+
+
+def to_panel(frame):
+    """
+    Converts the float columns of frame to float32 in float32 mode.
+    Returns frame unchanged otherwise.
+    """
+
+    if _panel_dtype is np.float64:
+        return frame
+
+    if isinstance(frame, (np.ndarray, pd.Series)):
+        if frame.dtype.kind == 'f' and frame.dtype != _panel_dtype:
+            return frame.astype(_panel_dtype)
+        return frame
+
+    to_cast = {column: _panel_dtype
+               for column, dtype in frame.dtypes.items()
+               if dtype.kind == 'f' and dtype != _panel_dtype}
+    if not to_cast:
+        return frame
+    if len(to_cast) == frame.shape[1]:
+        return frame.astype(_panel_dtype)
+    return frame.astype(to_cast)
+
+
+def sum_columns(frame):
+    """
+    Sums each row of frame, skipping NaNs as DataFrame.sum does, but
+    accumulating reduced precision values in float64.
+    """
+
+    if all(dtype == np.float64 for dtype in frame.dtypes):
+        return frame.sum(axis='columns')
+
+    values = frame.values
+    if values.dtype.kind != 'f':
+        return frame.sum(axis='columns')
+    return pd.Series(np.nansum(values, axis=1, dtype=np.float64),
+                     index=frame.index)
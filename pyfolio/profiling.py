@@ -0,0 +1,257 @@
+#
+# Copyright 2019 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Per-stage timing of tear sheets.
+
+The tear sheets, their plots and tables, and the expensive computations
+behind them (intraday estimation, perf stats, drawdowns, round trips,
+capacity, attribution) are stages. Inside profile(), each stage records
+its wall time, CPU time and peak allocated memory:
+
+>>> with pyfolio.profiling.profile(path='timings.json') as report:
+>>>     pyfolio.create_full_tear_sheet(returns, positions, transactions)
+>>> report.to_frame()
+
+Outside of profile(), stages cost a single check.
+"""
+from __future__ import division
+
+import json
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2. Memory is not traced.
+    tracemalloc = None
+
+try:
+    _wall_clock = time.perf_counter
+    _cpu_clock = time.process_time
+except AttributeError:
+    # Python 2.
+    _wall_clock = time.time
+    _cpu_clock = time.clock
+
+_report = None
+
+StageTiming = namedtuple('StageTiming', [
+    'name',
+    'path',
+    'depth',
+    'wall_time',
+    'cpu_time',
+    'peak_memory',
+])
+StageTiming.__doc__ = """
+Resources used by one run of a stage.
+
+Attributes
+----------
+name : str
+    Name of the stage, e.g. the function that was run.
+path : str
+    Names of the enclosing stages and of this stage, joined by '/'.
+depth : int
+    Number of enclosing stages.
+wall_time, cpu_time : float
+    Elapsed and CPU time of the stage, in seconds, including the stages
+    it encloses.
+peak_memory : int or None
+    Peak memory allocated during the stage, in bytes, on top of what was
+    allocated when it started. None if memory was not traced.
+"""
+
+
+class ProfileReport(object):
+    """
+    Timings of the stages run inside profile().
+
+    Attributes
+    ----------
+    stages : list of StageTiming
+        In the order the stages started, so that each stage comes right
+        after the stage that encloses it.
+    """
+
+    def __init__(self, trace_memory=True, callback=None):
+        self.stages = []
+        self.trace_memory = trace_memory
+        self.callback = callback
+        self._open = []
+
+    def to_frame(self):
+        """
+        Returns the stages as a DataFrame, one row per stage.
+        """
+
+        import pandas as pd
+        return pd.DataFrame(self.stages, columns=StageTiming._fields)
+
+    def summary(self):
+        """
+        Returns the total wall and CPU time, largest peak memory and
+        number of runs of each stage, most time consuming first.
+        """
+
+        return (self.to_frame()
+                .groupby('name')
+                .agg({'wall_time': 'sum', 'cpu_time': 'sum',
+                      'peak_memory': 'max', 'path': 'count'})
+                .rename(columns={'path': 'count'})
+                .sort_values('wall_time', ascending=False))
+
+    def to_json(self, path=None):
+        """
+        Serializes the stages as a JSON list of objects. Written to path,
+        if given, and returned otherwise.
+        """
+
+        stages = [stage._asdict() for stage in self.stages]
+        if path is None:
+            return json.dumps(stages, indent=2)
+        with open(path, 'w') as f:
+            json.dump(stages, f, indent=2)
+
+    def _start(self, name):
+        parent = self._open[-1] if self._open else None
+        path = name if parent is None else parent['path'] + '/' + name
+
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent['peak'] = max(parent['peak'], peak)
+            _reset_peak()
+        else:
+            current = None
+
+        self.stages.append(None)
+        self._open.append({
+            'index': len(self.stages) - 1,
+            'name': name,
+            'path': path,
+            'start_memory': current,
+            'peak': current,
+            'wall': _wall_clock(),
+            'cpu': _cpu_clock(),
+        })
+
+    def _stop(self):
+        stage = self._open.pop()
+        wall_time = _wall_clock() - stage['wall']
+        cpu_time = _cpu_clock() - stage['cpu']
+
+        if self.trace_memory:
+            peak = max(stage['peak'], tracemalloc.get_traced_memory()[1])
+            if self._open:
+                parent = self._open[-1]
+                parent['peak'] = max(parent['peak'], peak)
+            peak_memory = peak - stage['start_memory']
+        else:
+            peak_memory = None
+
+        timing = StageTiming(stage['name'], stage['path'], len(self._open),
+                             wall_time, cpu_time, peak_memory)
+        self.stages[stage['index']] = timing
+
+        if self.callback is not None:
+            self.callback(timing)
+
+
+def _reset_peak():
+    # tracemalloc.reset_peak is new in Python 3.9. Without it, the peak of
+    # a stage can include the peak of an earlier stage.
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+
+
+@contextmanager
+def profile(callback=None, path=None, trace_memory=True):
+    """
+    Records the timings of the stages run inside this context.
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Called with the StageTiming of each stage as it finishes.
+    path : str, optional
+        File the stages are written to as JSON when the context exits.
+    trace_memory : bool, optional
+        Whether to record the peak memory of each stage. Memory is traced
+        with tracemalloc, which slows down allocations. Ignored where
+        tracemalloc is not available (Python 2).
+
+    Yields
+    ------
+    ProfileReport
+        Timings of the stages, filled in as they finish.
+    """
+
+    global _report
+    previous = _report
+    trace_memory = trace_memory and tracemalloc is not None
+    report = ProfileReport(trace_memory=trace_memory, callback=callback)
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    _report = report
+    try:
+        yield report
+    finally:
+        _report = previous
+        if started_tracing:
+            tracemalloc.stop()
+        if path is not None:
+            report.to_json(path)
+
+
+@contextmanager
+def stage(name):
+    """
+    Records the code run inside this context as a stage, when inside
+    profile().
+    """
+
+    report = _report
+    if report is None:
+        yield
+        return
+
+    report._start(name)
+    try:
+        yield
+    finally:
+        report._stop()
+
+
+def timed(func):
+    """
+    Decorator that records each call of a function as a stage named
+    after the function, when inside profile().
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if _report is None:
+            return func(*args, **kwargs)
+        with stage(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -20,6 +20,9 @@ from collections import deque, OrderedDict
 import pandas as pd
 import numpy as np
 
+from .cache import cached
+from .pos import SectorMapping
+from .profiling import timed
 from .utils import print_table, format_asset
 
 PNL_STATS = OrderedDict(
@@ -146,6 +149,8 @@ def _groupby_consecutive(txn, max_delta=pd.Timedelta('8h')):
     return out
 
 
+@timed
+@cached
 def extract_round_trips(transactions,
                         portfolio_value=None):
     """Group transactions into "round trips". First, transactions are
@@ -330,7 +335,7 @@ def apply_sector_mappings_to_round_trips(round_trips, sector_mappings):
     round_trips : pd.DataFrame
         DataFrame with one row per round trip trade.
         - See full explanation in round_trips.extract_round_trips
-    sector_mappings : dict or pd.Series, optional
+    sector_mappings : dict, pd.Series or pos.SectorMapping, optional
         Security identifier to sector mapping.
         Security ids as keys, sectors as values.
 
@@ -340,14 +345,18 @@ def apply_sector_mappings_to_round_trips(round_trips, sector_mappings):
         Round trips with symbol names replaced by sector names.
     """
 
+    if not isinstance(sector_mappings, SectorMapping):
+        sector_mappings = SectorMapping(sector_mappings)
+
     sector_round_trips = round_trips.copy()
-    sector_round_trips.symbol = sector_round_trips.symbol.apply(
-        lambda x: sector_mappings.get(x, 'No Sector Mapping'))
+    sector_round_trips.symbol = sector_mappings.map(
+        sector_round_trips.symbol, default='No Sector Mapping')
     sector_round_trips = sector_round_trips.dropna(axis=0)
 
     return sector_round_trips
 
 
+@timed
 def gen_round_trip_stats(round_trips):
     """Generate various round-trip statistics.
 
@@ -383,7 +392,7 @@ def gen_round_trip_stats(round_trips):
     return stats
 
 
-def print_round_trip_stats(round_trips, hide_pos=False):
+def print_round_trip_stats(round_trips, hide_pos=False, stats=None):
     """Print various round-trip statistics. Tries to pretty-print tables
     with HTML output if run inside IPython NB.
 
@@ -392,13 +401,17 @@ def print_round_trip_stats(round_trips, hide_pos=False):
     round_trips : pd.DataFrame
         DataFrame with one row per round trip trade.
         - See full explanation in round_trips.extract_round_trips
+    stats : dict, optional
+        The summary, pnl, duration, returns and symbols tables of
+        round_trips.gen_round_trip_stats. Computed if not given.
 
     See also
     --------
     round_trips.gen_round_trip_stats
     """
 
-    stats = gen_round_trip_stats(round_trips)
+    if stats is None:
+        stats = gen_round_trip_stats(round_trips)
 
     print_table(stats['summary'], float_format='{:.2f}'.format,
                 name='Summary stats')
@@ -409,6 +422,6 @@ def print_round_trip_stats(round_trips, hide_pos=False):
                 name='Return stats')
 
     if not hide_pos:
-        stats['symbols'].columns = stats['symbols'].columns.map(format_asset)
-        print_table(stats['symbols'] * 100,
+        symbols = stats['symbols'].rename(columns=format_asset)
+        print_table(symbols * 100,
                     float_format='{:.2f}%'.format, name='Symbol stats')
@@ -0,0 +1,246 @@
+#
+# Copyright 2019 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+
+
+class SparsePositions(object):
+    """
+    Daily net position values of a wide, mostly empty book.
+
+    Non-zero holdings are stored row by row (CSR layout): the holdings
+    of the i-th date are ``data[indptr[i]:indptr[i + 1]]`` in the
+    symbols ``symbols[indices[indptr[i]:indptr[i + 1]]]``. Cash is kept
+    as a separate dense series. Memory and compute scale with the number
+    of holdings rather than with the size of the universe.
+
+    Parameters
+    ----------
+    dates : pd.DatetimeIndex
+        Dates of the positions, one row each.
+    symbols : pd.Index
+        Universe of symbols the indices point into.
+    indptr : np.ndarray
+        Row offsets into indices and data, of length len(dates) + 1.
+    indices : np.ndarray
+        Symbol code of each holding.
+    data : np.ndarray
+        Value of each holding.
+    cash : pd.Series
+        Cash on each date, indexed by dates.
+
+    See also
+    --------
+    SparsePositions.from_frame, SparsePositions.from_stacked
+    """
+
+    def __init__(self, dates, symbols, indptr, indices, data, cash):
+        self.dates = pd.Index(dates)
+        self.symbols = pd.Index(symbols)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float64)
+        self.cash = pd.Series(np.asarray(cash, dtype=np.float64),
+                              index=self.dates, name='cash')
+
+        if len(self.indptr) != len(self.dates) + 1:
+            raise ValueError('indptr must have one more entry than dates.')
+        if len(self.indices) != len(self.data):
+            raise ValueError('indices and data must have the same length.')
+
+    @classmethod
+    def from_frame(cls, positions):
+        """
+        Builds sparse positions from a dense positions DataFrame.
+        Zero and NaN holdings are not stored.
+
+        Parameters
+        ----------
+        positions : pd.DataFrame
+            Daily net position values, including a 'cash' column.
+             - See full explanation in tears.create_full_tear_sheet.
+
+        Returns
+        -------
+        SparsePositions
+        """
+
+        holdings = positions.drop('cash', axis='columns')
+        values = holdings.values
+        held = (values != 0) & ~np.isnan(values)
+
+        # np.nonzero returns coordinates in row-major order, which is
+        # exactly the CSR ordering.
+        _, indices = np.nonzero(held)
+        indptr = np.concatenate([[0], np.cumsum(held.sum(axis=1))])
+
+        return cls(positions.index, holdings.columns, indptr, indices,
+                   values[held], positions['cash'].values)
+
+    @classmethod
+    def from_stacked(cls, stacked, cash):
+        """
+        Builds sparse positions from (date, symbol, value) records,
+        without ever materializing the dense frame.
+
+        Parameters
+        ----------
+        stacked : pd.Series
+            Position values indexed by date and symbol. Each (date,
+            symbol) pair may only appear once.
+        cash : pd.Series
+            Cash on each date. Its index defines the dates of the
+            positions.
+
+        Returns
+        -------
+        SparsePositions
+        """
+
+        dates = cash.index
+        date_codes = dates.get_indexer(stacked.index.get_level_values(0))
+        if (date_codes == -1).any():
+            raise ValueError('stacked contains dates that are not in cash.')
+
+        symbol_codes, symbols = pd.factorize(
+            stacked.index.get_level_values(1), sort=True)
+        values = stacked.values
+
+        held = (values != 0) & ~np.isnan(values)
+        date_codes = date_codes[held]
+        symbol_codes = symbol_codes[held]
+        values = values[held]
+
+        order = np.lexsort((symbol_codes, date_codes))
+        indptr = np.searchsorted(date_codes[order],
+                                 np.arange(len(dates) + 1))
+
+        return cls(dates, symbols, indptr, symbol_codes[order],
+                   values[order], cash.values)
+
+    def to_frame(self):
+        """
+        Converts back to a dense positions DataFrame with a 'cash'
+        column.
+
+        Returns
+        -------
+        pd.DataFrame
+            Daily net position values.
+             - See full explanation in tears.create_full_tear_sheet.
+        """
+
+        values = np.zeros((len(self.dates), len(self.symbols)))
+        values[self._row_ids(), self.indices] = self.data
+
+        positions = pd.DataFrame(values, index=self.dates,
+                                 columns=self.symbols)
+        positions['cash'] = self.cash.values
+
+        return positions
+
+    def stack(self):
+        """
+        Stored holdings in long format, as in
+        perf_attrib._stack_positions. Dates without any holdings are
+        absent.
+
+        Returns
+        -------
+        pd.Series
+            Holdings indexed by dt and ticker.
+        """
+
+        index = pd.MultiIndex.from_arrays(
+            [self.dates[self._row_ids()], self.symbols[self.indices]],
+            names=['dt', 'ticker'])
+
+        return pd.Series(self.data, index=index)
+
+    @property
+    def nnz(self):
+        """
+        Number of stored holdings.
+        """
+
+        return len(self.data)
+
+    def portfolio_value(self):
+        """
+        Net liquidation value (holdings plus cash) on each date.
+
+        Returns
+        -------
+        pd.Series
+        """
+
+        return pd.Series(self._row_sum(self.data) + self.cash.values,
+                         index=self.dates)
+
+    def get_percent_alloc(self):
+        """
+        Sparse equivalent of pos.get_percent_alloc.
+
+        Returns
+        -------
+        SparsePositions
+            Allocations as a fraction of the portfolio value, with the
+            cash allocation as cash.
+        """
+
+        total = self._row_sum(self.data) + self.cash.values
+
+        return SparsePositions(self.dates, self.symbols, self.indptr,
+                               self.indices,
+                               self.data / total[self._row_ids()],
+                               self.cash.values / total)
+
+    def get_exposure_summary(self):
+        """
+        Sparse equivalent of pos.get_exposure_summary.
+
+        Returns
+        -------
+        exposure_summary : pd.DataFrame
+        """
+
+        from .pos import _exposure_summary_frame
+
+        is_long = self.data > 0
+        is_short = self.data < 0
+
+        return _exposure_summary_frame(
+            self.dates,
+            self._row_sum(np.where(is_long, self.data, 0)),
+            self._row_sum(np.where(is_short, self.data, 0)),
+            self.cash.values,
+            self._row_sum(is_long).astype(np.int64),
+            self._row_sum(is_short).astype(np.int64))
+
+    def _row_ids(self):
+        return np.repeat(np.arange(len(self.dates)), np.diff(self.indptr))
+
+    def _row_sum(self, values):
+        return np.bincount(self._row_ids(), weights=values,
+                           minlength=len(self.dates))
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __repr__(self):
+        return '<SparsePositions: {} dates, {} symbols, {} holdings>'.format(
+            len(self.dates), len(self.symbols), self.nnz)
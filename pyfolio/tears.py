@@ -18,20 +18,20 @@ import warnings
 from time import time
 
 import empyrical as ep
-from IPython.display import display, Markdown
 import matplotlib.gridspec as gridspec
 import matplotlib.pyplot as plt
-import pandas as pd
 
 from . import _seaborn as sns
-from . import capacity
+from . import analysis
+from . import compute
 from . import perf_attrib
 from . import plotting
 from . import pos
+from . import profiling
 from . import round_trips
-from . import timeseries
 from . import txn
 from . import utils
+from .deprecate import deprecated
 
 FACTOR_PARTITIONS = {
     'style': ['momentum', 'size', 'value', 'reversal_short_term',
@@ -43,6 +43,9 @@ FACTOR_PARTITIONS = {
 }
 
 
+@deprecated(msg='timer is deprecated and will be removed in a future '
+                'version. Use pyfolio.profiling.profile to time the '
+                'stages of a tear sheet.')
 def timer(msg_body, previous_time):
     current_time = time()
     run_time = current_time - previous_time
@@ -52,6 +55,7 @@ def timer(msg_body, previous_time):
     return current_time
 
 
+@profiling.timed
 def create_full_tear_sheet(returns,
                            positions=None,
                            transactions=None,
@@ -72,7 +76,9 @@ def create_full_tear_sheet(returns,
                            factor_loadings=None,
                            pos_in_dollars=True,
                            header_rows=None,
-                           factor_partitions=FACTOR_PARTITIONS):
+                           factor_partitions=FACTOR_PARTITIONS,
+                           analysis_context=None,
+                           compute_only=False):
     """
     Generate a number of tear sheets that are useful
     for analyzing a strategy's performance.
@@ -130,7 +136,7 @@ def create_full_tear_sheet(returns,
         If True, will not output any symbol names.
     round_trips: boolean, optional
         If True, causes the generation of a round trip tear sheet.
-    sector_mappings : dict or pd.Series, optional
+    sector_mappings : dict, pd.Series or pos.SectorMapping, optional
         Security identifier to sector mapping.
         Security ids as keys, sectors as values.
     estimate_intraday: boolean or str, optional
@@ -166,16 +172,40 @@ def create_full_tear_sheet(returns,
         dict specifying how factors should be separated in perf attrib
         factor returns and risk exposures plots
         - See create_perf_attrib_tear_sheet().
+    analysis_context : analysis.AnalysisContext, optional
+        Precomputed intermediates shared between tear sheets. Built from
+        the other arguments if not given.
+    compute_only : boolean, optional
+        If True, nothing is plotted or displayed. The tables and series
+        of the tear sheet are computed and returned instead.
+         - See compute.compute_full_tear_sheet.
     """
 
+    if compute_only:
+        return compute.compute_full_tear_sheet(
+            returns, positions=positions, transactions=transactions,
+            market_data=market_data, benchmark_rets=benchmark_rets,
+            slippage=slippage, live_start_date=live_start_date,
+            sector_mappings=sector_mappings, round_trips=round_trips,
+            estimate_intraday=estimate_intraday, bootstrap=bootstrap,
+            unadjusted_returns=unadjusted_returns,
+            turnover_denom=turnover_denom, factor_returns=factor_returns,
+            factor_loadings=factor_loadings, pos_in_dollars=pos_in_dollars,
+            analysis_context=analysis_context)
+
     if (unadjusted_returns is None) and (slippage is not None) and\
        (transactions is not None):
         unadjusted_returns = returns.copy()
         returns = txn.adjust_returns_for_slippage(returns, positions,
                                                   transactions, slippage)
 
-    positions = utils.check_intraday(estimate_intraday, returns,
-                                     positions, transactions)
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+    positions = analysis_context.positions
+
+    if sector_mappings is not None:
+        sector_mappings = pos.SectorMapping(sector_mappings)
 
     create_returns_tear_sheet(
         returns,
@@ -187,7 +217,8 @@ def create_full_tear_sheet(returns,
         bootstrap=bootstrap,
         turnover_denom=turnover_denom,
         header_rows=header_rows,
-        set_context=set_context)
+        set_context=set_context,
+        analysis_context=analysis_context)
 
     create_interesting_times_tear_sheet(returns,
                                         benchmark_rets=benchmark_rets,
@@ -198,35 +229,41 @@ def create_full_tear_sheet(returns,
                                    hide_positions=hide_positions,
                                    set_context=set_context,
                                    sector_mappings=sector_mappings,
-                                   estimate_intraday=False)
+                                   estimate_intraday=False,
+                                   analysis_context=analysis_context)
 
         if transactions is not None:
             create_txn_tear_sheet(returns, positions, transactions,
                                   unadjusted_returns=unadjusted_returns,
                                   estimate_intraday=False,
-                                  set_context=set_context)
+                                  set_context=set_context,
+                                  analysis_context=analysis_context)
             if round_trips:
                 create_round_trip_tear_sheet(
                     returns=returns,
                     positions=positions,
                     transactions=transactions,
                     sector_mappings=sector_mappings,
-                    estimate_intraday=False)
+                    estimate_intraday=False,
+                    analysis_context=analysis_context)
 
             if market_data is not None:
                 create_capacity_tear_sheet(returns, positions, transactions,
                                            market_data,
                                            liquidation_daily_vol_limit=0.2,
                                            last_n_days=125,
-                                           estimate_intraday=False)
+                                           estimate_intraday=False,
+                                           analysis_context=analysis_context)
 
         if factor_returns is not None and factor_loadings is not None:
             create_perf_attrib_tear_sheet(returns, positions, factor_returns,
                                           factor_loadings, transactions,
                                           pos_in_dollars=pos_in_dollars,
-                                          factor_partitions=factor_partitions)
+                                          factor_partitions=factor_partitions,
+                                          analysis_context=analysis_context)
 
 
+@profiling.timed
 @plotting.customize
 def create_simple_tear_sheet(returns,
                              positions=None,
@@ -236,7 +273,9 @@ def create_simple_tear_sheet(returns,
                              estimate_intraday='infer',
                              live_start_date=None,
                              turnover_denom='AGB',
-                             header_rows=None):
+                             header_rows=None,
+                             analysis_context=None,
+                             compute_only=False):
     """
     Simpler version of create_full_tear_sheet; generates summary performance
     statistics and important plots as a single image.
@@ -299,14 +338,39 @@ def create_simple_tear_sheet(returns,
         Extra rows to display at the top of the perf stats table.
     set_context : boolean, optional
         If True, set default plotting style context.
+    analysis_context : analysis.AnalysisContext, optional
+        Precomputed intermediates shared between tear sheets. Built from
+        the other arguments if not given.
+    compute_only : boolean, optional
+        If True, nothing is plotted or displayed. The tables and series
+        of the tear sheet are computed and returned instead.
+         - See compute.compute_simple_tear_sheet.
     """
 
-    positions = utils.check_intraday(estimate_intraday, returns,
-                                     positions, transactions)
+    if compute_only:
+        return compute.compute_simple_tear_sheet(
+            returns, positions=positions, transactions=transactions,
+            benchmark_rets=benchmark_rets, slippage=slippage,
+            estimate_intraday=estimate_intraday,
+            live_start_date=live_start_date, turnover_denom=turnover_denom,
+            analysis_context=analysis_context)
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+    positions = analysis_context.positions
 
     if (slippage is not None) and (transactions is not None):
-        returns = txn.adjust_returns_for_slippage(returns, positions,
-                                                  transactions, slippage)
+        returns = txn.adjust_returns_for_slippage(
+            returns, positions, transactions, slippage,
+            txn_vol=analysis_context.txn_vol)
+        analysis_context = analysis_context.with_returns(returns)
+
+    result = compute.compute_simple_tear_sheet(
+        returns, positions=positions, transactions=transactions,
+        benchmark_rets=benchmark_rets, estimate_intraday=estimate_intraday,
+        live_start_date=live_start_date, turnover_denom=turnover_denom,
+        analysis_context=analysis_context)
 
     always_sections = 4
     positions_sections = 4 if positions is not None else 0
@@ -331,73 +395,87 @@ def create_simple_tear_sheet(returns,
                              transactions=transactions,
                              turnover_denom=turnover_denom,
                              live_start_date=live_start_date,
-                             header_rows=header_rows)
+                             header_rows=header_rows,
+                             perf_stats=result.perf_stats)
 
-    fig = plt.figure(figsize=(14, vertical_sections * 6))
+    fig = utils.new_figure(figsize=(14, vertical_sections * 6))
     gs = gridspec.GridSpec(vertical_sections, 3, wspace=0.5, hspace=0.5)
 
-    ax_rolling_returns = plt.subplot(gs[:2, :])
+    ax_rolling_returns = fig.add_subplot(gs[:2, :])
     i = 2
     if benchmark_rets is not None:
-        ax_rolling_beta = plt.subplot(gs[i, :], sharex=ax_rolling_returns)
+        ax_rolling_beta = fig.add_subplot(gs[i, :], sharex=ax_rolling_returns)
         i += 1
-    ax_rolling_sharpe = plt.subplot(gs[i, :], sharex=ax_rolling_returns)
+    ax_rolling_sharpe = fig.add_subplot(gs[i, :], sharex=ax_rolling_returns)
     i += 1
-    ax_underwater = plt.subplot(gs[i, :], sharex=ax_rolling_returns)
+    ax_underwater = fig.add_subplot(gs[i, :], sharex=ax_rolling_returns)
     i += 1
 
     plotting.plot_rolling_returns(returns,
                                   factor_returns=benchmark_rets,
                                   live_start_date=live_start_date,
                                   cone_std=(1.0, 1.5, 2.0),
-                                  ax=ax_rolling_returns)
+                                  ax=ax_rolling_returns,
+                                  analysis_context=analysis_context)
     ax_rolling_returns.set_title('Cumulative returns')
 
     if benchmark_rets is not None:
-        plotting.plot_rolling_beta(returns, benchmark_rets, ax=ax_rolling_beta)
+        plotting.plot_rolling_beta(returns, benchmark_rets, ax=ax_rolling_beta,
+                                   rolling_beta=result.rolling_beta)
 
-    plotting.plot_rolling_sharpe(returns, ax=ax_rolling_sharpe)
+    plotting.plot_rolling_sharpe(returns, ax=ax_rolling_sharpe,
+                                 rolling_sharpe=result.rolling_sharpe)
 
-    plotting.plot_drawdown_underwater(returns, ax=ax_underwater)
+    plotting.plot_drawdown_underwater(returns, ax=ax_underwater,
+                                      analysis_context=analysis_context)
 
     if positions is not None:
         # Plot simple positions tear sheet
-        ax_exposures = plt.subplot(gs[i, :])
+        ax_exposures = fig.add_subplot(gs[i, :])
         i += 1
-        ax_top_positions = plt.subplot(gs[i, :], sharex=ax_exposures)
+        ax_top_positions = fig.add_subplot(gs[i, :], sharex=ax_exposures)
         i += 1
-        ax_holdings = plt.subplot(gs[i, :], sharex=ax_exposures)
+        ax_holdings = fig.add_subplot(gs[i, :], sharex=ax_exposures)
         i += 1
-        ax_long_short_holdings = plt.subplot(gs[i, :])
+        ax_long_short_holdings = fig.add_subplot(gs[i, :])
         i += 1
 
-        positions_alloc = pos.get_percent_alloc(positions)
+        positions_alloc = analysis_context.positions_alloc
+        exposure_summary = analysis_context.exposure_summary
 
-        plotting.plot_exposures(returns, positions, ax=ax_exposures)
+        plotting.plot_exposures(returns, positions, ax=ax_exposures,
+                                exposure_summary=exposure_summary)
 
-        plotting.show_and_plot_top_positions(returns,
-                                             positions_alloc,
-                                             show_and_plot=0,
-                                             hide_positions=False,
-                                             ax=ax_top_positions)
+        plotting.show_and_plot_top_positions(
+            returns,
+            positions_alloc,
+            show_and_plot=0,
+            hide_positions=False,
+            ax=ax_top_positions,
+            top_positions=(result.top_long_positions,
+                           result.top_short_positions,
+                           result.top_positions))
 
-        plotting.plot_holdings(returns, positions_alloc, ax=ax_holdings)
+        plotting.plot_holdings(returns, positions_alloc, ax=ax_holdings,
+                               exposure_summary=exposure_summary)
 
         plotting.plot_long_short_holdings(returns, positions_alloc,
-                                          ax=ax_long_short_holdings)
+                                          ax=ax_long_short_holdings,
+                                          exposure_summary=exposure_summary)
 
         if transactions is not None:
             # Plot simple transactions tear sheet
-            ax_turnover = plt.subplot(gs[i, :])
+            ax_turnover = fig.add_subplot(gs[i, :])
             i += 1
-            ax_txn_timings = plt.subplot(gs[i, :])
+            ax_txn_timings = fig.add_subplot(gs[i, :])
             i += 1
 
             plotting.plot_turnover(returns,
                                    transactions,
                                    positions,
                                    turnover_denom=turnover_denom,
-                                   ax=ax_turnover)
+                                   ax=ax_turnover,
+                                   analysis_context=analysis_context)
 
             plotting.plot_txn_time_hist(transactions, ax=ax_txn_timings)
 
@@ -405,6 +483,7 @@ def create_simple_tear_sheet(returns,
         plt.setp(ax.get_xticklabels(), visible=True)
 
 
+@profiling.timed
 @plotting.customize
 def create_returns_tear_sheet(returns, positions=None,
                               transactions=None,
@@ -414,7 +493,9 @@ def create_returns_tear_sheet(returns, positions=None,
                               bootstrap=False,
                               turnover_denom='AGB',
                               header_rows=None,
-                              return_fig=False):
+                              return_fig=False,
+                              analysis_context=None,
+                              compute_only=False):
     """
     Generate a number of plots for analyzing a strategy's returns.
 
@@ -458,20 +539,42 @@ def create_returns_tear_sheet(returns, positions=None,
         Extra rows to display at the top of the perf stats table.
     return_fig : boolean, optional
         If True, returns the figure that was plotted on.
+    analysis_context : analysis.AnalysisContext, optional
+        Precomputed intermediates shared between tear sheets. Built from
+        the other arguments if not given.
+    compute_only : boolean, optional
+        If True, nothing is plotted or displayed. The tables and series
+        of the tear sheet are computed and returned instead.
+         - See compute.compute_returns_tear_sheet.
     """
 
+    if compute_only:
+        return compute.compute_returns_tear_sheet(
+            returns, positions=positions, transactions=transactions,
+            live_start_date=live_start_date, benchmark_rets=benchmark_rets,
+            bootstrap=bootstrap, turnover_denom=turnover_denom,
+            analysis_context=analysis_context)
+
     if benchmark_rets is not None:
         returns = utils.clip_returns_to_benchmark(returns, benchmark_rets)
 
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=False)
+
+    result = compute.compute_returns_tear_sheet(
+        returns, positions=positions, transactions=transactions,
+        live_start_date=live_start_date, benchmark_rets=benchmark_rets,
+        bootstrap=bootstrap, turnover_denom=turnover_denom,
+        analysis_context=analysis_context)
+
     plotting.show_perf_stats(returns, benchmark_rets,
-                             positions=positions,
-                             transactions=transactions,
-                             turnover_denom=turnover_denom,
-                             bootstrap=bootstrap,
                              live_start_date=live_start_date,
-                             header_rows=header_rows)
+                             header_rows=header_rows,
+                             perf_stats=result.perf_stats)
 
-    plotting.show_worst_drawdown_periods(returns)
+    plotting.show_worst_drawdown_periods(returns,
+                                         drawdowns=result.drawdowns)
 
     vertical_sections = 11
 
@@ -485,36 +588,37 @@ def create_returns_tear_sheet(returns, positions=None,
     if bootstrap:
         vertical_sections += 1
 
-    fig = plt.figure(figsize=(14, vertical_sections * 6))
+    fig = utils.new_figure(figsize=(14, vertical_sections * 6))
     gs = gridspec.GridSpec(vertical_sections, 3, wspace=0.5, hspace=0.5)
-    ax_rolling_returns = plt.subplot(gs[:2, :])
+    ax_rolling_returns = fig.add_subplot(gs[:2, :])
 
     i = 2
-    ax_rolling_returns_vol_match = plt.subplot(gs[i, :],
-                                               sharex=ax_rolling_returns)
+    ax_rolling_returns_vol_match = fig.add_subplot(gs[i, :],
+                                                   sharex=ax_rolling_returns)
     i += 1
-    ax_rolling_returns_log = plt.subplot(gs[i, :],
-                                         sharex=ax_rolling_returns)
+    ax_rolling_returns_log = fig.add_subplot(gs[i, :],
+                                             sharex=ax_rolling_returns)
     i += 1
-    ax_returns = plt.subplot(gs[i, :],
-                             sharex=ax_rolling_returns)
+    ax_returns = fig.add_subplot(gs[i, :],
+                                 sharex=ax_rolling_returns)
     i += 1
     if benchmark_rets is not None:
-        ax_rolling_beta = plt.subplot(gs[i, :], sharex=ax_rolling_returns)
+        ax_rolling_beta = fig.add_subplot(gs[i, :], sharex=ax_rolling_returns)
         i += 1
-    ax_rolling_volatility = plt.subplot(gs[i, :], sharex=ax_rolling_returns)
+    ax_rolling_volatility = fig.add_subplot(gs[i, :],
+                                            sharex=ax_rolling_returns)
     i += 1
-    ax_rolling_sharpe = plt.subplot(gs[i, :], sharex=ax_rolling_returns)
+    ax_rolling_sharpe = fig.add_subplot(gs[i, :], sharex=ax_rolling_returns)
     i += 1
-    ax_drawdown = plt.subplot(gs[i, :], sharex=ax_rolling_returns)
+    ax_drawdown = fig.add_subplot(gs[i, :], sharex=ax_rolling_returns)
     i += 1
-    ax_underwater = plt.subplot(gs[i, :], sharex=ax_rolling_returns)
+    ax_underwater = fig.add_subplot(gs[i, :], sharex=ax_rolling_returns)
     i += 1
-    ax_monthly_heatmap = plt.subplot(gs[i, 0])
-    ax_annual_returns = plt.subplot(gs[i, 1])
-    ax_monthly_dist = plt.subplot(gs[i, 2])
+    ax_monthly_heatmap = fig.add_subplot(gs[i, 0])
+    ax_annual_returns = fig.add_subplot(gs[i, 1])
+    ax_monthly_dist = fig.add_subplot(gs[i, 2])
     i += 1
-    ax_return_quantiles = plt.subplot(gs[i, :])
+    ax_return_quantiles = fig.add_subplot(gs[i, :])
     i += 1
 
     plotting.plot_rolling_returns(
@@ -522,7 +626,8 @@ def create_returns_tear_sheet(returns, positions=None,
         factor_returns=benchmark_rets,
         live_start_date=live_start_date,
         cone_std=cone_std,
-        ax=ax_rolling_returns)
+        ax=ax_rolling_returns,
+        analysis_context=analysis_context)
     ax_rolling_returns.set_title(
         'Cumulative returns')
 
@@ -543,7 +648,8 @@ def create_returns_tear_sheet(returns, positions=None,
         logy=True,
         live_start_date=live_start_date,
         cone_std=cone_std,
-        ax=ax_rolling_returns_log)
+        ax=ax_rolling_returns_log,
+        analysis_context=analysis_context)
     ax_rolling_returns_log.set_title(
         'Cumulative returns on logarithmic scale')
 
@@ -557,20 +663,22 @@ def create_returns_tear_sheet(returns, positions=None,
 
     if benchmark_rets is not None:
         plotting.plot_rolling_beta(
-            returns, benchmark_rets, ax=ax_rolling_beta)
+            returns, benchmark_rets, ax=ax_rolling_beta,
+            rolling_beta=result.rolling_beta)
 
     plotting.plot_rolling_volatility(
-        returns, factor_returns=benchmark_rets, ax=ax_rolling_volatility)
+        returns, factor_returns=benchmark_rets, ax=ax_rolling_volatility,
+        rolling_volatility=result.rolling_volatility)
 
     plotting.plot_rolling_sharpe(
-        returns, ax=ax_rolling_sharpe)
+        returns, ax=ax_rolling_sharpe, rolling_sharpe=result.rolling_sharpe)
 
     # Drawdowns
     plotting.plot_drawdown_periods(
-        returns, top=5, ax=ax_drawdown)
+        returns, top=5, ax=ax_drawdown, analysis_context=analysis_context)
 
     plotting.plot_drawdown_underwater(
-        returns=returns, ax=ax_underwater)
+        returns=returns, ax=ax_underwater, analysis_context=analysis_context)
 
     plotting.plot_monthly_returns_heatmap(returns, ax=ax_monthly_heatmap)
     plotting.plot_annual_returns(returns, ax=ax_annual_returns)
@@ -581,12 +689,10 @@ def create_returns_tear_sheet(returns, positions=None,
         live_start_date=live_start_date,
         ax=ax_return_quantiles)
 
-    if bootstrap and (benchmark_rets is not None):
-        ax_bootstrap = plt.subplot(gs[i, :])
+    if bootstrap:
+        ax_bootstrap = fig.add_subplot(gs[i, :])
         plotting.plot_perf_stats(returns, benchmark_rets,
                                  ax=ax_bootstrap)
-    elif bootstrap:
-        raise ValueError('bootstrap requires passing of benchmark_rets.')
 
     for ax in fig.axes:
         plt.setp(ax.get_xticklabels(), visible=True)
@@ -595,11 +701,14 @@ def create_returns_tear_sheet(returns, positions=None,
         return fig
 
 
+@profiling.timed
 @plotting.customize
 def create_position_tear_sheet(returns, positions,
                                show_and_plot_top_pos=2, hide_positions=False,
                                sector_mappings=None, transactions=None,
-                               estimate_intraday='infer', return_fig=False):
+                               estimate_intraday='infer', return_fig=False,
+                               analysis_context=None,
+                               compute_only=False):
     """
     Generate a number of plots for analyzing a
     strategy's positions and holdings.
@@ -622,7 +731,7 @@ def create_position_tear_sheet(returns, positions,
     hide_positions : bool, optional
         If True, will not output any symbol names.
         Overrides show_and_plot_top_pos to 0 to suppress text output.
-    sector_mappings : dict or pd.Series, optional
+    sector_mappings : dict, pd.Series or pos.SectorMapping, optional
         Security identifier to sector mapping.
         Security ids as keys, sectors as values.
     transactions : pd.DataFrame, optional
@@ -633,55 +742,78 @@ def create_position_tear_sheet(returns, positions,
         See description in create_full_tear_sheet.
     return_fig : boolean, optional
         If True, returns the figure that was plotted on.
+    analysis_context : analysis.AnalysisContext, optional
+        Precomputed intermediates shared between tear sheets. Built from
+        the other arguments if not given.
+    compute_only : boolean, optional
+        If True, nothing is plotted or displayed. The tables and series
+        of the tear sheet are computed and returned instead.
+         - See compute.compute_position_tear_sheet.
     """
 
-    positions = utils.check_intraday(estimate_intraday, returns,
-                                     positions, transactions)
+    if compute_only:
+        return compute.compute_position_tear_sheet(
+            returns, positions, sector_mappings=sector_mappings,
+            transactions=transactions, estimate_intraday=estimate_intraday,
+            analysis_context=analysis_context)
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+    positions = analysis_context.positions
+
+    result = compute.compute_position_tear_sheet(
+        returns, positions, sector_mappings=sector_mappings,
+        transactions=transactions, analysis_context=analysis_context)
 
     if hide_positions:
         show_and_plot_top_pos = 0
     vertical_sections = 7 if sector_mappings is not None else 6
 
-    fig = plt.figure(figsize=(14, vertical_sections * 6))
+    fig = utils.new_figure(figsize=(14, vertical_sections * 6))
     gs = gridspec.GridSpec(vertical_sections, 3, wspace=0.5, hspace=0.5)
-    ax_exposures = plt.subplot(gs[0, :])
-    ax_top_positions = plt.subplot(gs[1, :], sharex=ax_exposures)
-    ax_max_median_pos = plt.subplot(gs[2, :], sharex=ax_exposures)
-    ax_holdings = plt.subplot(gs[3, :], sharex=ax_exposures)
-    ax_long_short_holdings = plt.subplot(gs[4, :])
-    ax_gross_leverage = plt.subplot(gs[5, :], sharex=ax_exposures)
+    ax_exposures = fig.add_subplot(gs[0, :])
+    ax_top_positions = fig.add_subplot(gs[1, :], sharex=ax_exposures)
+    ax_max_median_pos = fig.add_subplot(gs[2, :], sharex=ax_exposures)
+    ax_holdings = fig.add_subplot(gs[3, :], sharex=ax_exposures)
+    ax_long_short_holdings = fig.add_subplot(gs[4, :])
+    ax_gross_leverage = fig.add_subplot(gs[5, :], sharex=ax_exposures)
 
-    positions_alloc = pos.get_percent_alloc(positions)
+    positions_alloc = analysis_context.positions_alloc
+    exposure_summary = analysis_context.exposure_summary
 
-    plotting.plot_exposures(returns, positions, ax=ax_exposures)
+    plotting.plot_exposures(returns, positions, ax=ax_exposures,
+                            exposure_summary=exposure_summary)
 
     plotting.show_and_plot_top_positions(
         returns,
         positions_alloc,
         show_and_plot=show_and_plot_top_pos,
         hide_positions=hide_positions,
-        ax=ax_top_positions)
+        ax=ax_top_positions,
+        top_positions=(result.top_long_positions,
+                       result.top_short_positions,
+                       result.top_positions))
 
-    plotting.plot_max_median_position_concentration(positions,
-                                                    ax=ax_max_median_pos)
+    plotting.plot_max_median_position_concentration(
+        positions, ax=ax_max_median_pos,
+        position_concentration=result.position_concentration)
 
-    plotting.plot_holdings(returns, positions_alloc, ax=ax_holdings)
+    plotting.plot_holdings(returns, positions_alloc, ax=ax_holdings,
+                           exposure_summary=exposure_summary)
 
     plotting.plot_long_short_holdings(returns, positions_alloc,
-                                      ax=ax_long_short_holdings)
+                                      ax=ax_long_short_holdings,
+                                      exposure_summary=exposure_summary)
 
     plotting.plot_gross_leverage(returns, positions,
-                                 ax=ax_gross_leverage)
+                                 ax=ax_gross_leverage,
+                                 exposure_summary=exposure_summary)
 
-    if sector_mappings is not None:
-        sector_exposures = pos.get_sector_exposures(positions,
-                                                    sector_mappings)
-        if len(sector_exposures.columns) > 1:
-            sector_alloc = pos.get_percent_alloc(sector_exposures)
-            sector_alloc = sector_alloc.drop('cash', axis='columns')
-            ax_sector_alloc = plt.subplot(gs[6, :], sharex=ax_exposures)
-            plotting.plot_sector_allocations(returns, sector_alloc,
-                                             ax=ax_sector_alloc)
+    if 'sector_allocations' in result:
+        ax_sector_alloc = fig.add_subplot(gs[6, :], sharex=ax_exposures)
+        plotting.plot_sector_allocations(returns, result.sector_allocations,
+                                         ax=ax_sector_alloc)
 
     for ax in fig.axes:
         plt.setp(ax.get_xticklabels(), visible=True)
@@ -690,10 +822,13 @@ def create_position_tear_sheet(returns, positions,
         return fig
 
 
+@profiling.timed
 @plotting.customize
 def create_txn_tear_sheet(returns, positions, transactions,
                           turnover_denom='AGB', unadjusted_returns=None,
-                          estimate_intraday='infer', return_fig=False):
+                          estimate_intraday='infer', return_fig=False,
+                          analysis_context=None,
+                          compute_only=False):
     """
     Generate a number of plots for analyzing a strategy's transactions.
 
@@ -723,52 +858,78 @@ def create_txn_tear_sheet(returns, positions, transactions,
         See description in create_full_tear_sheet.
     return_fig : boolean, optional
         If True, returns the figure that was plotted on.
+    analysis_context : analysis.AnalysisContext, optional
+        Precomputed intermediates shared between tear sheets. Built from
+        the other arguments if not given.
+    compute_only : boolean, optional
+        If True, nothing is plotted or displayed. The tables and series
+        of the tear sheet are computed and returned instead.
+         - See compute.compute_txn_tear_sheet.
     """
 
-    positions = utils.check_intraday(estimate_intraday, returns,
-                                     positions, transactions)
+    if compute_only:
+        return compute.compute_txn_tear_sheet(
+            returns, positions, transactions, turnover_denom=turnover_denom,
+            unadjusted_returns=unadjusted_returns,
+            estimate_intraday=estimate_intraday,
+            analysis_context=analysis_context)
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+    positions = analysis_context.positions
+
+    result = compute.compute_txn_tear_sheet(
+        returns, positions, transactions, turnover_denom=turnover_denom,
+        unadjusted_returns=unadjusted_returns,
+        analysis_context=analysis_context)
 
     vertical_sections = 6 if unadjusted_returns is not None else 4
 
-    fig = plt.figure(figsize=(14, vertical_sections * 6))
+    fig = utils.new_figure(figsize=(14, vertical_sections * 6))
     gs = gridspec.GridSpec(vertical_sections, 3, wspace=0.5, hspace=0.5)
-    ax_turnover = plt.subplot(gs[0, :])
-    ax_daily_volume = plt.subplot(gs[1, :], sharex=ax_turnover)
-    ax_turnover_hist = plt.subplot(gs[2, :])
-    ax_txn_timings = plt.subplot(gs[3, :])
+    ax_turnover = fig.add_subplot(gs[0, :])
+    ax_daily_volume = fig.add_subplot(gs[1, :], sharex=ax_turnover)
+    ax_turnover_hist = fig.add_subplot(gs[2, :])
+    ax_txn_timings = fig.add_subplot(gs[3, :])
 
     plotting.plot_turnover(
         returns,
         transactions,
         positions,
         turnover_denom=turnover_denom,
-        ax=ax_turnover)
+        ax=ax_turnover,
+        analysis_context=analysis_context)
 
-    plotting.plot_daily_volume(returns, transactions, ax=ax_daily_volume)
+    plotting.plot_daily_volume(returns, transactions, ax=ax_daily_volume,
+                               analysis_context=analysis_context)
 
     try:
         plotting.plot_daily_turnover_hist(transactions,
                                           positions,
                                           turnover_denom=turnover_denom,
-                                          ax=ax_turnover_hist)
+                                          ax=ax_turnover_hist,
+                                          analysis_context=analysis_context)
     except ValueError:
         warnings.warn('Unable to generate turnover plot.', UserWarning)
 
     plotting.plot_txn_time_hist(transactions, ax=ax_txn_timings)
 
     if unadjusted_returns is not None:
-        ax_slippage_sweep = plt.subplot(gs[4, :])
+        ax_slippage_sweep = fig.add_subplot(gs[4, :])
         plotting.plot_slippage_sweep(unadjusted_returns,
                                      positions,
                                      transactions,
-                                     ax=ax_slippage_sweep
+                                     ax=ax_slippage_sweep,
+                                     slippage_sweep=result.slippage_sweep
                                      )
-        ax_slippage_sensitivity = plt.subplot(gs[5, :])
-        plotting.plot_slippage_sensitivity(unadjusted_returns,
-                                           positions,
-                                           transactions,
-                                           ax=ax_slippage_sensitivity
-                                           )
+        ax_slippage_sensitivity = fig.add_subplot(gs[5, :])
+        plotting.plot_slippage_sensitivity(
+            unadjusted_returns,
+            positions,
+            transactions,
+            ax=ax_slippage_sensitivity,
+            slippage_sensitivity=result.slippage_sensitivity)
     for ax in fig.axes:
         plt.setp(ax.get_xticklabels(), visible=True)
 
@@ -776,10 +937,13 @@ def create_txn_tear_sheet(returns, positions, transactions,
         return fig
 
 
+@profiling.timed
 @plotting.customize
 def create_round_trip_tear_sheet(returns, positions, transactions,
                                  sector_mappings=None,
-                                 estimate_intraday='infer', return_fig=False):
+                                 estimate_intraday='infer', return_fig=False,
+                                 analysis_context=None,
+                                 compute_only=False):
     """
     Generate a number of figures and plots describing the duration,
     frequency, and profitability of trade "round trips."
@@ -798,7 +962,7 @@ def create_round_trip_tear_sheet(returns, positions, transactions,
     transactions : pd.DataFrame
         Prices and amounts of executed trades. One row per trade.
          - See full explanation in create_full_tear_sheet.
-    sector_mappings : dict or pd.Series, optional
+    sector_mappings : dict, pd.Series or pos.SectorMapping, optional
         Security identifier to sector mapping.
         Security ids as keys, sectors as values.
     estimate_intraday: boolean or str, optional
@@ -806,43 +970,46 @@ def create_round_trip_tear_sheet(returns, positions, transactions,
         See description in create_full_tear_sheet.
     return_fig : boolean, optional
         If True, returns the figure that was plotted on.
+    analysis_context : analysis.AnalysisContext, optional
+        Precomputed intermediates shared between tear sheets. Built from
+        the other arguments if not given.
+    compute_only : boolean, optional
+        If True, nothing is plotted or displayed. The tables and series
+        of the tear sheet are computed and returned instead.
+         - See compute.compute_round_trip_tear_sheet.
     """
 
-    positions = utils.check_intraday(estimate_intraday, returns,
-                                     positions, transactions)
-
-    transactions_closed = round_trips.add_closing_transactions(positions,
-                                                               transactions)
-    # extract_round_trips requires BoD portfolio_value
-    trades = round_trips.extract_round_trips(
-        transactions_closed,
-        portfolio_value=positions.sum(axis='columns') / (1 + returns)
-    )
+    result = compute.compute_round_trip_tear_sheet(
+        returns, positions, transactions,
+        sector_mappings=sector_mappings,
+        estimate_intraday=estimate_intraday,
+        analysis_context=analysis_context)
+    if compute_only or result is None:
+        return result
 
-    if len(trades) < 5:
-        warnings.warn(
-            """Fewer than 5 round-trip trades made.
-               Skipping round trip tearsheet.""", UserWarning)
-        return
+    trades = result.round_trips
 
-    round_trips.print_round_trip_stats(trades)
+    round_trips.print_round_trip_stats(
+        trades,
+        stats=dict((name, result[name]) for name in
+                   ('summary', 'pnl', 'duration', 'returns', 'symbols')))
 
-    plotting.show_profit_attribution(trades)
+    plotting.show_profit_attribution(
+        trades, profit_attribution=result.profit_attribution)
 
-    if sector_mappings is not None:
-        sector_trades = round_trips.apply_sector_mappings_to_round_trips(
-            trades, sector_mappings)
-        plotting.show_profit_attribution(sector_trades)
+    if 'sector_profit_attribution' in result:
+        plotting.show_profit_attribution(
+            trades, profit_attribution=result.sector_profit_attribution)
 
-    fig = plt.figure(figsize=(14, 3 * 6))
+    fig = utils.new_figure(figsize=(14, 3 * 6))
 
     gs = gridspec.GridSpec(3, 2, wspace=0.5, hspace=0.5)
 
-    ax_trade_lifetimes = plt.subplot(gs[0, :])
-    ax_prob_profit_trade = plt.subplot(gs[1, 0])
-    ax_holding_time = plt.subplot(gs[1, 1])
-    ax_pnl_per_round_trip_dollars = plt.subplot(gs[2, 0])
-    ax_pnl_per_round_trip_pct = plt.subplot(gs[2, 1])
+    ax_trade_lifetimes = fig.add_subplot(gs[0, :])
+    ax_prob_profit_trade = fig.add_subplot(gs[1, 0])
+    ax_holding_time = fig.add_subplot(gs[1, 1])
+    ax_pnl_per_round_trip_dollars = fig.add_subplot(gs[2, 0])
+    ax_pnl_per_round_trip_pct = fig.add_subplot(gs[2, 1])
 
     plotting.plot_round_trip_lifetimes(trades, ax=ax_trade_lifetimes)
 
@@ -866,10 +1033,12 @@ def create_round_trip_tear_sheet(returns, positions, transactions,
         return fig
 
 
+@profiling.timed
 @plotting.customize
 def create_interesting_times_tear_sheet(returns, benchmark_rets=None,
                                         periods=None, legend_loc='best',
-                                        return_fig=False):
+                                        return_fig=False,
+                                        compute_only=False):
     """
     Generate a number of returns plots around interesting points in time,
     like the flash crash and 9/11.
@@ -897,43 +1066,36 @@ def create_interesting_times_tear_sheet(returns, benchmark_rets=None,
          The legend's location.
     return_fig : boolean, optional
         If True, returns the figure that was plotted on.
+    compute_only : boolean, optional
+        If True, nothing is plotted or displayed. The tables and series
+        of the tear sheet are computed and returned instead.
+         - See compute.compute_interesting_times_tear_sheet.
     """
 
-    rets_interesting = timeseries.extract_interesting_date_ranges(
-        returns, periods)
+    result = compute.compute_interesting_times_tear_sheet(
+        returns, benchmark_rets=benchmark_rets, periods=periods)
+    if compute_only or result is None:
+        return result
 
-    if not rets_interesting:
-        warnings.warn('Passed returns do not overlap with any'
-                      'interesting times.', UserWarning)
-        return
-
-    utils.print_table(pd.DataFrame(rets_interesting)
-                      .describe().transpose()
-                      .loc[:, ['mean', 'min', 'max']] * 100,
+    utils.print_table(result.stress_events * 100,
                       name='Stress Events',
                       float_format='{0:.2f}%'.format)
 
-    if benchmark_rets is not None:
-        returns = utils.clip_returns_to_benchmark(returns, benchmark_rets)
-
-        bmark_interesting = timeseries.extract_interesting_date_ranges(
-            benchmark_rets, periods)
-
-    num_plots = len(rets_interesting)
+    num_plots = len(result.cum_returns)
     # 2 plots, 1 row; 3 plots, 2 rows; 4 plots, 2 rows; etc.
     num_rows = int((num_plots + 1) / 2.0)
-    fig = plt.figure(figsize=(14, num_rows * 6.0))
+    fig = utils.new_figure(figsize=(14, num_rows * 6.0))
     gs = gridspec.GridSpec(num_rows, 2, wspace=0.5, hspace=0.5)
 
-    for i, (name, rets_period) in enumerate(rets_interesting.items()):
+    for i, (name, cum_returns) in enumerate(result.cum_returns.items()):
         # i=0 -> 0, i=1 -> 0, i=2 -> 1 ;; i=0 -> 0, i=1 -> 1, i=2 -> 0
-        ax = plt.subplot(gs[int(i / 2.0), i % 2])
+        ax = fig.add_subplot(gs[int(i / 2.0), i % 2])
 
-        ep.cum_returns(rets_period).plot(
+        cum_returns.plot(
             ax=ax, color='forestgreen', label='algo', alpha=0.7, lw=2)
 
         if benchmark_rets is not None:
-            ep.cum_returns(bmark_interesting[name]).plot(
+            result.benchmark_cum_returns[name].plot(
                 ax=ax, color='gray', label='benchmark', alpha=0.6)
             ax.legend(['Algo',
                        'benchmark'],
@@ -950,6 +1112,7 @@ def create_interesting_times_tear_sheet(returns, benchmark_rets=None,
         return fig
 
 
+@profiling.timed
 @plotting.customize
 def create_capacity_tear_sheet(returns, positions, transactions,
                                market_data,
@@ -958,7 +1121,10 @@ def create_capacity_tear_sheet(returns, positions, transactions,
                                last_n_days=utils.APPROX_BDAYS_PER_MONTH * 6,
                                days_to_liquidate_limit=1,
                                estimate_intraday='infer',
-                               return_fig=False):
+                               intraday_bars=False,
+                               return_fig=False,
+                               analysis_context=None,
+                               compute_only=False):
     """
     Generates a report detailing portfolio size constraints set by
     least liquid tickers. Plots a "capacity sweep," a curve describing
@@ -995,12 +1161,46 @@ def create_capacity_tear_sheet(returns, positions, transactions,
     estimate_intraday: boolean or str, optional
         Approximate returns for intraday strategies.
         See description in create_full_tear_sheet.
+    intraday_bars : boolean, optional
+        If True, market_data contains intraday (e.g. minute) bars. Fills
+        are matched to the bars they executed in for the capacity sweep,
+        and the bars are aggregated to daily bars for the liquidation
+        and bar consumption tables.
     return_fig : boolean, optional
         If True, returns the figure that was plotted on.
+    analysis_context : analysis.AnalysisContext, optional
+        Precomputed intermediates shared between tear sheets. Built from
+        the other arguments if not given.
+    compute_only : boolean, optional
+        If True, nothing is plotted or displayed. The tables and series
+        of the tear sheet are computed and returned instead.
+         - See compute.compute_capacity_tear_sheet.
     """
 
-    positions = utils.check_intraday(estimate_intraday, returns,
-                                     positions, transactions)
+    if compute_only:
+        return compute.compute_capacity_tear_sheet(
+            returns, positions, transactions, market_data,
+            liquidation_daily_vol_limit=liquidation_daily_vol_limit,
+            trade_daily_vol_limit=trade_daily_vol_limit,
+            last_n_days=last_n_days,
+            days_to_liquidate_limit=days_to_liquidate_limit,
+            estimate_intraday=estimate_intraday,
+            intraday_bars=intraday_bars,
+            analysis_context=analysis_context)
+
+    analysis_context = analysis.get_analysis_context(
+        analysis_context, returns, positions, transactions,
+        estimate_intraday=estimate_intraday)
+    positions = analysis_context.positions
+
+    result = compute.compute_capacity_tear_sheet(
+        returns, positions, transactions, market_data,
+        liquidation_daily_vol_limit=liquidation_daily_vol_limit,
+        trade_daily_vol_limit=trade_daily_vol_limit,
+        last_n_days=last_n_days,
+        days_to_liquidate_limit=days_to_liquidate_limit,
+        intraday_bars=intraday_bars,
+        analysis_context=analysis_context)
 
     print("Max days to liquidation is computed for each traded name "
           "assuming a 20% limit on daily bar consumption \n"
@@ -1008,60 +1208,39 @@ def create_capacity_tear_sheet(returns, positions, transactions,
           "Tickers with >1 day liquidation time at a"
           " constant $1m capital base:")
 
-    max_days_by_ticker = capacity.get_max_days_to_liquidate_by_ticker(
-        positions, market_data,
-        max_bar_consumption=liquidation_daily_vol_limit,
-        capital_base=1e6,
-        mean_volume_window=5)
-    max_days_by_ticker.index = (
-        max_days_by_ticker.index.map(utils.format_asset))
-
     print("Whole backtest:")
     utils.print_table(
-        max_days_by_ticker[max_days_by_ticker.days_to_liquidate >
-                           days_to_liquidate_limit])
-
-    max_days_by_ticker_lnd = capacity.get_max_days_to_liquidate_by_ticker(
-        positions, market_data,
-        max_bar_consumption=liquidation_daily_vol_limit,
-        capital_base=1e6,
-        mean_volume_window=5,
-        last_n_days=last_n_days)
-    max_days_by_ticker_lnd.index = (
-        max_days_by_ticker_lnd.index.map(utils.format_asset))
+        result.max_days_to_liquidate.rename(index=utils.format_asset))
 
     print("Last {} trading days:".format(last_n_days))
     utils.print_table(
-        max_days_by_ticker_lnd[max_days_by_ticker_lnd.days_to_liquidate > 1])
-
-    llt = capacity.get_low_liquidity_transactions(transactions, market_data)
-    llt.index = llt.index.map(utils.format_asset)
+        result.max_days_to_liquidate_last_n_days.rename(
+            index=utils.format_asset))
 
     print('Tickers with daily transactions consuming >{}% of daily bar \n'
           'all backtest:'.format(trade_daily_vol_limit * 100))
     utils.print_table(
-        llt[llt['max_pct_bar_consumed'] > trade_daily_vol_limit * 100])
-
-    llt = capacity.get_low_liquidity_transactions(
-        transactions, market_data, last_n_days=last_n_days)
+        result.low_liquidity_txns.rename(index=utils.format_asset))
 
     print("Last {} trading days:".format(last_n_days))
     utils.print_table(
-        llt[llt['max_pct_bar_consumed'] > trade_daily_vol_limit * 100])
+        result.low_liquidity_txns_last_n_days.rename(
+            index=utils.format_asset))
 
     bt_starting_capital = positions.iloc[0].sum() / (1 + returns.iloc[0])
-    fig, ax_capacity_sweep = plt.subplots(figsize=(14, 6))
+    fig = utils.new_figure(figsize=(14, 6))
+    ax_capacity_sweep = fig.add_subplot(111)
     plotting.plot_capacity_sweep(returns, transactions, market_data,
                                  bt_starting_capital,
-                                 min_pv=100000,
-                                 max_pv=300000000,
-                                 step_size=1000000,
-                                 ax=ax_capacity_sweep)
+                                 intraday_bars=intraday_bars,
+                                 ax=ax_capacity_sweep,
+                                 capacity_sweep=result.capacity_sweep)
 
     if return_fig:
         return fig
 
 
+@profiling.timed
 @plotting.customize
 def create_perf_attrib_tear_sheet(returns,
                                   positions,
@@ -1070,7 +1249,9 @@ def create_perf_attrib_tear_sheet(returns,
                                   transactions=None,
                                   pos_in_dollars=True,
                                   factor_partitions=FACTOR_PARTITIONS,
-                                  return_fig=False):
+                                  return_fig=False,
+                                  analysis_context=None,
+                                  compute_only=False):
     """
     Generate plots and tables for analyzing a strategy's performance.
 
@@ -1109,18 +1290,30 @@ def create_perf_attrib_tear_sheet(returns,
 
     return_fig : boolean, optional
         If True, returns the figure that was plotted on.
+    analysis_context : analysis.AnalysisContext, optional
+        Precomputed intermediates shared between tear sheets. Built from
+        the other arguments if not given.
+    compute_only : boolean, optional
+        If True, nothing is plotted or displayed. The tables and series
+        of the tear sheet are computed and returned instead.
+         - See compute.compute_perf_attrib_tear_sheet.
     """
-    portfolio_exposures, perf_attrib_data = perf_attrib.perf_attrib(
-        returns, positions, factor_returns, factor_loadings, transactions,
-        pos_in_dollars=pos_in_dollars
-    )
 
-    display(Markdown("## Performance Relative to Common Risk Factors"))
+    result = compute.compute_perf_attrib_tear_sheet(
+        returns, positions, factor_returns, factor_loadings,
+        transactions=transactions, pos_in_dollars=pos_in_dollars,
+        analysis_context=analysis_context)
+    if compute_only:
+        return result
+    portfolio_exposures = result.risk_exposures
+    perf_attrib_data = result.perf_attrib
+
+    utils.display_html("<h2>Performance Relative to Common Risk Factors</h2>")
 
     # aggregate perf attrib stats and show summary table
-    perf_attrib.show_perf_attrib_stats(returns, positions, factor_returns,
-                                       factor_loadings, transactions,
-                                       pos_in_dollars)
+    perf_attrib.show_perf_attrib_stats(
+        returns, positions, factor_returns, factor_loadings,
+        perf_attrib_stats=(result.summary, result.exposures_summary))
 
     # one section for the returns plot, and for each factor grouping
     # one section for factor returns, and one for risk exposures
@@ -1131,13 +1324,13 @@ def create_perf_attrib_tear_sheet(returns,
 
     current_section = 0
 
-    fig = plt.figure(figsize=[14, vertical_sections * 6])
+    fig = utils.new_figure(figsize=[14, vertical_sections * 6])
 
     gs = gridspec.GridSpec(vertical_sections, 1,
                            wspace=0.5, hspace=0.5)
 
     perf_attrib.plot_returns(perf_attrib_data,
-                             ax=plt.subplot(gs[current_section]))
+                             ax=fig.add_subplot(gs[current_section]))
     current_section += 1
 
     if factor_partitions is not None:
@@ -1150,7 +1343,7 @@ def create_perf_attrib_tear_sheet(returns,
 
             perf_attrib.plot_factor_contribution_to_perf(
                 perf_attrib_data[columns_to_select],
-                ax=plt.subplot(gs[current_section]),
+                ax=fig.add_subplot(gs[current_section]),
                 title=(
                     'Cumulative common {} returns attribution'
                 ).format(factor_type)
@@ -1165,7 +1358,7 @@ def create_perf_attrib_tear_sheet(returns,
 
             perf_attrib.plot_risk_exposures(
                 portfolio_exposures[columns_to_select],
-                ax=plt.subplot(gs[current_section]),
+                ax=fig.add_subplot(gs[current_section]),
                 title='Daily {} factor exposures'.format(factor_type)
             )
             current_section += 1
@@ -1174,13 +1367,13 @@ def create_perf_attrib_tear_sheet(returns,
 
         perf_attrib.plot_factor_contribution_to_perf(
             perf_attrib_data,
-            ax=plt.subplot(gs[current_section])
+            ax=fig.add_subplot(gs[current_section])
         )
         current_section += 1
 
         perf_attrib.plot_risk_exposures(
             portfolio_exposures,
-            ax=plt.subplot(gs[current_section])
+            ax=fig.add_subplot(gs[current_section])
         )
 
     # gs.tight_layout(fig)
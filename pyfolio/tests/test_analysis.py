@@ -0,0 +1,75 @@
+import gzip
+import os
+from unittest import TestCase
+
+import empyrical as ep
+from pandas import read_csv
+from pandas.util.testing import assert_frame_equal, assert_series_equal
+
+from pyfolio.analysis import AnalysisContext
+from pyfolio.pos import get_exposure_summary, get_percent_alloc
+from pyfolio.timeseries import gen_drawdown_table
+from pyfolio.txn import get_turnover, get_txn_vol
+from pyfolio.utils import to_utc, to_series
+
+
+class AnalysisContextTestCase(TestCase):
+    __location__ = os.path.realpath(
+        os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+    test_returns = read_csv(
+        gzip.open(
+            __location__ + '/test_data/test_returns.csv.gz'),
+        index_col=0, parse_dates=True)
+    test_returns = to_series(to_utc(test_returns))
+    test_txn = to_utc(read_csv(
+        gzip.open(
+            __location__ + '/test_data/test_txn.csv.gz'),
+        index_col=0, parse_dates=True))
+    test_pos = to_utc(read_csv(
+        gzip.open(__location__ + '/test_data/test_pos.csv.gz'),
+        index_col=0, parse_dates=True))
+
+    def test_intermediates(self):
+        context = AnalysisContext(self.test_returns, self.test_pos,
+                                  self.test_txn)
+
+        self.assertIs(context.positions, self.test_pos)
+        assert_series_equal(context.cum_returns,
+                            ep.cum_returns(self.test_returns, 1.0))
+        assert_frame_equal(context.drawdown_table(5),
+                           gen_drawdown_table(self.test_returns, top=5))
+        assert_frame_equal(context.positions_alloc,
+                           get_percent_alloc(self.test_pos))
+        assert_frame_equal(context.exposure_summary,
+                           get_exposure_summary(self.test_pos))
+        assert_frame_equal(context.txn_vol, get_txn_vol(self.test_txn))
+        assert_series_equal(
+            context.turnover('portfolio_value'),
+            get_turnover(self.test_pos, self.test_txn, 'portfolio_value'))
+
+    def test_memoized(self):
+        context = AnalysisContext(self.test_returns, self.test_pos,
+                                  self.test_txn)
+
+        self.assertIs(context.cum_returns, context.cum_returns)
+        self.assertIs(context.drawdown_table(5), context.drawdown_table(5))
+        self.assertIs(context.turnover(), context.turnover('AGB'))
+        self.assertIsNot(context.turnover(),
+                         context.turnover('portfolio_value'))
+
+    def test_with_returns(self):
+        context = AnalysisContext(self.test_returns, self.test_pos,
+                                  self.test_txn)
+        self.assertIs(context.with_returns(self.test_returns), context)
+
+        turnover = context.turnover()
+        cum_returns = context.cum_returns
+        clipped = self.test_returns.iloc[10:]
+        clipped_context = context.with_returns(clipped)
+
+        self.assertIs(clipped_context.positions, context.positions)
+        self.assertIs(clipped_context.turnover(), turnover)
+        self.assertIsNot(clipped_context.cum_returns, cum_returns)
+        assert_series_equal(clipped_context.cum_returns,
+                            ep.cum_returns(clipped, 1.0))
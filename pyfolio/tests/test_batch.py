@@ -0,0 +1,66 @@
+import gzip
+import os
+import shutil
+import tempfile
+import warnings
+from unittest import TestCase
+
+from pandas import read_csv
+
+from pyfolio.batch import render_tear_sheets
+from pyfolio.tears import create_returns_tear_sheet
+from pyfolio.utils import to_utc, to_series
+
+__location__ = os.path.realpath(
+    os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+
+def load_returns():
+    returns = read_csv(
+        gzip.open(__location__ + '/test_data/test_returns.csv.gz'),
+        index_col=0, parse_dates=True)
+    return (to_series(to_utc(returns)).iloc[:300],)
+
+
+class BatchTestCase(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_render_in_process(self):
+        paths = render_tear_sheets({'algo': load_returns()},
+                                   self.output_dir,
+                                   formats=('png', 'svg', 'html'),
+                                   tear_sheet=create_returns_tear_sheet,
+                                   processes=1)
+
+        self.assertEqual(list(paths), ['algo'])
+        self.assertEqual(
+            sorted(os.path.basename(path) for path in paths['algo']),
+            ['algo.html', 'algo_0.png', 'algo_0.svg'])
+        for path in paths['algo']:
+            self.assertTrue(os.path.getsize(path) > 0)
+
+        with open(os.path.join(self.output_dir, 'algo.html')) as f:
+            html = f.read()
+        self.assertIn('Worst drawdown periods', html)
+        self.assertIn('<img src="data:image/png;base64,', html)
+
+    def test_render_with_pool(self):
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            paths = render_tear_sheets(
+                [('a', load_returns), ('b', load_returns), ('bad', (None,))],
+                self.output_dir,
+                formats=('png',),
+                tear_sheet=create_returns_tear_sheet,
+                processes=2)
+
+        self.assertEqual(sorted(paths), ['a', 'b'])
+        self.assertTrue(all(os.path.exists(path)
+                            for written in paths.values()
+                            for path in written))
+        self.assertTrue(any('Unable to render tear sheet for bad'
+                            in str(warning.message) for warning in w))
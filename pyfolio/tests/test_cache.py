@@ -0,0 +1,181 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_frame_equal, assert_series_equal
+
+from pyfolio import cache
+from pyfolio.perf_attrib import perf_attrib
+from pyfolio.round_trips import extract_round_trips
+from pyfolio.timeseries import forecast_cone_bootstrap
+from pyfolio.tests.test_perf_attrib import generate_toy_risk_model_output
+
+calls = []
+
+
+@cache.cached
+def add(frame, offset=0):
+    calls.append(offset)
+    return frame + offset
+
+
+@cache.cached
+def cumulate(values):
+    calls.append(None)
+    return np.cumsum(values)
+
+
+@cache.cached(seed='seed')
+def sample(values, seed=None):
+    calls.append(seed)
+    return np.random.RandomState(seed).choice(values, size=10)
+
+
+class Offset(object):
+    def __radd__(self, other):
+        return other
+
+
+class DiskCacheTestCase(TestCase):
+    dates = pd.date_range('2015-01-01', periods=4, tz='UTC')
+    frame = pd.DataFrame({'A': [1.0, 2.0, 3.0, 4.0],
+                          'B': ['w', 'x', 'y', 'z']}, index=dates)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        del calls[:]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_hit(self):
+        frame = self.frame[['A']]
+        with cache.use_cache(self.directory) as disk_cache:
+            assert_frame_equal(add(frame, 1), frame + 1)
+            # Same arguments, passed differently.
+            assert_frame_equal(add(frame.copy(), offset=1), frame + 1)
+            self.assertEqual(calls, [1])
+
+            add(frame, 2)
+            add(frame.assign(A=frame.A * 2), 1)
+            self.assertEqual(calls, [1, 2, 1])
+            self.assertEqual(len(disk_cache.entries()), 3)
+
+        # Disabled outside of the context.
+        add(frame, 1)
+        self.assertEqual(calls, [1, 2, 1, 1])
+
+    def test_formats(self):
+        series = self.frame.A
+        with cache.use_cache(self.directory) as disk_cache:
+            for _ in range(2):
+                np.testing.assert_array_equal(cumulate(np.arange(5)),
+                                              np.cumsum(np.arange(5)))
+                assert_series_equal(add(series, 1), series + 1)
+                assert_frame_equal(add(self.frame.A.to_frame(), 1),
+                                   self.frame.A.to_frame() + 1)
+            self.assertEqual(len(calls), 3)
+
+            extensions = sorted(os.path.splitext(path)[1]
+                                for path, _, _ in disk_cache.entries())
+            self.assertIn('.npz', extensions)
+            self.assertIn('.pkl', extensions)
+            if cache._parquet_compatible(self.frame):
+                self.assertIn('.parquet', extensions)
+
+    def test_frequency_kept(self):
+        regular = self.frame[['A']]
+        irregular = regular.set_axis(pd.DatetimeIndex(list(self.dates)),
+                                     axis=0)
+        with cache.use_cache(self.directory):
+            for _ in range(2):
+                assert_frame_equal(add(regular, 1), regular + 1)
+                assert_frame_equal(add(irregular, 1), irregular + 1)
+            # Frames differing only by the freq of their index are cached
+            # separately.
+            self.assertEqual(len(calls), 2)
+
+    def test_random_seed(self):
+        values = np.arange(100)
+        with cache.use_cache(self.directory) as disk_cache:
+            for _ in range(2):
+                sample(values, seed=1)
+                sample(values)
+            self.assertEqual(calls, [1, None, None])
+
+            returns = self.frame.A.pct_change().fillna(0)
+            cone = forecast_cone_bootstrap(returns, 5, random_seed=1)
+            assert_frame_equal(
+                forecast_cone_bootstrap(returns, 5, random_seed=1), cone)
+            forecast_cone_bootstrap(returns, 5)
+            self.assertEqual(len(disk_cache.entries()), 2)
+
+    def test_uncacheable_arguments(self):
+        with cache.use_cache(self.directory) as disk_cache:
+            add(np.arange(3), offset=Offset())
+            self.assertEqual(disk_cache.entries(), [])
+
+    def test_version(self):
+        frame = self.frame[['A']]
+        version = cache.__version__
+        with cache.use_cache(self.directory):
+            add(frame, 1)
+            try:
+                # Results of another version of pyfolio are not used.
+                cache.__version__ = version + '.other'
+                add(frame, 1)
+            finally:
+                cache.__version__ = version
+            add(frame, 1)
+        self.assertEqual(calls, [1, 1])
+
+    def test_eviction(self):
+        with cache.use_cache(self.directory) as disk_cache:
+            for i in range(3):
+                cumulate(np.arange(1000) + i)
+                # Distinct modification times.
+                time.sleep(0.01)
+            entry_size = disk_cache.size() // 3
+
+            # Using the first entry makes the second the least recent.
+            cumulate(np.arange(1000))
+            disk_cache.max_size = 2 * entry_size
+            disk_cache.evict()
+
+            del calls[:]
+            cumulate(np.arange(1000))
+            cumulate(np.arange(1000) + 2)
+            self.assertEqual(calls, [])
+            cumulate(np.arange(1000) + 1)
+            self.assertEqual(calls, [None])
+
+    def test_entry_points(self):
+        (returns,
+         positions,
+         factor_returns,
+         factor_loadings) = generate_toy_risk_model_output()
+
+        transactions = pd.DataFrame(
+            {'amount': [10, -10, 20, -20], 'price': [10., 11., 12., 11.],
+             'symbol': ['AAPL', 'AAPL', 'TLT', 'TLT']},
+            index=pd.to_datetime(['2017-01-02', '2017-01-03',
+                                  '2017-01-04', '2017-01-06']))
+
+        expected_attrib = perf_attrib(returns, positions, factor_returns,
+                                      factor_loadings)
+        expected_round_trips = extract_round_trips(transactions)
+
+        with cache.use_cache(self.directory) as disk_cache:
+            for _ in range(2):
+                result = perf_attrib(returns, positions, factor_returns,
+                                     factor_loadings)
+                round_trips = extract_round_trips(transactions)
+            self.assertEqual(len(disk_cache.entries()), 2)
+
+        assert_frame_equal(result.perf_attrib, expected_attrib.perf_attrib)
+        assert_frame_equal(result.positions, expected_attrib.positions)
+        assert_frame_equal(round_trips, expected_round_trips)
@@ -1,21 +1,29 @@
 from __future__ import division
+import warnings
 from unittest import TestCase
 from nose_parameterized import parameterized
+from numpy import nan
 
 from pandas import (
     Series,
     DataFrame,
     date_range,
     datetime,
-    concat
+    concat,
+    to_datetime
 )
 from pandas.util.testing import (assert_frame_equal,
                                  assert_series_equal)
 
+from pyfolio import capacity
 from pyfolio.capacity import (days_to_liquidate_positions,
                               get_max_days_to_liquidate_by_ticker,
+                              get_max_days_to_liquidate_by_ticker_windows,
                               get_low_liquidity_transactions,
+                              get_low_liquidity_transactions_windows,
                               daily_txns_with_bar_data,
+                              intraday_txns_with_bar_data,
+                              aggregate_intraday_bars,
                               apply_slippage_penalty)
 
 
@@ -75,6 +83,55 @@ class CapacityTestCase(TestCase):
 
         assert_frame_equal(mdtl, expected)
 
+    def test_get_max_days_to_liquidate_by_ticker_windows(self):
+
+        mdtl = get_max_days_to_liquidate_by_ticker_windows(
+            self.positions,
+            self.market_data,
+            max_bar_consumption=1,
+            capital_base=1e6,
+            mean_volume_window=1,
+            windows=[None, 0])
+
+        expected_all = DataFrame([[datetime(2015, 1, 3), .75/2, 75.],
+                                  [datetime(2015, 1, 2), .5/3, 50.]],
+                                 columns=['date', 'days_to_liquidate',
+                                          'pos_alloc_pct'],
+                                 index=['A', 'B'])
+        expected_all.index.name = 'symbol'
+
+        expected_last = DataFrame([[datetime(2015, 1, 3), .75/2, 75.],
+                                   [datetime(2015, 1, 3), 0., 0.]],
+                                  columns=['date', 'days_to_liquidate',
+                                           'pos_alloc_pct'],
+                                  index=['A', 'B'])
+        expected_last.index.name = 'symbol'
+
+        assert_frame_equal(mdtl[None], expected_all)
+        assert_frame_equal(mdtl[0], expected_last)
+
+    def test_windows_computed_once(self):
+        # e.g. windows=[None, last_n_days] with last_n_days=None.
+        computed = []
+        max_days_to_liquidate = capacity._max_days_to_liquidate
+
+        def counting(*args, **kwargs):
+            computed.append(kwargs['last_n_days'])
+            return max_days_to_liquidate(*args, **kwargs)
+
+        capacity._max_days_to_liquidate = counting
+        try:
+            mdtl = get_max_days_to_liquidate_by_ticker_windows(
+                self.positions, self.market_data, windows=[None, 1, None])
+        finally:
+            capacity._max_days_to_liquidate = max_days_to_liquidate
+        llt = get_low_liquidity_transactions_windows(
+            self.transactions, self.market_data, windows=[None, 1, None])
+
+        self.assertEqual(computed, [None, 1])
+        self.assertEqual(list(mdtl), [None, 1])
+        self.assertEqual(list(llt), [None, 1])
+
     @parameterized.expand([(DataFrame([[datetime(2015, 1, 1), 100.],
                                        [datetime(2015, 1, 2), 100]],
                                       columns=['date', 'max_pct_bar_consumed'],
@@ -94,6 +151,34 @@ class CapacityTestCase(TestCase):
         expected.index.name = 'symbol'
         assert_frame_equal(llt, expected)
 
+    def test_get_low_liquidity_transactions_windows(self):
+        txn_daily = DataFrame(data=[[1, 1000000, 1, 'A'],
+                                    [2, 1000000, 1, 'B'],
+                                    [1, 1000000, 1, 'A'],
+                                    [2, 250000, 1, 'B']],
+                              columns=['sid', 'amount', 'price', 'symbol'],
+                              index=self.dates[[0, 1, 2, 2]])
+
+        llt = get_low_liquidity_transactions_windows(
+            txn_daily, self.market_data, windows=[None, 1])
+
+        # The worst day of both names is outside of the last day.
+        expected_all = DataFrame([[datetime(2015, 1, 1), 100.],
+                                  [datetime(2015, 1, 2), 50.]],
+                                 columns=['date', 'max_pct_bar_consumed'],
+                                 index=['A', 'B'])
+        expected_all.index.name = 'symbol'
+
+        expected_last = DataFrame([[datetime(2015, 1, 3), (1/3)*100.],
+                                   [datetime(2015, 1, 3), 25.]],
+                                  columns=['date', 'max_pct_bar_consumed'],
+                                  index=['A', 'B'])
+        expected_last.index.name = 'symbol'
+
+        self.assertEqual(list(llt), [None, 1])
+        assert_frame_equal(llt[None], expected_all)
+        assert_frame_equal(llt[1], expected_last)
+
     def test_daily_txns_with_bar_data(self):
         daily_txn = daily_txns_with_bar_data(
             self.transactions, self.market_data)
@@ -105,6 +190,74 @@ class CapacityTestCase(TestCase):
 
         assert_frame_equal(daily_txn, expected, check_less_precise=True)
 
+    minutes = date_range(start='2015-01-01 14:31', freq='T', periods=3)
+    minute_volume = DataFrame([[100.0, 300.0],
+                               [200.0, 200.0],
+                               [300.0, 100.0]],
+                              columns=['A', 'B'], index=minutes)
+    minute_volume.index.name = 'dt'
+    minute_volume['market_data'] = 'volume'
+    minute_price = DataFrame([[1.0, 2.0],
+                              [1.5, 2.0],
+                              [2.0, 2.0]],
+                             columns=['A', 'B'], index=minutes)
+    minute_price.index.name = 'dt'
+    minute_price['market_data'] = 'price'
+    minute_market_data = concat([minute_volume, minute_price]) \
+        .reset_index().set_index(['dt', 'market_data'])
+
+    @parameterized.expand([(1,), (2,), (10,)])
+    def test_intraday_txns_with_bar_data(self, chunksize):
+        transactions = DataFrame(
+            data=[[10, 1.0, 'A'],
+                  [-20, 1.0, 'A'],
+                  [5, 2.0, 'B'],
+                  [30, 2.0, 'A'],
+                  [7, 2.0, 'B'],
+                  [4, 3.0, 'C']],
+            columns=['amount', 'price', 'symbol'],
+            index=to_datetime(['2015-01-01 14:30:10',
+                               '2015-01-01 14:30:50',
+                               '2015-01-01 14:31:00',
+                               '2015-01-01 14:32:30',
+                               '2015-01-01 14:40:00',
+                               '2015-01-01 14:31:00']))
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always', UserWarning)
+            txn_bars = intraday_txns_with_bar_data(transactions,
+                                                   self.minute_market_data,
+                                                   chunksize=chunksize)
+        self.assertEqual(len(w), 1)
+        self.assertIn('2 fills', str(w[0].message))
+
+        # The fill of B at 14:40 has no bar within a minute, and C has no
+        # market data. They are kept without price and volume.
+        expected = DataFrame(data=[['A', 30, 1.0, 100.],
+                                   ['B', 5, 2.0, 300.],
+                                   ['C', 4, nan, nan],
+                                   ['A', 30, 2.0, 300.],
+                                   ['B', 7, nan, nan]],
+                             columns=['symbol', 'amount', 'price', 'volume'],
+                             index=to_datetime(['2015-01-01 14:31',
+                                                '2015-01-01 14:31',
+                                                '2015-01-01 14:31',
+                                                '2015-01-01 14:33',
+                                                '2015-01-01 14:40']))
+        expected.index.name = 'date'
+
+        assert_frame_equal(txn_bars, expected)
+
+    def test_aggregate_intraday_bars(self):
+        daily = aggregate_intraday_bars(self.minute_market_data)
+
+        assert_frame_equal(daily.xs('volume', level=1),
+                           DataFrame([[600.0, 600.0]], columns=['A', 'B'],
+                                     index=self.dates[:1].rename('dt')))
+        assert_frame_equal(daily.xs('price', level=1),
+                           DataFrame([[2.0, 2.0]], columns=['A', 'B'],
+                                     index=self.dates[:1].rename('dt')))
+
     @parameterized.expand([(1000000, 1, [0.9995, 0.9999375, 0.99998611]),
                            (10000000, 1, [0.95, 0.99375, 0.998611]),
                            (100000, 1, [0.999995, 0.999999375, 0.9999998611]),
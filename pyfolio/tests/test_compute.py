@@ -0,0 +1,245 @@
+from unittest import TestCase
+from nose_parameterized import parameterized
+
+import os
+import gzip
+
+import matplotlib.pyplot as plt
+import numpy as np
+from pandas import DataFrame, concat, read_csv
+from pandas.util.testing import assert_frame_equal, assert_series_equal
+
+from pyfolio import plotting
+from pyfolio.compute import (TearSheetResult,
+                             compute_returns_tear_sheet,
+                             compute_position_tear_sheet,
+                             compute_txn_tear_sheet)
+from pyfolio.perf_attrib import show_perf_attrib_stats
+from pyfolio.pos import get_percent_alloc
+from pyfolio.round_trips import print_round_trip_stats
+from pyfolio.tears import (create_full_tear_sheet,
+                           create_simple_tear_sheet,
+                           create_returns_tear_sheet,
+                           create_position_tear_sheet,
+                           create_round_trip_tear_sheet,
+                           create_interesting_times_tear_sheet,
+                           create_capacity_tear_sheet,
+                           create_perf_attrib_tear_sheet)
+from pyfolio.tests.test_perf_attrib import generate_toy_risk_model_output
+from pyfolio.timeseries import gen_drawdown_table, perf_stats
+from pyfolio.txn import get_turnover
+from pyfolio.utils import (display_html, format_asset, headless_output,
+                           print_table, to_utc, to_series)
+
+
+def printed_tables(func, *args, **kwargs):
+    """
+    HTML of the tables func displays, without its figures.
+    """
+
+    with headless_output() as output:
+        func(*args, **kwargs)
+    return [item for kind, item in output.items if kind == 'html']
+
+
+class ComputeTestCase(TestCase):
+    __location__ = os.path.realpath(
+        os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+    test_returns = read_csv(
+        gzip.open(
+            __location__ + '/test_data/test_returns.csv.gz'),
+        index_col=0, parse_dates=True)
+    test_returns = to_series(to_utc(test_returns))
+    test_txn = to_utc(read_csv(
+        gzip.open(
+            __location__ + '/test_data/test_txn.csv.gz'),
+        index_col=0, parse_dates=True))
+    test_pos = to_utc(read_csv(
+        gzip.open(__location__ + '/test_data/test_pos.csv.gz'),
+        index_col=0, parse_dates=True))
+
+    def test_tear_sheet_result(self):
+        result = TearSheetResult([('b', 1), ('a', 2)])
+
+        self.assertEqual(list(result), ['b', 'a'])
+        self.assertEqual(result.a, 2)
+        with self.assertRaises(AttributeError):
+            result.c
+
+    def test_compute_returns_tear_sheet(self):
+        result = compute_returns_tear_sheet(self.test_returns,
+                                            positions=self.test_pos,
+                                            transactions=self.test_txn)
+
+        expected_stats = perf_stats(self.test_returns,
+                                    positions=self.test_pos,
+                                    transactions=self.test_txn)
+        assert_series_equal(result.perf_stats['Backtest'], expected_stats,
+                            check_names=False)
+        assert_frame_equal(result.drawdowns,
+                           gen_drawdown_table(self.test_returns, top=5))
+        self.assertNotIn('rolling_beta', result)
+        self.assertTrue((result.underwater <= 0).all())
+
+    def test_compute_position_and_txn_tear_sheets(self):
+        positions = compute_position_tear_sheet(self.test_returns,
+                                                self.test_pos)
+        top_abs = get_percent_alloc(self.test_pos).drop(
+            'cash', axis='columns').abs().max().nlargest(10)
+        assert_series_equal(positions.top_positions, top_abs,
+                            check_names=False)
+
+        transactions = compute_txn_tear_sheet(self.test_returns,
+                                              self.test_pos, self.test_txn)
+        assert_series_equal(transactions.turnover,
+                            get_turnover(self.test_pos, self.test_txn))
+
+    @parameterized.expand([({},),
+                           ({'slippage': 1},),
+                           ({'live_start_date': test_returns.index[-20]},),
+                           ({'bootstrap': True},),
+                           ])
+    def test_create_full_tear_sheet_compute_only(self, kwargs):
+        figures = plt.get_fignums()
+
+        result = create_full_tear_sheet(self.test_returns,
+                                        positions=self.test_pos,
+                                        transactions=self.test_txn,
+                                        benchmark_rets=self.test_returns,
+                                        compute_only=True,
+                                        **kwargs)
+
+        self.assertEqual(plt.get_fignums(), figures)
+        self.assertEqual(list(result),
+                         ['returns', 'interesting_times', 'positions',
+                          'transactions'])
+        self.assertIn('rolling_beta', result.returns)
+
+    def test_create_simple_tear_sheet_compute_only(self):
+        result = create_simple_tear_sheet(self.test_returns,
+                                          positions=self.test_pos,
+                                          transactions=self.test_txn,
+                                          compute_only=True)
+
+        self.assertIsInstance(result, TearSheetResult)
+        self.assertIn('turnover', result)
+
+    def assert_tables_of_result(self, create, show_tables, *args, **kwargs):
+        # The tables a tear sheet displays are those of its compute-only
+        # result.
+        result = create(*args, compute_only=True, **kwargs)
+        self.assertEqual(printed_tables(create, *args, **kwargs),
+                         printed_tables(show_tables, result))
+
+    def test_returns_tear_sheet_tables(self):
+        live_start_date = self.test_returns.index[-20]
+
+        def show_tables(result):
+            plotting.show_perf_stats(self.test_returns,
+                                     live_start_date=live_start_date,
+                                     perf_stats=result.perf_stats)
+            plotting.show_worst_drawdown_periods(self.test_returns,
+                                                 drawdowns=result.drawdowns)
+
+        self.assert_tables_of_result(create_returns_tear_sheet, show_tables,
+                                     self.test_returns,
+                                     positions=self.test_pos,
+                                     transactions=self.test_txn,
+                                     benchmark_rets=self.test_returns,
+                                     live_start_date=live_start_date)
+
+    def test_simple_tear_sheet_tables(self):
+        def show_tables(result):
+            plotting.show_perf_stats(self.test_returns,
+                                     perf_stats=result.perf_stats)
+
+        self.assert_tables_of_result(create_simple_tear_sheet, show_tables,
+                                     self.test_returns,
+                                     positions=self.test_pos,
+                                     transactions=self.test_txn,
+                                     slippage=5)
+
+    def test_position_tear_sheet_tables(self):
+        def show_tables(result):
+            plotting.show_and_plot_top_positions(
+                self.test_returns, get_percent_alloc(self.test_pos),
+                show_and_plot=1,
+                top_positions=(result.top_long_positions,
+                               result.top_short_positions,
+                               result.top_positions))
+
+        self.assert_tables_of_result(create_position_tear_sheet, show_tables,
+                                     self.test_returns, self.test_pos)
+
+    def test_round_trip_tear_sheet_tables(self):
+        sector_mappings = {symbol: 'Technology' if i % 2 else 'Retail'
+                           for i, symbol in
+                           enumerate(self.test_txn.symbol.unique())}
+
+        def show_tables(result):
+            print_round_trip_stats(
+                result.round_trips,
+                stats=dict((name, result[name]) for name in
+                           ('summary', 'pnl', 'duration', 'returns',
+                            'symbols')))
+            plotting.show_profit_attribution(
+                result.round_trips,
+                profit_attribution=result.profit_attribution)
+            plotting.show_profit_attribution(
+                result.round_trips,
+                profit_attribution=result.sector_profit_attribution)
+
+        self.assert_tables_of_result(create_round_trip_tear_sheet,
+                                     show_tables,
+                                     self.test_returns, self.test_pos,
+                                     self.test_txn,
+                                     sector_mappings=sector_mappings)
+
+    def test_interesting_times_tear_sheet_tables(self):
+        def show_tables(result):
+            print_table(result.stress_events * 100, name='Stress Events',
+                        float_format='{0:.2f}%'.format)
+
+        self.assert_tables_of_result(create_interesting_times_tear_sheet,
+                                     show_tables, self.test_returns,
+                                     benchmark_rets=self.test_returns)
+
+    def test_capacity_tear_sheet_tables(self):
+        tickers = self.test_pos.columns.drop('cash')
+        volume = DataFrame(
+            np.random.RandomState(0).uniform(1e3, 1e5, (len(self.test_returns),
+                                                        len(tickers))),
+            index=self.test_returns.index, columns=tickers)
+        price = DataFrame(20.0, index=volume.index, columns=tickers)
+        market_data = concat({'volume': volume, 'price': price})
+        market_data = market_data.swaplevel(0, 1).sort_index()
+        market_data.index.names = ['dt', 'market_data']
+
+        def show_tables(result):
+            for key in ('max_days_to_liquidate',
+                        'max_days_to_liquidate_last_n_days',
+                        'low_liquidity_txns',
+                        'low_liquidity_txns_last_n_days'):
+                print_table(result[key].rename(index=format_asset))
+
+        self.assert_tables_of_result(create_capacity_tear_sheet, show_tables,
+                                     self.test_returns, self.test_pos,
+                                     self.test_txn, market_data)
+
+    def test_perf_attrib_tear_sheet_tables(self):
+        (returns,
+         positions,
+         factor_returns,
+         factor_loadings) = generate_toy_risk_model_output()
+
+        def show_tables(result):
+            display_html(
+                '<h2>Performance Relative to Common Risk Factors</h2>')
+            show_perf_attrib_stats(
+                returns, positions, factor_returns, factor_loadings,
+                perf_attrib_stats=(result.summary, result.exposures_summary))
+
+        self.assert_tables_of_result(create_perf_attrib_tear_sheet,
+                                     show_tables, returns, positions,
+                                     factor_returns, factor_loadings)
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+from unittest import TestCase, skipIf
+
+import pyfolio
+
+
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'IPython', 'sklearn']
+
+
+def modules_loaded_by(code):
+    """
+    Runs code in a fresh interpreter and returns which of HEAVY_MODULES
+    it has imported.
+    """
+    code += ('\nimport sys'
+             '\nprint(",".join(m for m in {!r} if m in sys.modules))'
+             .format(HEAVY_MODULES))
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return [m for m in output.decode().strip().split(',') if m]
+
+
+@skipIf(sys.version_info < (3, 7), 'pyfolio is imported eagerly')
+class LazyImportTestCase(TestCase):
+
+    def test_import_pyfolio(self):
+        self.assertEqual(modules_loaded_by('import pyfolio'), [])
+
+    def test_compute_modules(self):
+        self.assertEqual(
+            modules_loaded_by('import pyfolio\n'
+                              'pyfolio.timeseries.perf_stats\n'
+                              'pyfolio.compute.compute_full_tear_sheet\n'
+                              'pyfolio.perf_attrib.perf_attrib'),
+            [])
+
+    def test_reexported_names(self):
+        from pyfolio import plotting, tears
+
+        self.assertIs(pyfolio.create_full_tear_sheet,
+                      tears.create_full_tear_sheet)
+        self.assertIs(pyfolio.plot_rolling_returns,
+                      plotting.plot_rolling_returns)
+        self.assertIn('create_full_tear_sheet', dir(pyfolio))
+
+        with self.assertRaises(AttributeError):
+            pyfolio.no_such_function
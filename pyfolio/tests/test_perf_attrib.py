@@ -5,10 +5,20 @@ import warnings
 
 import empyrical as ep
 from pyfolio.perf_attrib import (
+    PerfAttribResult,
     perf_attrib,
+    perf_attrib_chunked,
+    compute_exposures,
     create_perf_attrib_stats,
-    _cumulative_returns_less_costs
+    create_perf_attrib_horizon_stats,
+    show_perf_attrib_stats,
+    _align_and_warn,
+    _compute_exposures_by_codes,
+    _cumulative_returns_less_costs,
+    _stack_positions
 )
+from pyfolio.sparse import SparsePositions
+from pyfolio.txn import get_txn_vol
 
 
 def _empyrical_compat_perf_attrib_result(index, columns, data):
@@ -469,6 +479,178 @@ class PerfAttribTestCase(unittest.TestCase):
             str(w[-1].message),
         )
 
+    def test_align_and_warn_warns_on_every_call(self):
+        (returns,
+         positions,
+         factor_returns,
+         factor_loadings) = generate_toy_risk_model_output()
+
+        positions.iloc[::3, :] = [100.0, 0.0, 0.0, 0.0]
+        positions.iloc[1::3, :] = [0.0, 100.0, 0.0, 0.0]
+        positions.iloc[2::3, :] = [0.0, 0.0, 100.0, 0.0]
+
+        transactions = mock_transactions_from_positions(positions)
+        txn_vol = get_txn_vol(transactions)
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always", UserWarning)
+
+            for _ in range(2):
+                _align_and_warn(returns, positions, factor_returns,
+                                factor_loadings,
+                                transactions=transactions,
+                                txn_vol=txn_vol)
+
+        self.assertEqual(len(w), 2)
+        for warning in w:
+            self.assertIn("relatively high turnover", str(warning.message))
+
+    def test_perf_attrib_result(self):
+        (returns,
+         positions,
+         factor_returns,
+         factor_loadings) = generate_toy_risk_model_output(periods=20)
+
+        # Risk data outside of the returns' date range.
+        returns = returns.iloc[2:-2]
+        factor_loadings = factor_loadings.drop('XOM', level='ticker')
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            result = perf_attrib(returns, positions, factor_returns,
+                                 factor_loadings)
+
+        self.assertIsInstance(result, PerfAttribResult)
+        exposures, perf_attrib_data = result
+        self.assertIs(exposures, result.risk_exposures)
+        self.assertIs(perf_attrib_data, result.perf_attrib)
+
+        pd.util.testing.assert_index_equal(result.positions.index,
+                                           returns.index)
+        pd.util.testing.assert_index_equal(result.factor_returns.index,
+                                           returns.index)
+        self.assertNotIn('XOM', result.positions.columns)
+
+        summary, exposures_summary = create_perf_attrib_stats(result)
+        expected_summary, expected_exposures_summary = \
+            create_perf_attrib_stats(perf_attrib_data, exposures)
+        pd.util.testing.assert_series_equal(summary, expected_summary)
+        pd.util.testing.assert_frame_equal(exposures_summary,
+                                           expected_exposures_summary)
+
+        # A precomputed result is displayed without attributing again.
+        show_perf_attrib_stats(None, None, None, None,
+                               perf_attrib_result=result)
+
+    def test_compute_exposures_by_codes(self):
+        (returns,
+         positions,
+         factor_returns,
+         factor_loadings) = generate_toy_risk_model_output(periods=20,
+                                                           num_styles=3)
+        positions.iloc[::4, 1] = 0.0
+        factor_loadings.iloc[::5, 0] = np.nan
+
+        expected = ep.compute_exposures(_stack_positions(positions),
+                                        factor_loadings)
+
+        # Unsorted loadings, expanded a few dates at a time.
+        shuffled_loadings = factor_loadings.sample(frac=1, random_state=1)
+        pd.util.testing.assert_frame_equal(
+            _compute_exposures_by_codes(positions, shuffled_loadings,
+                                        block_size=20),
+            expected, check_freq=False)
+
+        pd.util.testing.assert_frame_equal(
+            compute_exposures(SparsePositions.from_frame(positions),
+                              factor_loadings),
+            expected, check_freq=False)
+
+        # Loadings repeated for a date and ticker add up.
+        duplicated_loadings = pd.concat([factor_loadings,
+                                         factor_loadings.iloc[::3]])
+        pd.util.testing.assert_frame_equal(
+            _compute_exposures_by_codes(positions, duplicated_loadings,
+                                        block_size=20),
+            expected.add(ep.compute_exposures(_stack_positions(positions),
+                                              factor_loadings.iloc[::3]),
+                         fill_value=0),
+            check_freq=False)
+
+    def test_perf_attrib_chunked(self):
+        (returns,
+         positions,
+         factor_returns,
+         factor_loadings) = generate_toy_risk_model_output(periods=20)
+
+        # One date and one stock without loadings.
+        factor_loadings = factor_loadings.drop(
+            returns.index[5], level='dt').drop('XOM', level='ticker')
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+
+            expected_exposures, expected_perf_attrib = perf_attrib(
+                returns, positions, factor_returns, factor_loadings)
+
+            daily_chunks = (loadings for _, loadings in
+                            factor_loadings.groupby(level='dt'))
+            exposures, perf_attrib_output = perf_attrib_chunked(
+                returns, positions, factor_returns, daily_chunks)
+
+            pd.util.testing.assert_frame_equal(exposures, expected_exposures,
+                                               check_freq=False)
+            pd.util.testing.assert_frame_equal(perf_attrib_output,
+                                               expected_perf_attrib,
+                                               check_freq=False)
+
+            def load(dates):
+                dts = factor_loadings.index.get_level_values('dt')
+                return factor_loadings[dts.isin(dates)]
+
+            exposures, perf_attrib_output = perf_attrib_chunked(
+                returns, positions, factor_returns, load, dates_per_chunk=3)
+
+            pd.util.testing.assert_frame_equal(perf_attrib_output,
+                                               expected_perf_attrib,
+                                               check_freq=False)
+
+    def test_create_perf_attrib_horizon_stats(self):
+        (returns,
+         positions,
+         factor_returns,
+         factor_loadings) = generate_toy_risk_model_output(
+             start_date='2017-01-20', periods=41)
+
+        result = perf_attrib(returns, positions, factor_returns,
+                             factor_loadings)
+        perf_attrib_data = result.perf_attrib
+
+        stats = create_perf_attrib_horizon_stats(result, windows=(5, 30))
+
+        self.assertEqual(
+            list(stats.index.get_level_values('horizon').unique()),
+            ['5D', '30D', 'M'])
+        self.assertEqual(len(stats.loc['5D']), 37)
+        self.assertEqual(len(stats.loc['30D']), 12)
+        # Jan 20-31, February and Mar 1.
+        self.assertEqual(list(stats.loc['M'].index),
+                         list(pd.to_datetime(['2017-01-31', '2017-02-28',
+                                              '2017-03-01'])))
+
+        for horizon, dt, start, stop in [('5D', '2017-01-24', 0, 5),
+                                         ('30D', '2017-03-01', 11, 41),
+                                         ('M', '2017-02-28', 12, 40)]:
+            window = perf_attrib_data.iloc[start:stop]
+            row = stats.loc[(horizon, pd.Timestamp(dt))]
+            for column in perf_attrib_data.columns:
+                self.assertAlmostEqual(
+                    row['Cumulative Return', column],
+                    ep.cum_returns_final(window[column]))
+                self.assertAlmostEqual(
+                    row['Annualized Return', column],
+                    ep.annual_return(window[column]))
+
     def test_cumulative_returns_less_costs(self):
 
         returns = pd.Series(
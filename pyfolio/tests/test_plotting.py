@@ -0,0 +1,163 @@
+from unittest import TestCase
+
+import empyrical as ep
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.testing.decorators import cleanup
+from pandas.util.testing import assert_series_equal
+
+from pyfolio import plotting
+from pyfolio.analysis import AnalysisContext
+from pyfolio.tears import (create_position_tear_sheet,
+                           create_returns_tear_sheet)
+
+
+class DownsampleTestCase(TestCase):
+    dates = pd.date_range('2015-01-01', periods=100000, freq='min',
+                          tz='UTC')
+
+    def setUp(self):
+        rng = np.random.RandomState(3)
+        self.series = pd.Series(rng.randn(len(self.dates)).cumsum(),
+                                index=self.dates)
+
+    def assert_envelope_kept(self, series, downsampled, buckets):
+        # Within each bucket of time, the extremes and both ends are kept.
+        edges = np.linspace(series.index.asi8[0], series.index.asi8[-1],
+                            buckets + 1)[1:-1]
+        bucket = np.searchsorted(edges, series.index.asi8, side='right')
+        kept_bucket = np.searchsorted(edges, downsampled.index.asi8,
+                                      side='right')
+        for agg in ('min', 'max', 'first', 'last'):
+            assert_series_equal(
+                downsampled.groupby(kept_bucket).agg(agg),
+                series.groupby(bucket).agg(agg))
+
+    def test_downsample(self):
+        downsampled = plotting.downsample(self.series, buckets=100)
+
+        self.assertLessEqual(len(downsampled), 400)
+        self.assertTrue(downsampled.index.is_monotonic_increasing)
+        self.assertTrue(downsampled.index.isin(self.series.index).all())
+        self.assertEqual(downsampled.min(), self.series.min())
+        self.assertEqual(downsampled.max(), self.series.max())
+        self.assert_envelope_kept(self.series, downsampled, 100)
+
+    def test_downsample_frame(self):
+        frame = pd.DataFrame({'a': self.series, 'b': -self.series.shift(7)})
+        downsampled = plotting.downsample(frame, buckets=100)
+
+        self.assertLessEqual(len(downsampled), 800)
+        self.assertEqual(downsampled.b.min(), frame.b.min())
+        self.assertEqual(downsampled.a.idxmax(), frame.a.idxmax())
+        # The leading NaNs of b do not hide the values of its first bucket.
+        first_bucket = frame.index[999]
+        self.assertEqual(downsampled.b.loc[:first_bucket].max(),
+                         frame.b.loc[:first_bucket].max())
+
+    def test_short_series_unchanged(self):
+        short = self.series.iloc[:400]
+        self.assertIs(plotting.downsample(short, buckets=100), short)
+
+    def test_use_downsampling(self):
+        short = self.series.iloc[:plotting.DEFAULT_DOWNSAMPLE_THRESHOLD]
+        self.assertIs(plotting._downsample(short), short)
+        with plotting.use_downsampling(threshold=None):
+            self.assertEqual(len(plotting._downsample(self.series)),
+                             len(self.series))
+        with plotting.use_downsampling(threshold=1000, buckets=10):
+            self.assertLessEqual(len(plotting._downsample(self.series)), 40)
+        self.assertLessEqual(len(plotting._downsample(self.series)),
+                             4 * plotting.DEFAULT_DOWNSAMPLE_BUCKETS)
+
+
+class SharedAxesTestCase(TestCase):
+    # Long enough to be downsampled, with a regular frequency, for which
+    # pandas would use a period axis.
+    dates = pd.bdate_range('1990-01-01', periods=7800, tz='UTC')
+
+    def setUp(self):
+        rng = np.random.RandomState(5)
+        self.returns = pd.Series(rng.randn(len(self.dates)) * 0.01,
+                                 index=self.dates)
+        self.benchmark_rets = pd.Series(
+            rng.randn(len(self.dates)) * 0.01, index=self.dates,
+            name='benchmark')
+        self.positions = pd.DataFrame({
+            'A': 1e6 * (1 + self.returns).cumprod(),
+            'B': -3e5,
+            'cash': 5e5,
+        }, index=self.dates)
+
+    @cleanup
+    def test_returns_tear_sheet(self):
+        fig = create_returns_tear_sheet(self.returns,
+                                        benchmark_rets=self.benchmark_rets,
+                                        live_start_date=self.dates[7000],
+                                        return_fig=True)
+        self.assertEqual(shared_axes_outside_xlim(fig), [])
+
+    @cleanup
+    def test_position_tear_sheet(self):
+        fig = create_position_tear_sheet(self.returns, self.positions,
+                                         return_fig=True)
+        self.assertEqual(shared_axes_outside_xlim(fig), [])
+
+
+class AnalysisContextTestCase(TestCase):
+    dates = pd.date_range('2015-01-01', periods=300, tz='UTC')
+
+    def setUp(self):
+        rng = np.random.RandomState(11)
+        self.returns = pd.Series(rng.randn(len(self.dates)) * 0.01,
+                                 index=self.dates)
+        self.context = AnalysisContext(self.returns)
+
+    @cleanup
+    def test_other_returns(self):
+        # Returns other than those of the context, e.g. out of sample.
+        returns = self.returns.iloc[100:] * 2
+        expected = ep.cum_returns(returns, 1.0).values
+
+        ax = plotting.plot_drawdown_periods(
+            returns, top=3, analysis_context=self.context,
+            ax=plt.figure().gca())
+        np.testing.assert_allclose(ax.lines[0].get_ydata(), expected)
+
+        ax = plotting.plot_rolling_returns(
+            returns, analysis_context=self.context, ax=plt.figure().gca())
+        np.testing.assert_allclose(ax.lines[0].get_ydata(), expected)
+
+        ax = plotting.plot_drawdown_underwater(
+            returns, analysis_context=self.context, ax=plt.figure().gca())
+        vertices = ax.collections[0].get_paths()[0].vertices
+        self.assertAlmostEqual(vertices[:, 1].min(),
+                               100 * ep.max_drawdown(returns))
+
+
+def shared_axes_outside_xlim(fig, tolerance=0.01):
+    """
+    Titles of the axes of fig that share their x axis and draw data
+    outside of their x limits, by more than tolerance times their width.
+    Plots clipped on purpose, e.g. monthly averages labeled at month end,
+    stay within the tolerance, whereas data drawn in the units of another
+    kind of axis does not.
+    """
+
+    fig.canvas.draw()
+    outside = []
+    for ax in fig.axes:
+        if len(ax.get_shared_x_axes().get_siblings(ax)) < 2:
+            continue
+        left, right = sorted(ax.get_xlim())
+        margin = tolerance * (right - left)
+        xs = [line.get_xydata()[:, 0] for line in ax.lines
+              if line.get_transform() == ax.transData]
+        xs += [path.vertices[:, 0] for collection in ax.collections
+               for path in collection.get_paths()]
+        xs = [x[np.isfinite(x)] for x in xs]
+        if any(((x < left - margin) | (x > right + margin)).any()
+               for x in xs):
+            outside.append(ax.get_title() or ax.get_ylabel())
+    return outside
@@ -11,22 +11,29 @@ from pandas import (
     Timestamp,
     read_csv
 )
-from pandas.util.testing import assert_frame_equal
+from pandas.util.testing import assert_frame_equal, assert_series_equal
+from numpy.testing import assert_array_equal
 
 from numpy import (
     arange,
+    array,
     zeros_like,
     nan,
 )
 
 import warnings
 
+from pyfolio import utils
+from pyfolio.sparse import SparsePositions
 from pyfolio.utils import (to_utc, to_series, check_intraday,
                            detect_intraday, estimate_intraday)
 from pyfolio.pos import (get_percent_alloc,
                          extract_pos,
                          get_sector_exposures,
-                         get_max_median_position_concentration)
+                         SectorMapping,
+                         get_max_median_position_concentration,
+                         get_exposure_summary,
+                         get_top_long_short_abs)
 
 
 class PositionsTestCase(TestCase):
@@ -103,7 +110,14 @@ class PositionsTestCase(TestCase):
          {0: 'A', 1: 'B'},
          DataFrame([[1.0, 2.0, 10.0]]*len(dates),
                    columns=['A', 'B', 'cash'], index=dates),
-         True)
+         True),
+        # Symbols mapped to NaN are left out, without a warning.
+        (DataFrame([[1.0, 2.0, 3.0, 10.0]]*len(dates),
+                   columns=[0, 1, 2, 'cash'], index=dates),
+         {0: 'A', 1: 'B', 2: nan},
+         DataFrame([[1.0, 2.0, 10.0]]*len(dates),
+                   columns=['A', 'B', 'cash'], index=dates),
+         False)
     ])
     def test_sector_exposure(self, positions, mapping,
                              expected_sector_exposure,
@@ -123,6 +137,18 @@ class PositionsTestCase(TestCase):
             else:
                 self.assertEqual(len(w), 0)
 
+    def test_sector_exposure_sparse(self):
+        positions = DataFrame([[1.0, 0.0, 3.0, 10.0],
+                               [0.0, -2.0, 0.0, 10.0]],
+                              columns=['x', 'y', 'z', 'cash'],
+                              index=self.dates[:2])
+        mapping = SectorMapping({'x': 'A', 'y': 'B', 'z': 'A'})
+
+        assert_frame_equal(
+            get_sector_exposures(SparsePositions.from_frame(positions),
+                                 mapping),
+            get_sector_exposures(positions, mapping))
+
     @parameterized.expand([
         (DataFrame([[1.0, 2.0, 3.0, 14.0]]*len(dates),
                    columns=[0, 1, 2, 'cash'], index=dates),
@@ -144,6 +170,59 @@ class PositionsTestCase(TestCase):
         alloc_summary = get_max_median_position_concentration(positions)
         assert_frame_equal(expected, alloc_summary)
 
+    def test_get_top_long_short_abs(self):
+        positions = DataFrame([[1.0, -2.0, nan, 5.0, 0.5, 100.0],
+                               [3.0, -1.0, nan, -4.0, 0.2, -100.0]],
+                              columns=['A', 'B', 'C', 'D', 'E', 'cash'],
+                              index=self.dates[:2])
+
+        df_top_long, df_top_short, df_top_abs = get_top_long_short_abs(
+            positions, top=2)
+
+        assert_series_equal(df_top_long, Series([5.0, 3.0], index=['D', 'A']))
+        assert_series_equal(df_top_short,
+                            Series([-4.0, -2.0], index=['D', 'B']))
+        assert_series_equal(df_top_abs, Series([5.0, 3.0], index=['D', 'A']))
+
+    @parameterized.expand([(1,), (2,), (1024,)])
+    def test_get_exposure_summary(self, block_rows):
+        positions = DataFrame([[1.0, -2.0, nan, 4.0],
+                               [0.0, 3.0, 5.0, -1.0],
+                               [-1.0, -1.0, 0.0, 0.0]],
+                              columns=['A', 'B', 'C', 'cash'],
+                              index=self.dates[:3])
+
+        summary = get_exposure_summary(positions, block_rows=block_rows)
+
+        expected = DataFrame(
+            OrderedDict([
+                ('long', [1.0, 8.0, 0.0]),
+                ('short', [-2.0, 0.0, -2.0]),
+                ('gross', [3.0, 8.0, 2.0]),
+                ('net', [-1.0, 8.0, -2.0]),
+                ('cash', [4.0, -1.0, 0.0]),
+                ('portfolio_value', [3.0, 7.0, -2.0]),
+                ('long_count', [1, 2, 0]),
+                ('short_count', [1, 0, 2]),
+                ('gross_leverage', [1.0, 8.0 / 7.0, -1.0]),
+            ]),
+            index=self.dates[:3])
+
+        assert_frame_equal(summary, expected)
+
+    def test_get_exposure_summary_large_cash(self):
+        # Cash is left out of the sums of holdings rather than subtracted
+        # from them, which would lose small holdings next to large cash.
+        positions = DataFrame([[1.0, -2.0, 1e17],
+                               [3.0, -4.0, -1e17]],
+                              columns=['A', 'B', 'cash'],
+                              index=self.dates[:2])
+
+        summary = get_exposure_summary(positions)
+
+        self.assertEqual(list(summary['long']), [1.0, 3.0])
+        self.assertEqual(list(summary['short']), [-2.0, -4.0])
+
     __location__ = os.path.realpath(
         os.path.join(os.getcwd(), os.path.dirname(__file__)))
 
@@ -168,6 +247,19 @@ class PositionsTestCase(TestCase):
         detected = detect_intraday(positions, transactions, threshold=0.25)
         assert detected == expected
 
+    @parameterized.expand([
+        (test_pos, test_txn, False),
+        (test_pos.resample('1W').last(), test_txn, True)
+    ])
+    def test_detect_intraday_blocks(self, positions, transactions, expected):
+        block_size = utils.DETECT_INTRADAY_BLOCK_SIZE
+        try:
+            utils.DETECT_INTRADAY_BLOCK_SIZE = 100
+            detected = detect_intraday(positions, transactions)
+            assert detected == expected
+        finally:
+            utils.DETECT_INTRADAY_BLOCK_SIZE = block_size
+
     @parameterized.expand([
         ('infer', test_returns, test_pos, test_txn, test_pos),
         (False, test_returns, test_pos, test_txn, test_pos)
@@ -185,3 +277,43 @@ class PositionsTestCase(TestCase):
                                transactions, expected):
         intraday_pos = estimate_intraday(returns, positions, transactions)
         assert intraday_pos.shape == expected
+
+    def test_estimate_intraday_peak_exposure(self):
+        dates = date_range('2015-01-05', periods=2, freq='D', tz='UTC')
+        returns = Series([0.0, 0.0], index=dates)
+        positions = DataFrame([[0.0, 0.0, 1000.0]] * 2,
+                              columns=['A', 'B', 'cash'], index=dates)
+        transactions = DataFrame(
+            {'symbol': ['A', 'B', 'A', 'B'],
+             'amount': [10, -5, -10, 5],
+             'price': [10.0, 20.0, 10.0, 20.0]},
+            index=[Timestamp('2015-01-05 15:00', tz='UTC'),
+                   Timestamp('2015-01-05 16:00', tz='UTC'),
+                   Timestamp('2015-01-05 17:00', tz='UTC'),
+                   Timestamp('2015-01-06 15:00', tz='UTC')])
+
+        result = estimate_intraday(returns, positions, transactions)
+
+        # Exposure peaks at 16:00 on the first day, after both fills.
+        expected = DataFrame([[100.0, -100.0, 1000.0],
+                              [0.0, 100.0, 900.0]],
+                             columns=['A', 'B', 'cash'], index=dates)
+        expected.index.name = 'period_close'
+        expected.columns.name = 'sid'
+
+        assert_frame_equal(result, expected)
+
+        # Transactions modified in place are estimated afresh.
+        transactions['amount'] *= 2
+        expected[['A', 'B']] *= 2
+        expected['cash'] = [1000.0, 800.0]
+        assert_frame_equal(
+            estimate_intraday(returns, positions, transactions), expected)
+
+    def test_segmented_cumsum(self):
+        values = array([1e16, 1.0, 0.1, 0.2, 3.0])
+        segment_start = array([True, True, False, False, True])
+
+        # Sums of a segment do not depend on the preceding segments.
+        assert_array_equal(utils._segmented_cumsum(values, segment_start),
+                           [1e16, 1.0, 1.0 + 0.1, 1.0 + 0.1 + 0.2, 3.0])
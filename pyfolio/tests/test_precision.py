@@ -0,0 +1,120 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from pyfolio import precision
+from pyfolio.capacity import days_to_liquidate_positions
+from pyfolio.perf_attrib import compute_exposures, perf_attrib_chunked
+from pyfolio.pos import get_exposure_summary, get_percent_alloc
+from pyfolio.tests.test_perf_attrib import generate_toy_risk_model_output
+
+
+class PrecisionTestCase(TestCase):
+    dates = pd.date_range('2015-01-01', periods=30, tz='UTC')
+    symbols = ['S{}'.format(i) for i in range(50)]
+
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.positions = pd.DataFrame(
+            rng.randn(len(self.dates), len(self.symbols)) * 1e5,
+            index=self.dates, columns=self.symbols)
+        self.positions['cash'] = 1e7
+
+        volume = pd.DataFrame(rng.randint(1e4, 1e6, self.positions.shape),
+                              index=self.dates,
+                              columns=self.positions.columns, dtype=float)
+        price = pd.DataFrame(rng.uniform(10, 100, self.positions.shape),
+                             index=self.dates,
+                             columns=self.positions.columns)
+        self.market_data = pd.concat(
+            [volume.assign(market_data='volume'),
+             price.assign(market_data='price')]
+        ).rename_axis('dt').reset_index().set_index(['dt', 'market_data'])
+
+    def tearDown(self):
+        precision.set_precision('float64')
+
+    def assert_close(self, result, expected, scale=None):
+        result = np.asarray(result, dtype=np.float64)
+        expected = np.asarray(expected, dtype=np.float64)
+        if scale is None:
+            scale = np.abs(expected)
+        np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+        error = np.nan_to_num(np.abs(result - expected))
+        bound = np.nan_to_num(precision.FLOAT32_RTOL * scale)
+        self.assertTrue((error <= bound).all())
+
+    def test_default_precision(self):
+        self.assertEqual(precision.get_precision(), 'float64')
+        self.assertIs(precision.to_panel(self.positions), self.positions)
+        assert_frame_equal(get_percent_alloc(self.positions),
+                           self.positions.divide(
+                               self.positions.sum(axis='columns'),
+                               axis='rows'))
+
+    def test_unknown_precision(self):
+        with self.assertRaises(ValueError):
+            precision.set_precision('float16')
+        self.assertEqual(precision.get_precision(), 'float64')
+
+    def test_use_precision(self):
+        with precision.use_precision('float32'):
+            self.assertEqual(precision.get_precision(), 'float32')
+            frame = precision.to_panel(
+                pd.DataFrame({'A': [1.5], 'B': ['x'], 'C': [1]}))
+        self.assertEqual(precision.get_precision(), 'float64')
+        self.assertEqual(list(frame.dtypes),
+                         [np.float32, np.object_, np.int64])
+
+    def test_allocations(self):
+        expected = get_percent_alloc(self.positions)
+        with precision.use_precision('float32'):
+            result = get_percent_alloc(self.positions)
+        self.assertTrue((result.dtypes == np.float32).all())
+        self.assertEqual(result.values.nbytes * 2, expected.values.nbytes)
+        self.assert_close(result, expected)
+
+    def test_days_to_liquidate(self):
+        expected = days_to_liquidate_positions(self.positions,
+                                               self.market_data)
+        with precision.use_precision('float32'):
+            result = days_to_liquidate_positions(self.positions,
+                                                 self.market_data)
+        self.assertTrue((result.dtypes == np.float32).all())
+        self.assert_close(result, expected)
+
+    def test_sums(self):
+        expected = get_exposure_summary(self.positions)
+        with precision.use_precision('float32'):
+            panel = precision.to_panel(self.positions)
+            result = get_exposure_summary(panel)
+        self.assertEqual(result['net'].dtype, np.float64)
+        scale = self.positions.drop('cash', axis=1).abs().sum(axis=1)
+        self.assert_close(result['net'], expected['net'], scale=scale)
+
+    def test_exposures(self):
+        (returns,
+         positions,
+         factor_returns,
+         factor_loadings) = generate_toy_risk_model_output(periods=40)
+
+        expected = compute_exposures(positions, factor_loadings)
+        expected_chunked, _ = perf_attrib_chunked(
+            returns, positions, factor_returns, [factor_loadings])
+        with precision.use_precision('float32'):
+            result = compute_exposures(positions, factor_loadings)
+            result_chunked, _ = perf_attrib_chunked(
+                returns, positions, factor_returns, [factor_loadings])
+
+        # Bounded by the sum of |allocation x loading| over tickers.
+        alloc = get_percent_alloc(positions).drop('cash', axis=1)
+        loadings = factor_loadings.abs().unstack().reindex(alloc.index)
+        scale = pd.DataFrame({
+            factor: (alloc.abs() * loadings[factor]).sum(axis=1)
+            for factor in factor_loadings.columns})
+
+        self.assert_close(result, expected, scale=scale)
+        self.assert_close(result_chunked, expected_chunked,
+                          scale=scale.reindex(expected_chunked.index))
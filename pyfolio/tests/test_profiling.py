@@ -0,0 +1,105 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+from pandas import read_csv
+
+from pyfolio import profiling
+from pyfolio.compute import compute_returns_tear_sheet
+from pyfolio.utils import to_utc, to_series
+
+__location__ = os.path.realpath(
+    os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+
+@profiling.timed
+def allocate(n):
+    return np.ones(n)
+
+
+@profiling.timed
+def outer():
+    with profiling.stage('inner'):
+        allocate(10 ** 6)
+    return allocate(10)
+
+
+class ProfilingTestCase(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_nested_stages(self):
+        timings = []
+        path = os.path.join(self.output_dir, 'timings.json')
+
+        with profiling.profile(callback=timings.append,
+                               path=path) as report:
+            outer()
+
+        self.assertEqual(
+            [(s.name, s.path, s.depth) for s in report.stages],
+            [('outer', 'outer', 0),
+             ('inner', 'outer/inner', 1),
+             ('allocate', 'outer/inner/allocate', 2),
+             ('allocate', 'outer/allocate', 1)])
+
+        # The callback sees each stage as it finishes.
+        self.assertEqual([s.path for s in timings],
+                         ['outer/inner/allocate', 'outer/inner',
+                          'outer/allocate', 'outer'])
+
+        stages = {s.path: s for s in report.stages}
+        if profiling.tracemalloc is not None:
+            self.assertGreaterEqual(
+                stages['outer/inner/allocate'].peak_memory, 8 * 10 ** 6)
+            self.assertGreaterEqual(stages['outer'].peak_memory,
+                                    stages['outer/inner'].peak_memory)
+            # Without reset_peak (Python < 3.9), the peak of a stage can
+            # include the peak of an earlier stage.
+            if hasattr(profiling.tracemalloc, 'reset_peak'):
+                self.assertLess(stages['outer/allocate'].peak_memory,
+                                10 ** 6)
+        self.assertGreaterEqual(stages['outer'].wall_time,
+                                stages['outer/inner'].wall_time)
+
+        with open(path) as f:
+            self.assertEqual(json.load(f),
+                             [s._asdict() for s in report.stages])
+
+        summary = report.summary()
+        self.assertEqual(summary.loc['allocate', 'count'], 2)
+
+    def test_without_memory(self):
+        with profiling.profile(trace_memory=False) as report:
+            outer()
+
+        self.assertEqual(len(report.stages), 4)
+        self.assertTrue(all(s.peak_memory is None for s in report.stages))
+
+    def test_not_profiling(self):
+        with profiling.profile() as report:
+            pass
+        outer()
+
+        self.assertEqual(report.stages, [])
+
+    def test_tear_sheet_stages(self):
+        returns = to_series(to_utc(read_csv(
+            gzip.open(__location__ + '/test_data/test_returns.csv.gz'),
+            index_col=0, parse_dates=True))).iloc[:300]
+
+        with profiling.profile() as report:
+            compute_returns_tear_sheet(returns)
+
+        frame = report.to_frame()
+        self.assertEqual(frame.path.iloc[0], 'compute_returns_tear_sheet')
+        self.assertIn('compute_returns_tear_sheet/perf_stats',
+                      set(frame.path))
+        self.assertIn('gen_drawdown_table', set(frame.name))
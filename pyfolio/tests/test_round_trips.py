@@ -11,6 +11,7 @@ from pandas import (
     read_csv
 )
 from pandas.util.testing import (assert_frame_equal)
+from numpy import nan
 
 import os
 import gzip
@@ -18,6 +19,7 @@ import gzip
 from pyfolio.round_trips import (extract_round_trips,
                                  add_closing_transactions,
                                  _groupby_consecutive,
+                                 apply_sector_mappings_to_round_trips,
                                  )
 
 
@@ -171,6 +173,38 @@ class RoundTripTestCase(TestCase):
         transactions_closed = add_closing_transactions(positions, transactions)
         assert_frame_equal(transactions_closed, expected)
 
+    @parameterized.expand([
+        ({'A': 'Tech', 'B': 'Energy'},),
+        (Series({'A': 'Tech', 'B': 'Energy'}),),
+    ])
+    def test_apply_sector_mappings_to_round_trips(self, sector_mappings):
+        round_trips = DataFrame(data=[['A', 1.0],
+                                      ['C', 2.0],
+                                      ['B', 3.0]],
+                                columns=['symbol', 'pnl'])
+        expected = DataFrame(data=[['Tech', 1.0],
+                                   ['No Sector Mapping', 2.0],
+                                   ['Energy', 3.0]],
+                             columns=['symbol', 'pnl'])
+
+        sector_round_trips = apply_sector_mappings_to_round_trips(
+            round_trips, sector_mappings)
+        assert_frame_equal(sector_round_trips, expected)
+
+    def test_apply_sector_mappings_to_round_trips_nan_sector(self):
+        round_trips = DataFrame(data=[['A', 1.0],
+                                      ['C', 2.0],
+                                      ['B', 3.0]],
+                                columns=['symbol', 'pnl'])
+        expected = DataFrame(data=[['Tech', 1.0],
+                                   ['No Sector Mapping', 2.0]],
+                             columns=['symbol', 'pnl'])
+
+        # Round trips in symbols mapped to NaN are dropped.
+        sector_round_trips = apply_sector_mappings_to_round_trips(
+            round_trips, {'A': 'Tech', 'B': nan})
+        assert_frame_equal(sector_round_trips, expected)
+
     def test_txn_pnl_matches_round_trip_pnl(self):
         __location__ = os.path.realpath(
             os.path.join(os.getcwd(), os.path.dirname(__file__)))
@@ -0,0 +1,64 @@
+from __future__ import division
+
+import gzip
+import os
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.util.testing import (assert_frame_equal,
+                                 assert_series_equal)
+
+from pyfolio.pos import get_percent_alloc, get_long_short_pos
+from pyfolio.perf_attrib import _stack_positions
+from pyfolio.sparse import SparsePositions
+from pyfolio.timeseries import gross_lev
+from pyfolio.utils import to_utc
+
+
+class SparsePositionsTestCase(TestCase):
+    __location__ = os.path.realpath(
+        os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+    test_pos = to_utc(pd.read_csv(
+        gzip.open(__location__ + '/test_data/test_pos.csv.gz'),
+        index_col=0, parse_dates=True)).fillna(0)
+
+    dates = pd.date_range(start='2015-01-01', freq='D', periods=3)
+    positions = pd.DataFrame([[1.0, 0.0, -2.0, 5.0],
+                              [0.0, 0.0, 0.0, 10.0],
+                              [0.0, 3.0, np.nan, 1.0]],
+                             columns=['A', 'B', 'C', 'cash'], index=dates)
+
+    def test_round_trip(self):
+        sparse_pos = SparsePositions.from_frame(self.positions)
+
+        self.assertEqual(sparse_pos.nnz, 3)
+        assert_frame_equal(sparse_pos.to_frame(),
+                           self.positions.fillna(0))
+
+    def test_from_stacked(self):
+        stacked = self.positions.drop('cash', axis=1).stack()
+        sparse_pos = SparsePositions.from_stacked(stacked,
+                                                  self.positions.cash)
+
+        assert_frame_equal(sparse_pos.to_frame(),
+                           self.positions.fillna(0))
+
+    def test_matches_dense(self):
+        sparse_pos = SparsePositions.from_frame(self.test_pos)
+
+        assert_frame_equal(
+            get_percent_alloc(sparse_pos).to_frame(),
+            get_percent_alloc(self.test_pos))
+        assert_frame_equal(get_long_short_pos(sparse_pos),
+                           get_long_short_pos(self.test_pos))
+        assert_series_equal(gross_lev(sparse_pos),
+                            gross_lev(self.test_pos))
+
+    def test_stack_positions(self):
+        sparse_pos = SparsePositions.from_frame(self.positions)
+        stacked = _stack_positions(self.positions)
+
+        assert_series_equal(_stack_positions(sparse_pos),
+                            stacked[stacked != 0])
@@ -8,6 +8,7 @@ import gzip
 
 from pandas import read_csv
 
+from pyfolio.analysis import AnalysisContext
 from pyfolio.utils import (to_utc, to_series)
 from pyfolio.tears import (create_full_tear_sheet,
                            create_simple_tear_sheet,
@@ -52,6 +53,21 @@ class PositionsTestCase(TestCase):
                                **kwargs
                                )
 
+    @cleanup
+    def test_create_tear_sheets_with_analysis_context(self):
+        context = AnalysisContext(self.test_returns, self.test_pos,
+                                  self.test_txn)
+
+        create_full_tear_sheet(self.test_returns,
+                               positions=self.test_pos,
+                               transactions=self.test_txn,
+                               benchmark_rets=self.test_returns,
+                               analysis_context=context)
+        create_simple_tear_sheet(self.test_returns,
+                                 positions=self.test_pos,
+                                 transactions=self.test_txn,
+                                 analysis_context=context)
+
     @parameterized.expand([({},),
                            ({'slippage': 1},),
                            ({'live_start_date': test_returns.index[-20]},),
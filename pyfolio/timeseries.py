@@ -22,10 +22,12 @@ import numpy as np
 import pandas as pd
 import scipy as sp
 import scipy.stats as stats
-from sklearn import linear_model
 
+from .cache import cached
 from .deprecate import deprecated
 from .interesting_periods import PERIODS
+from .pos import get_exposure_summary
+from .profiling import timed
 from .txn import get_turnover
 from .utils import APPROX_BDAYS_PER_MONTH, APPROX_BDAYS_PER_YEAR
 from .utils import DAILY
@@ -504,6 +506,7 @@ def aggregate_returns(returns, convert_to):
     return ep.aggregate_returns(returns, convert_to=convert_to)
 
 
+@timed
 def rolling_beta(returns, factor_returns,
                  rolling_window=APPROX_BDAYS_PER_MONTH * 6):
     """
@@ -548,6 +551,8 @@ def rolling_beta(returns, factor_returns,
         return out
 
 
+@timed
+@cached
 def rolling_regression(returns, factor_returns,
                        rolling_window=APPROX_BDAYS_PER_MONTH * 6,
                        nan_threshold=0.1):
@@ -578,6 +583,8 @@ def rolling_regression(returns, factor_returns,
         DataFrame containing rolling beta coefficients to SMB, HML and UMD
     """
 
+    from sklearn import linear_model
+
     # We need to drop NaNs to regress
     ret_no_na = returns.dropna()
 
@@ -609,7 +616,7 @@ def gross_lev(positions):
 
     Parameters
     ----------
-    positions : pd.DataFrame
+    positions : pd.DataFrame or SparsePositions
         Daily net position values.
          - See full explanation in tears.create_full_tear_sheet.
 
@@ -619,8 +626,7 @@ def gross_lev(positions):
         Gross leverage.
     """
 
-    exposure = positions.drop('cash', axis=1).abs().sum(axis=1)
-    return exposure / positions.sum(axis=1)
+    return get_exposure_summary(positions)['gross_leverage']
 
 
 def value_at_risk(returns, period=None, sigma=2.0):
@@ -689,8 +695,10 @@ STAT_FUNC_NAMES = {
 }
 
 
+@timed
 def perf_stats(returns, factor_returns=None, positions=None,
-               transactions=None, turnover_denom='AGB'):
+               transactions=None, turnover_denom='AGB',
+               exposure_summary=None, turnover=None):
     """
     Calculates various performance metrics of a strategy, for use in
     plotting.show_perf_stats.
@@ -714,6 +722,11 @@ def perf_stats(returns, factor_returns=None, positions=None,
     turnover_denom : str
         Either AGB or portfolio_value, default AGB.
         - See full explanation in txn.get_turnover.
+    exposure_summary : pd.DataFrame, optional
+        Precomputed pos.get_exposure_summary(positions).
+    turnover : pd.Series, optional
+        Precomputed txn.get_turnover(positions, transactions,
+        turnover_denom).
 
     Returns
     -------
@@ -726,11 +739,14 @@ def perf_stats(returns, factor_returns=None, positions=None,
         stats[STAT_FUNC_NAMES[stat_func.__name__]] = stat_func(returns)
 
     if positions is not None:
-        stats['Gross leverage'] = gross_lev(positions).mean()
+        if exposure_summary is None:
+            exposure_summary = get_exposure_summary(positions)
+        stats['Gross leverage'] = exposure_summary['gross_leverage'].mean()
         if transactions is not None:
-            stats['Daily turnover'] = get_turnover(positions,
-                                                   transactions,
-                                                   turnover_denom).mean()
+            if turnover is None:
+                turnover = get_turnover(positions, transactions,
+                                        turnover_denom)
+            stats['Daily turnover'] = turnover.mean()
     if factor_returns is not None:
         for stat_func in FACTOR_STAT_FUNCS:
             res = stat_func(returns, factor_returns)
@@ -739,6 +755,7 @@ def perf_stats(returns, factor_returns=None, positions=None,
     return stats
 
 
+@timed
 def perf_stats_bootstrap(returns, factor_returns=None, return_stats=True,
                          **kwargs):
     """Calculates various bootstrapped performance metrics of a strategy.
@@ -928,6 +945,7 @@ def get_max_drawdown(returns):
     return get_max_drawdown_underwater(underwater)
 
 
+@timed
 def get_top_drawdowns(returns, top=10):
     """
     Finds top drawdowns, sorted by drawdown amount.
@@ -971,6 +989,7 @@ def get_top_drawdowns(returns, top=10):
     return drawdowns
 
 
+@timed
 def gen_drawdown_table(returns, top=10):
     """
     Places top drawdowns in a table.
@@ -1146,6 +1165,8 @@ def summarize_paths(samples, cone_std=(1., 1.5, 2.), starting_value=1.):
     return cone_bounds
 
 
+@timed
+@cached(seed='random_seed')
 def forecast_cone_bootstrap(is_returns, num_days, cone_std=(1., 1.5, 2.),
                             starting_value=1, num_samples=1000,
                             random_seed=None):
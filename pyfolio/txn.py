@@ -16,6 +16,8 @@ from __future__ import division
 
 import pandas as pd
 
+from .profiling import timed
+
 
 def map_transaction(txn):
     """
@@ -111,7 +113,7 @@ def get_txn_vol(transactions):
 
 
 def adjust_returns_for_slippage(returns, positions, transactions,
-                                slippage_bps):
+                                slippage_bps, txn_vol=None):
     """
     Apply a slippage penalty for every dollar traded.
 
@@ -128,6 +130,8 @@ def adjust_returns_for_slippage(returns, positions, transactions,
          - See full explanation in create_full_tear_sheet.
     slippage_bps: int/float
         Basis points of slippage to apply.
+    txn_vol : pd.DataFrame, optional
+        Precomputed get_txn_vol(transactions).
 
     Returns
     -------
@@ -138,7 +142,9 @@ def adjust_returns_for_slippage(returns, positions, transactions,
     slippage = 0.0001 * slippage_bps
     portfolio_value = positions.sum(axis=1)
     pnl = portfolio_value * returns
-    traded_value = get_txn_vol(transactions).txn_volume
+    if txn_vol is None:
+        txn_vol = get_txn_vol(transactions)
+    traded_value = txn_vol.txn_volume
     slippage_dollars = traded_value * slippage
     adjusted_pnl = pnl.add(-slippage_dollars, fill_value=0)
     adjusted_returns = returns * adjusted_pnl / pnl
@@ -146,7 +152,8 @@ def adjust_returns_for_slippage(returns, positions, transactions,
     return adjusted_returns
 
 
-def get_turnover(positions, transactions, denominator='AGB'):
+@timed
+def get_turnover(positions, transactions, denominator='AGB', txn_vol=None):
     """
      - Value of purchases and sales divided
     by either the actual gross book or the portfolio value
@@ -172,6 +179,8 @@ def get_turnover(positions, transactions, denominator='AGB'):
         out of an entire book in one trading period.
         - portfolio_value is the total value of the algo's
         positions end-of-period, including cash.
+    txn_vol : pd.DataFrame, optional
+        Precomputed get_txn_vol(transactions).
 
     Returns
     -------
@@ -179,7 +188,8 @@ def get_turnover(positions, transactions, denominator='AGB'):
         timeseries of portfolio turnover rates.
     """
 
-    txn_vol = get_txn_vol(transactions)
+    if txn_vol is None:
+        txn_vol = get_txn_vol(transactions)
     traded_value = txn_vol.txn_volume
 
     if denominator == 'AGB':
@@ -17,16 +17,17 @@ from __future__ import division
 
 import warnings
 
+from contextlib import contextmanager
 from itertools import cycle
-from matplotlib.pyplot import cm
 import numpy as np
 import pandas as pd
-from IPython.display import display, HTML
 
 import empyrical.utils
 
 from . import pos
 from . import txn
+from .cache import cached
+from .profiling import timed
 
 APPROX_BDAYS_PER_MONTH = 21
 APPROX_BDAYS_PER_YEAR = 252
@@ -36,6 +37,8 @@ WEEKS_PER_YEAR = 52
 
 MM_DISPLAY_UNIT = 1000000.
 
+DETECT_INTRADAY_BLOCK_SIZE = 100000
+
 DAILY = 'daily'
 WEEKLY = 'weekly'
 MONTHLY = 'monthly'
@@ -47,6 +50,9 @@ ANNUALIZATION_FACTORS = {
     MONTHLY: MONTHS_PER_YEAR
 }
 
+# Collects tear sheet output while inside headless_output().
+_headless_output = None
+
 COLORMAP = 'Paired'
 COLORS = ['#e6194b', '#3cb44b', '#ffe119', '#0082c8', '#f58231',
           '#911eb4', '#46f0f0', '#f032e6', '#d2f53c', '#fabebe',
@@ -216,7 +222,101 @@ def print_table(table,
         # Inject the new HTML
         html = html.replace('<thead>', '<thead>' + rows)
 
-    display(HTML(html))
+    display_html(html)
+
+
+class HeadlessOutput(object):
+    """
+    Output of tear sheets rendered inside headless_output().
+
+    Attributes
+    ----------
+    items : list of (str, object)
+        In the order they were produced, ('html', str) fragments,
+        ('text', str) printed text and ('figure', matplotlib.Figure)
+        figures.
+    """
+
+    def __init__(self):
+        self.items = []
+
+    @property
+    def figures(self):
+        return [item for kind, item in self.items if kind == 'figure']
+
+    def add(self, kind, item):
+        if kind == 'text' and self.items and self.items[-1][0] == 'text':
+            self.items[-1] = ('text', self.items[-1][1] + item)
+        else:
+            self.items.append((kind, item))
+
+    def write(self, text):
+        """
+        Stream interface, so that the output can stand in for stdout.
+        """
+
+        if text:
+            self.add('text', text)
+
+    def flush(self):
+        pass
+
+
+@contextmanager
+def headless_output():
+    """
+    Renders tear sheets without a notebook or a pyplot backend.
+
+    Inside this context, tables are collected instead of being passed
+    to IPython's display, and tear sheet figures are standalone Agg
+    backed Figure objects that pyplot does not track. Printed text is
+    not captured; redirect stdout to the yielded output for that.
+
+    Yields
+    ------
+    HeadlessOutput
+        Collected tables and figures.
+    """
+
+    global _headless_output
+    previous = _headless_output
+    _headless_output = HeadlessOutput()
+    try:
+        yield _headless_output
+    finally:
+        _headless_output = previous
+
+
+def display_html(html):
+    """
+    Displays an HTML fragment in the notebook, or collects it when
+    inside headless_output().
+    """
+
+    if _headless_output is not None:
+        _headless_output.add('html', html)
+    else:
+        from IPython.display import display, HTML
+        display(HTML(html))
+
+
+def new_figure(figsize=None):
+    """
+    Creates the figure a tear sheet is drawn on: a pyplot figure, or
+    when inside headless_output(), a Figure on its own Agg canvas.
+    """
+
+    if _headless_output is None:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=figsize)
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    _headless_output.add('figure', fig)
+    return fig
 
 
 def standardize_data(x):
@@ -244,6 +344,10 @@ def detect_intraday(positions, transactions, threshold=0.25):
     number of unique stocks transacted every day. If the average quotient
     is below a threshold, then an intraday strategy is detected.
 
+    Unique (day, symbol) pairs are counted one block of days at a time,
+    stopping as soon as the quotient is known to fall on one side of the
+    threshold.
+
     Parameters
     ----------
     positions : pd.DataFrame
@@ -252,6 +356,8 @@ def detect_intraday(positions, transactions, threshold=0.25):
     transactions : pd.DataFrame
         Prices and amounts of executed trades. One row per trade.
          - See full explanation in create_full_tear_sheet.
+    threshold : float, optional
+        Quotient below which a strategy is considered intraday.
 
     Returns
     -------
@@ -259,13 +365,43 @@ def detect_intraday(positions, transactions, threshold=0.25):
         True if an intraday strategy is detected.
     """
 
-    daily_txn = transactions.copy()
-    daily_txn.index = daily_txn.index.date
-    txn_count = daily_txn.groupby(level=0).symbol.nunique().sum()
-    daily_pos = positions.drop('cash', axis=1).replace(0, np.nan)
-    return daily_pos.count(axis=1).sum() / txn_count < threshold
+    pos_values = positions.values[:, positions.columns != 'cash']
+    pos_count = np.count_nonzero((pos_values != 0) & ~pd.isnull(pos_values))
+
+    # Local midnights are at least 23 hours apart, so whole hours since
+    # the epoch identify a day even across daylight saving changes.
+    day_codes = pd.DatetimeIndex(transactions.index).normalize().asi8 // \
+        (60 * 60 * 10 ** 9)
+    sym_codes, symbols = pd.factorize(transactions.symbol)
+    if not (day_codes[1:] >= day_codes[:-1]).all():
+        order = np.argsort(day_codes, kind='mergesort')
+        day_codes, sym_codes = day_codes[order], sym_codes[order]
+
+    # Boundaries between blocks of rows that never split a day.
+    n_txns = len(day_codes)
+    block_ends = np.unique(day_codes.searchsorted(
+        day_codes[np.arange(DETECT_INTRADAY_BLOCK_SIZE, n_txns,
+                            DETECT_INTRADAY_BLOCK_SIZE)]))
+    block_ends = np.append(block_ends, n_txns)
 
+    txn_count = 0
+    start = 0
+    for end in block_ends:
+        day_syms = day_codes[start:end] * len(symbols) + sym_codes[start:end]
+        txn_count += len(np.unique(day_syms))
+        start = end
 
+        # The final count lies between the pairs seen so far and that
+        # plus one pair for each remaining transaction.
+        if pos_count < threshold * txn_count:
+            return True
+        if pos_count >= threshold * (txn_count + n_txns - end):
+            return False
+
+    return pos_count < threshold * txn_count
+
+
+@timed
 def check_intraday(estimate, returns, positions, transactions):
     """
     Logic for checking if a strategy is intraday and processing it.
@@ -312,6 +448,8 @@ def check_intraday(estimate, returns, positions, transactions):
         return positions
 
 
+@timed
+@cached
 def estimate_intraday(returns, positions, transactions, EOD_hour=23):
     """
     Intraday strategies will often not hold positions at the day end.
@@ -339,22 +477,9 @@ def estimate_intraday(returns, positions, transactions, EOD_hour=23):
         Daily net position values, resampled for intraday behavior.
     """
 
-    # Construct DataFrame of transaction amounts
-    txn_val = transactions.copy()
-    txn_val.index.names = ['date']
-    txn_val['value'] = txn_val.amount * txn_val.price
-    txn_val = txn_val.reset_index().pivot_table(
-        index='date', values='value',
-        columns='symbol').replace(np.nan, 0)
+    days, symbols, txn_val = _intraday_peak_positions(transactions)
 
-    # Cumulate transaction amounts each day
-    txn_val = txn_val.groupby(txn_val.index.date).cumsum()
-
-    # Calculate exposure, then take peak of exposure every day
-    txn_val['exposure'] = txn_val.abs().sum(axis=1)
-    condition = (txn_val['exposure'] == txn_val.groupby(
-        pd.Grouper(freq='24H'))['exposure'].transform(max))
-    txn_val = txn_val[condition].drop('exposure', axis=1)
+    txn_val = pd.DataFrame(txn_val, index=days, columns=symbols, copy=True)
 
     # Compute cash delta
     txn_val['cash'] = -txn_val.sum(axis=1)
@@ -364,8 +489,7 @@ def estimate_intraday(returns, positions, transactions, EOD_hour=23):
     starting_capital = positions.iloc[0].sum() / (1 + returns[0])
     positions_shifted.cash[0] = starting_capital
 
-    # Format and add start positions to intraday position changes
-    txn_val.index = txn_val.index.normalize()
+    # Add start positions to intraday position changes
     corrected_positions = positions_shifted.add(txn_val, fill_value=0)
     corrected_positions.index.name = 'period_close'
     corrected_positions.columns.name = 'sid'
@@ -373,6 +497,107 @@ def estimate_intraday(returns, positions, transactions, EOD_hour=23):
     return corrected_positions
 
 
+def _intraday_peak_positions(transactions):
+    """
+    Finds, for each day, the net value traded in each symbol up to the
+    point of the day where gross exposure peaks.
+
+    Works on arrays sorted by (day, symbol, time): the running net value
+    of each symbol is a segmented cumulative sum, and since a fill only
+    changes the exposure of its own symbol, gross exposure over the day
+    is a cumulative sum of the per-fill changes in absolute value.
+
+    Returns
+    -------
+    days : pd.DatetimeIndex
+        Normalized days with transactions.
+    symbols : pd.Index
+        Traded symbols.
+    values : np.ndarray
+        days x symbols net value traded up to the daily exposure peak.
+    """
+
+    dts = pd.DatetimeIndex(transactions.index)
+    sym_codes, symbols = pd.factorize(transactions.symbol, sort=True)
+    value = (transactions.amount.values *
+             transactions.price.values).astype(np.float64)
+
+    # Fills of a symbol sharing a timestamp are averaged, as a pivot
+    # table would do.
+    ts = dts.asi8
+    order = np.lexsort((sym_codes, ts))
+    ts, sym_codes, value = ts[order], sym_codes[order], value[order]
+    new_group = np.ones(len(ts), dtype=bool)
+    new_group[1:] = (ts[1:] != ts[:-1]) | (sym_codes[1:] != sym_codes[:-1])
+    starts = np.flatnonzero(new_group)
+    value = np.add.reduceat(value, starts) / np.diff(np.append(starts,
+                                                               len(ts)))
+    ts, sym_codes = ts[starts], sym_codes[starts]
+
+    day_idx = pd.DatetimeIndex(dts[order][starts]).normalize()
+    day_codes, days = pd.factorize(day_idx, sort=True)
+
+    # Running net value of each symbol within each day.
+    order = np.lexsort((ts, sym_codes, day_codes))
+    ts, sym_codes, day_codes, value = (ts[order], sym_codes[order],
+                                       day_codes[order], value[order])
+    new_group = np.ones(len(ts), dtype=bool)
+    new_group[1:] = ((day_codes[1:] != day_codes[:-1]) |
+                     (sym_codes[1:] != sym_codes[:-1]))
+    running = _segmented_cumsum(value, new_group)
+    previous = np.where(new_group, 0, np.roll(running, 1))
+
+    # Gross exposure after each timestamp, in time order within the day.
+    exposure_delta = np.abs(running) - np.abs(previous)
+    time_order = np.lexsort((ts, day_codes))
+    day_start = np.ones(len(ts), dtype=bool)
+    day_start[1:] = day_codes[time_order][1:] != day_codes[time_order][:-1]
+    exposure = _segmented_cumsum(exposure_delta[time_order], day_start)
+
+    # Exposure at a timestamp is the value after its last fill.
+    time_sorted = ts[time_order]
+    last_of_ts = np.ones(len(ts), dtype=bool)
+    last_of_ts[:-1] = ((time_sorted[1:] != time_sorted[:-1]) |
+                       day_start[1:])
+    candidates = np.flatnonzero(last_of_ts)
+
+    # Earliest timestamp of peak exposure for each day.
+    cand_days = day_codes[time_order][candidates]
+    cand_exposure = exposure[candidates]
+    peak_order = np.lexsort((-cand_exposure, cand_days))
+    first_of_day = np.ones(len(peak_order), dtype=bool)
+    first_of_day[1:] = cand_days[peak_order][1:] != \
+        cand_days[peak_order][:-1]
+    peak_ts = np.empty(len(days), dtype=np.int64)
+    peak_ts[cand_days[peak_order][first_of_day]] = \
+        time_sorted[candidates][peak_order][first_of_day]
+
+    # Latest running value of each (day, symbol) at or before the peak.
+    at_peak = ts <= peak_ts[day_codes]
+    group_id = np.cumsum(new_group) - 1
+    n_at_peak = np.bincount(group_id, weights=at_peak,
+                            minlength=group_id[-1] + 1 if len(ts) else 0)
+    group_starts = np.flatnonzero(new_group)
+    has_value = n_at_peak > 0
+    last = group_starts[has_value] + n_at_peak[has_value].astype(np.int64) - 1
+
+    values = np.zeros((len(days), len(symbols)))
+    values[day_codes[last], sym_codes[last]] = running[last]
+
+    return pd.DatetimeIndex(days), pd.Index(symbols), values
+
+
+def _segmented_cumsum(values, segment_start):
+    """
+    Cumulative sum of values, restarting wherever segment_start is True.
+    """
+
+    # Summed within each segment, so that rounding errors do not build up
+    # over the preceding segments.
+    segment_id = np.cumsum(segment_start)
+    return pd.Series(values).groupby(segment_id).cumsum().values
+
+
 def clip_returns_to_benchmark(rets, benchmark_rets):
     """
     Drop entries from rets so that the start and end dates of rets match those
@@ -533,6 +758,8 @@ def sample_colormap(cmap_name, n_samples):
     """
     Sample a colormap from matplotlib
     """
+    from matplotlib.pyplot import cm
+
     colors = []
     colormap = cm.cmap_d[cmap_name]
     for i in np.linspace(0, 1, n_samples):